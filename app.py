@@ -1,7 +1,24 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-from sip_advisor_agent import SIPAdvisorAgent
+from typing import Optional, List, Dict, Any, Literal, Union, Annotated
+from sip_advisor_agent import SIPAdvisorAgent, _expected_return_rate
+from sip_utils import generate_sip_visualization, _render_sip_chart, shared_chart_cache
+from sip_charts import generate_sip_svg, generate_sip_series
+from sip_simulation import simulate_sip_outcomes, risk_profile_parameters
+from sip_goal_seek import required_monthly_sip
+from sip_allocation import allocate_sip
+from sip_scenarios import compare_scenarios, render_scenario_chart, scenario_labels
+from sip_tax import result_real_returns
+from sip_json import dumps, dumps_result
+from sip_bulk import process_chunk
+from nav_store import backtest_sip, open_nav_store
+from sip_metrics import MetricsMiddleware, render_metrics, stage
+from sip_admission import AdmissionMiddleware, Overloaded, StageGate, LLM_QUEUE_LIMIT, RENDER_QUEUE_LIMIT
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -13,6 +30,15 @@ app = FastAPI(
     description="A service that recommends SIP investments based on user's savings capacity"
 )
 
+# Per-route latency histograms and the optional Server-Timing header
+app.add_middleware(MetricsMiddleware)
+
+# Per-client rate limits and an in-flight cap, checked before any other work
+app.add_middleware(AdmissionMiddleware)
+
+# Longest timeframe projected or charted by the chart and scenario endpoints
+MAX_YEARS = 100
+
 # Input model
 class SIPAdvisorInput(BaseModel):
     savings_capacity: float = Field(..., description="User's savings capacity amount")
@@ -21,6 +47,15 @@ class SIPAdvisorInput(BaseModel):
     age: int = Field(..., description="User's age")
     goals: str = Field(..., description="User's investment goals")
     risk_tolerance: Optional[str] = Field(None, description="User's risk tolerance (optional)")
+    include_visualization: bool = Field(True, description="Render a base64 encoded growth chart")
+    visualization_format: Literal["png", "svg", "series"] = Field("png", description="Chart as base64 PNG, SVG markup, or downsampled series for client-side plotting")
+    include_simulation: bool = Field(False, description="Add Monte Carlo P10/P50/P90 maturity outcomes")
+    simulation_paths: int = Field(10000, ge=100, le=100000, description="Number of simulated paths")
+    simulation_seed: Optional[int] = Field(None, description="Seed for reproducible simulations")
+    include_allocation: bool = Field(False, description="Split the monthly SIP across the recommended funds")
+    allocation_method: Literal["mean_variance", "risk_parity"] = Field("mean_variance", description="How the allocation weights are solved")
+    include_real_returns: bool = Field(False, description="Add inflation-deflated and post-tax projections at the recommended rate")
+    inflation_rate: Optional[float] = Field(None, description="Annual inflation rate (%) for real projections; defaults to the server setting")
 
 # Output model
 class SIPAdvisorOutput(BaseModel):
@@ -28,37 +63,482 @@ class SIPAdvisorOutput(BaseModel):
     adjusted_monthly_amount: float = Field(..., description="Adjusted monthly SIP amount")
     fund_data: List[Dict[str, Any]] = Field(..., description="Data for recommended funds")
     projected_returns: Dict[str, float] = Field(..., description="Projected SIP returns")
-    visualization: str = Field(..., description="Base64 encoded visualization of SIP growth")
+    frequency_adjusted_returns: Optional[Dict[str, float]] = Field(None, description="Projected returns with contributions valued at their true saving frequency")
+    visualization: str = Field("", description="Base64 encoded PNG or SVG markup of SIP growth")
+    visualization_series: Optional[Dict[str, List[float]]] = Field(None, description="Downsampled growth curves when visualization_format is series")
+    simulated_outcomes: Optional[Dict[str, float]] = Field(None, description="Monte Carlo maturity percentiles")
+    allocation: Optional[Dict[str, Any]] = Field(None, description="Per-fund split of the monthly SIP with aggregated projections")
+    real_returns: Optional[Dict[str, Any]] = Field(None, description="Real (inflation-deflated) and post-tax values at the horizon, with yearly series")
+
+# Batch input model
+class SIPAdvisorBatchInput(BaseModel):
+    profiles: List[SIPAdvisorInput] = Field(..., description="User profiles to advise, answered in the same order")
+    include_visualization: bool = Field(False, description="Render a growth chart for every profile")
+    visualization_format: Literal["png", "svg", "series"] = Field("png", description="Chart format for every profile")
+
+# Batch output model
+class SIPAdvisorBatchOutput(BaseModel):
+    results: List[SIPAdvisorOutput] = Field(..., description="SIP recommendations in the same order as the input profiles")
+
+# Chart input model
+class SIPChartInput(BaseModel):
+    monthly_amount: float = Field(..., gt=0, description="Monthly SIP amount")
+    years: int = Field(..., gt=0, le=MAX_YEARS, description="Investment timeframe in years")
+    expected_return_rate: float = Field(..., gt=-100, description="Expected annual return rate as a percentage")
+    width: float = Field(10, gt=0, le=30, description="Chart width in inches")
+    height: float = Field(6, gt=0, le=30, description="Chart height in inches")
+    visualization_format: Literal["png", "svg", "series"] = Field("png", description="Chart as base64 PNG, SVG markup, or downsampled series")
+
+# Chart output model
+class SIPChartOutput(BaseModel):
+    visualization: str = Field("", description="Base64 encoded PNG or SVG markup of SIP growth")
+    visualization_series: Optional[Dict[str, List[float]]] = Field(None, description="Downsampled growth curves")
+
+# Bounds applied to every goal-seek value, scalar or list item
+PositiveAmount = Annotated[float, Field(gt=0)]
+PositiveYears = Annotated[int, Field(gt=0)]
+ReturnRate = Annotated[float, Field(gt=-100)]
+
+# Goal-seek input model; list fields are broadcast against each other
+class GoalSeekInput(BaseModel):
+    target_amount: Union[PositiveAmount, List[PositiveAmount]] = Field(..., description="Target corpus, in today's money when inflation_rate is set")
+    years: Union[PositiveYears, List[PositiveYears]] = Field(..., description="Investment timeframe in years")
+    expected_return_rate: Union[ReturnRate, List[ReturnRate]] = Field(..., description="Expected annual return rate as a percentage, above -100")
+    step_up_rate: Union[float, List[float]] = Field(0.0, description="Annual increase of the monthly SIP as a percentage")
+    inflation_rate: Union[float, List[float]] = Field(0.0, description="Annual inflation rate as a percentage")
+
+# Goal-seek output model
+class GoalSeekOutput(BaseModel):
+    required_monthly_amount: Union[float, List[float]] = Field(..., description="Starting monthly SIP needed to reach each target")
+
+# Allocation input model
+class AllocationInput(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, description="Candidate fund symbols")
+    monthly_amount: float = Field(..., gt=0, description="Monthly SIP amount to split")
+    years: int = Field(..., gt=0, description="Investment timeframe in years")
+    risk_profile: str = Field("moderate", description="conservative, moderate or aggressive")
+    method: Literal["mean_variance", "risk_parity"] = Field("mean_variance", description="How the weights are solved")
+
+# Values a single sweep axis may hold; the grid as a whole is capped by MAX_SCENARIOS
+MAX_SWEEP_VALUES = 1000
+ScenarioYears = Annotated[int, Field(gt=0, le=MAX_YEARS)]
+
+# Values swept by a scenario comparison; omitted axes keep the base value
+class ScenarioSweep(BaseModel):
+    monthly_amount: Optional[List[PositiveAmount]] = Field(None, max_length=MAX_SWEEP_VALUES, description="Monthly SIP amounts to compare")
+    years: Optional[List[ScenarioYears]] = Field(None, max_length=MAX_SWEEP_VALUES, description="Investment timeframes in years to compare")
+    expected_return_rate: Optional[List[ReturnRate]] = Field(None, max_length=MAX_SWEEP_VALUES, description="Expected annual return rates (%) to compare")
+    risk_profile: Optional[List[Literal["conservative", "moderate", "aggressive"]]] = Field(
+        None, description="Risk profiles to compare, each at its expected return rate"
+    )
+
+# Scenario comparison input model
+class ScenarioInput(BaseModel):
+    monthly_amount: float = Field(..., gt=0, description="Base monthly SIP amount")
+    years: int = Field(..., gt=0, le=MAX_YEARS, description="Base investment timeframe in years")
+    risk_profile: Literal["conservative", "moderate", "aggressive"] = Field("moderate", description="Base risk profile")
+    expected_return_rate: Optional[float] = Field(None, gt=-100, description="Base expected annual return rate (%); defaults to the risk profile's")
+    sweep: ScenarioSweep = Field(default_factory=ScenarioSweep, description="Axes to sweep around the base profile")
+    include_visualization: bool = Field(False, description="Render one combined growth chart of the scenarios")
+
+# Backtest input model
+class BacktestInput(BaseModel):
+    symbols: List[str] = Field(..., description="Fund symbols to replay the SIP in")
+    amount: float = Field(..., gt=0, description="Amount invested per instalment")
+    start_date: str = Field(..., description="First instalment date (YYYY-MM-DD)")
+    end_date: Optional[str] = Field(None, description="Valuation date (YYYY-MM-DD); defaults to the latest NAV")
+    frequency: Literal["daily", "weekly", "monthly"] = Field("monthly", description="Instalment frequency")
+
+# Backtest output model
+class BacktestOutput(BaseModel):
+    results: Dict[str, Dict[str, Any]] = Field(..., description="Units, value and XIRR (%) per fund")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when installed, falling back to the json module."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class AdvisorResponse(JSONResponse):
+    """Advisor results shaped like SIPAdvisorOutput without re-validating them.
+
+    Results are built from already validated inputs and catalog records, so
+    the response only fills in defaults, drops extra keys and splices each
+    fund record's cached JSON into the body.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, list):
+            return b'{"results":[' + b",".join(dumps_result(_advisor_payload(result)) for result in content) + b"]}"
+        return dumps_result(_advisor_payload(content))
+
+# Defaults of optional SIPAdvisorOutput fields, in declaration order
+ADVISOR_OUTPUT_DEFAULTS = {name: field.get_default() for name, field in SIPAdvisorOutput.model_fields.items()}
+
+def _advisor_payload(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Order, default and filter result fields the way the response model would."""
+    return {name: result.get(name, default) for name, default in ADVISOR_OUTPUT_DEFAULTS.items()}
 
 # Initialize the SIP Advisor Agent with fallback mode (no API key needed)
 sip_advisor = SIPAdvisorAgent(use_fallback=True)
 
+# Bounded pool for chart rendering so slow renders never run on the event loop
+CHART_WORKERS = int(os.getenv("SIP_CHART_WORKERS", "2"))
+chart_executor = ThreadPoolExecutor(
+    max_workers=CHART_WORKERS,
+    thread_name_prefix="sip-chart"
+)
+
+# Caps on PNG renders and LLM calls running or waiting; work beyond them is shed or degraded
+render_gate = StageGate("render", RENDER_QUEUE_LIMIT, concurrency=CHART_WORKERS)
+llm_gate = StageGate("llm", LLM_QUEUE_LIMIT, concurrency=int(os.getenv("SIP_LLM_CONCURRENCY", "2")))
+
+# Profiles advised per batch by the streaming bulk endpoint
+BULK_CHUNK_SIZE = int(os.getenv("SIP_BULK_CHUNK_SIZE", "1000"))
+
+async def render_visualization(monthly_amount, years, expected_return_rate, figsize=(10, 6), visualization_format="png",
+                               required=True):
+    """Render a SIP growth chart, returning fields to merge into the response.
+    
+    PNG renders wait behind the render gate. When it is full, a required chart
+    raises Overloaded and an optional one is dropped, returning no fields.
+    """
+    if visualization_format == "series":
+        return {"visualization_series": generate_sip_series(monthly_amount, years, expected_return_rate)}
+    if visualization_format == "svg":
+        # Template rendering is cheap enough to run inline
+        size = (int(figsize[0] * 100), int(figsize[1] * 100))
+        return {"visualization": generate_sip_svg(monthly_amount, years, expected_return_rate, size)}
+    
+    # PNG rendering goes through matplotlib in the worker pool
+    if not required:
+        with render_gate.optional_slot("chart_dropped") as admitted:
+            if not admitted:
+                return {}
+            return await _render_png(monthly_amount, years, expected_return_rate, figsize)
+    with render_gate.slot():
+        return await _render_png(monthly_amount, years, expected_return_rate, figsize)
+
+async def _render_png(monthly_amount, years, expected_return_rate, figsize):
+    """Render a PNG chart in the chart pool."""
+    loop = asyncio.get_running_loop()
+    visualization = await loop.run_in_executor(
+        chart_executor, generate_sip_visualization,
+        monthly_amount, years, expected_return_rate, figsize
+    )
+    return {"visualization": visualization}
+
 @app.post("/api/sip_advisor", response_model=SIPAdvisorOutput)
 async def sip_advisor_endpoint(input_data: SIPAdvisorInput):
     """Endpoint for getting SIP investment recommendations."""
     try:
-        result = sip_advisor.process_user_input(
+        profile = dict(
             savings_capacity=input_data.savings_capacity,
             frequency=input_data.frequency,
             currency=input_data.currency,
             age=input_data.age,
             goals=input_data.goals,
-            risk_tolerance=input_data.risk_tolerance
+            risk_tolerance=input_data.risk_tolerance,
+            include_visualization=False
+        )
+        # Parts of the answer skipped under load, reported in a response header
+        degraded = []
+        if sip_advisor.use_fallback:
+            result = await sip_advisor.aprocess_user_input(**profile)
+        else:
+            # With the LLM backed up, answer from the rules instead of joining the queue
+            with llm_gate.optional_slot("llm_degraded") as admitted:
+                result = await sip_advisor.aprocess_user_input(**profile, rule_based=not admitted)
+            if not admitted:
+                degraded.append("llm")
+        if input_data.include_visualization:
+            with stage("visualization"):
+                chart = await render_visualization(
+                    result["adjusted_monthly_amount"],
+                    result["recommendation"]["investment_timeframe_years"],
+                    result["recommendation"]["expected_return_rate"],
+                    visualization_format=input_data.visualization_format,
+                    required=False
+                )
+            if not chart:
+                degraded.append("chart")
+            result.update(chart)
+        if input_data.include_allocation:
+            recommendation = result["recommendation"]
+            with stage("allocation"):
+                result["allocation"] = await run_in_threadpool(
+                    allocate_sip,
+                    recommendation["recommended_funds"],
+                    result["adjusted_monthly_amount"],
+                    recommendation["investment_timeframe_years"],
+                    recommendation["risk_profile"],
+                    input_data.allocation_method
+                )
+        if input_data.include_real_returns:
+            # Taxed per fund category, so this follows the allocation when there is one
+            with stage("real_returns"):
+                result["real_returns"] = await run_in_threadpool(result_real_returns, result, input_data.inflation_rate)
+        if input_data.include_simulation:
+            # Centre paths on the recommended rate with the profile's catalog volatility
+            recommendation = result["recommendation"]
+            _, annual_volatility = risk_profile_parameters(recommendation["risk_profile"])
+            with stage("simulation"):
+                result["simulated_outcomes"] = await run_in_threadpool(
+                    simulate_sip_outcomes,
+                    result["adjusted_monthly_amount"],
+                    recommendation["investment_timeframe_years"],
+                    annual_return=recommendation["expected_return_rate"],
+                    annual_volatility=annual_volatility,
+                    n_paths=input_data.simulation_paths,
+                    seed=input_data.simulation_seed
+                )
+        return AdvisorResponse(result, headers={"X-SIP-Degraded": ",".join(degraded)} if degraded else None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/sip_advisor/chart", response_model=SIPChartOutput)
+async def sip_chart_endpoint(input_data: SIPChartInput):
+    """Endpoint for rendering a SIP growth chart on its own."""
+    try:
+        return await render_visualization(
+            input_data.monthly_amount,
+            input_data.years,
+            input_data.expected_return_rate,
+            (input_data.width, input_data.height),
+            input_data.visualization_format
         )
-        return result
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/sip_advisor/batch", response_model=SIPAdvisorBatchOutput)
+async def sip_advisor_batch_endpoint(input_data: SIPAdvisorBatchInput):
+    """Endpoint for getting SIP investment recommendations for many profiles at once."""
+    try:
+        profiles = [
+            profile.dict(exclude={"include_visualization", "visualization_format", "include_simulation",
+                                  "simulation_paths", "simulation_seed", "include_allocation", "allocation_method",
+                                  "include_real_returns", "inflation_rate"})
+            for profile in input_data.profiles
+        ]
+        png_charts = input_data.include_visualization and input_data.visualization_format == "png"
+        results = await run_in_threadpool(
+            sip_advisor.process_batch,
+            profiles,
+            include_visualization=png_charts
+        )
+        
+        # SVG and series charts are cheap, so they are attached here instead
+        if input_data.include_visualization and not png_charts:
+            for result in results:
+                result.update(await render_visualization(
+                    result["adjusted_monthly_amount"],
+                    result["recommendation"]["investment_timeframe_years"],
+                    result["recommendation"]["expected_return_rate"],
+                    visualization_format=input_data.visualization_format
+                ))
+        # A list renders as {"results": [...]} with each result shaped like SIPAdvisorOutput
+        return AdvisorResponse(results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+class RequestStreamingResponse(StreamingResponse):
+    """Streaming response whose body is produced while the request body is still being read.
+    
+    StreamingResponse normally listens for client disconnects on the same
+    receive channel the request body arrives on, which would swallow it.
+    """
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def _iter_request_lines(request: Request):
+    """Yield the request body line by line as it arrives."""
+    pending = b""
+    async for data in request.stream():
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if pending:
+        yield pending.decode("utf-8")
+
+@app.post("/api/sip_advisor/bulk")
+async def sip_advisor_bulk_endpoint(request: Request):
+    """Endpoint for advising an NDJSON stream of profiles, answered as a chunked NDJSON stream.
+
+    Profiles are read as the body arrives and advised in fixed-size batches,
+    so memory stays constant however many profiles are sent. Unparseable
+    lines come back as {"error": ...} records in their original position.
+    """
+    async def results():
+        chunk = []
+        async for line in _iter_request_lines(request):
+            if not line.strip():
+                continue
+            chunk.append(line)
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                lines = await run_in_threadpool(process_chunk, chunk, sip_advisor)
+                yield "".join(f"{line}\n" for line in lines)
+                chunk = []
+        if chunk:
+            lines = await run_in_threadpool(process_chunk, chunk, sip_advisor)
+            yield "".join(f"{line}\n" for line in lines)
+    
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.post("/api/sip_advisor/goal_seek", response_model=GoalSeekOutput)
+async def goal_seek_endpoint(input_data: GoalSeekInput):
+    """Endpoint for finding the monthly SIP needed to reach target corpora."""
+    try:
+        required = await run_in_threadpool(
+            required_monthly_sip,
+            input_data.target_amount,
+            input_data.years,
+            input_data.expected_return_rate,
+            input_data.step_up_rate,
+            input_data.inflation_rate
+        )
+        # Step-up and inflation combinations can still make a target unreachable
+        if not np.all(np.isfinite(required)):
+            raise ValueError("No finite monthly SIP reaches the target for these inputs")
+        return {"required_monthly_amount": np.round(required, 2).tolist()}
+    except ValueError as e:
+        # Raised when list inputs can't be broadcast together or have no finite solution
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/sip_advisor/allocation")
+async def allocation_endpoint(input_data: AllocationInput):
+    """Endpoint for splitting a monthly SIP across chosen funds."""
+    try:
+        return await run_in_threadpool(
+            allocate_sip, input_data.symbols, input_data.monthly_amount, input_data.years,
+            input_data.risk_profile, input_data.method
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/sip_advisor/scenarios")
+async def scenarios_endpoint(input_data: ScenarioInput):
+    """Endpoint for comparing a grid of amount, timeframe and return scenarios in one call."""
+    sweep = input_data.sweep
+    if sweep.expected_return_rate and sweep.risk_profile:
+        raise HTTPException(status_code=400, detail="Sweep either expected_return_rate or risk_profile, not both")
+    
+    # Risk profiles are swept through the return rate the advisor assigns them
+    risk_profiles = None
+    if sweep.risk_profile:
+        risk_profiles = sweep.risk_profile
+        rates = [_expected_return_rate(profile) for profile in risk_profiles]
+    elif sweep.expected_return_rate:
+        rates = sweep.expected_return_rate
+    elif input_data.expected_return_rate is not None:
+        rates = [input_data.expected_return_rate]
+    else:
+        rates = [_expected_return_rate(input_data.risk_profile)]
+    
+    amounts = sweep.monthly_amount or [input_data.monthly_amount]
+    horizons = sweep.years or [input_data.years]
+    try:
+        result = await run_in_threadpool(compare_scenarios, amounts, horizons, rates, risk_profiles)
+        if input_data.include_visualization:
+            # The combined chart is a matplotlib render, so it queues behind the render gate
+            with render_gate.slot():
+                loop = asyncio.get_running_loop()
+                result["visualization"] = await loop.run_in_executor(
+                    chart_executor, render_scenario_chart, amounts, horizons, rates,
+                    scenario_labels(rates, risk_profiles)
+                )
+        # The matrices are plain nested lists already, so skip the per-value encoder walk
+        return FastJSONResponse(result)
+    except ValueError as e:
+        # Raised when the grid is too large
+        raise HTTPException(status_code=400, detail=str(e))
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/sip_advisor/backtest", response_model=BacktestOutput)
+async def backtest_endpoint(input_data: BacktestInput):
+    """Endpoint for replaying a SIP against historical NAVs."""
+    try:
+        store = open_nav_store()
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="NAV history store has not been built")
+    unknown = [symbol for symbol in input_data.symbols if symbol not in store]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"No NAV history for: {', '.join(unknown)}")
+    try:
+        results = await run_in_threadpool(
+            backtest_sip, store, input_data.symbols, input_data.amount,
+            input_data.start_date, input_data.end_date, input_data.frequency
+        )
+    except ValueError as e:
+        # Bad dates or an empty history window
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"results": results}
+
+@app.get("/api/sip_advisor/stats")
+async def sip_advisor_stats_endpoint():
+    """Endpoint for inspecting recommendation and chart cache counters."""
+    chart_cache = _render_sip_chart.cache_info()
+    return {
+        "recommendation_cache": sip_advisor.cache_stats(),
+        "chart_cache": {
+            "hits": chart_cache.hits,
+            "misses": chart_cache.misses,
+            "size": chart_cache.currsize,
+            "maxsize": chart_cache.maxsize
+        },
+        "shared_chart_cache": shared_chart_cache.stats() if shared_chart_cache is not None else None
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Endpoint exposing stage latencies and advisor counters in Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Add a root endpoint
 @app.get("/")
 async def root():
     return {
         "message": "Welcome to the Micro-SIP Investment Advisor API",
         "docs": "/docs",
-        "api_endpoint": "/api/sip_advisor"
+        "api_endpoint": "/api/sip_advisor",
+        "batch_endpoint": "/api/sip_advisor/batch",
+        "bulk_endpoint": "/api/sip_advisor/bulk",
+        "chart_endpoint": "/api/sip_advisor/chart",
+        "goal_seek_endpoint": "/api/sip_advisor/goal_seek",
+        "allocation_endpoint": "/api/sip_advisor/allocation",
+        "scenarios_endpoint": "/api/sip_advisor/scenarios",
+        "backtest_endpoint": "/api/sip_advisor/backtest",
+        "metrics_endpoint": "/metrics"
     }
 
 # Run with: uvicorn app:app --reload
+# Multi-worker: python app.py --workers 4 (shared tables and caches across workers)
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from sip_workers import serve
+
+    parser = argparse.ArgumentParser(description="Micro-SIP Investment Advisor API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SIP_WORKERS", "1")),
+                        help="Worker processes; 0 means one per core")
+    args = parser.parse_args()
+
+    if args.workers == 1:
+        uvicorn.run(app, host=args.host, port=args.port)
+    else:
+        serve("app:app", host=args.host, port=args.port, workers=args.workers or None)
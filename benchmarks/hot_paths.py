@@ -0,0 +1,205 @@
+"""Benchmark the advisor hot paths and gate regressions against a JSON baseline.
+
+Usage:
+    python benchmarks/hot_paths.py run                          # report latencies
+    python benchmarks/hot_paths.py run --save baseline.json     # record a baseline
+    python benchmarks/hot_paths.py run --baseline baseline.json --threshold 0.25
+    python benchmarks/hot_paths.py compare current.json baseline.json --threshold 0.25
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from profiles import generate_profiles  # noqa: E402
+
+# Statistics compared against the baseline; latency must not rise, throughput must not fall
+LATENCY_KEYS = ["p50_ms", "p95_ms"]
+THROUGHPUT_KEY = "throughput_per_s"
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def summarize(latencies: Sequence[float], wall_seconds: float, items: int) -> Dict[str, float]:
+    """Summarize per-call latencies (seconds) and throughput (items per second)."""
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "throughput_per_s": round(items / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def time_calls(function: Callable, calls: List[tuple], warmup: int = 5, items_per_call: int = 1) -> Dict[str, float]:
+    """Time `function` once per argument tuple after a short warmup."""
+    for args in calls[:warmup]:
+        function(*args)
+    latencies = []
+    started = time.perf_counter()
+    for args in calls:
+        call_started = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started, len(calls) * items_per_call)
+
+def micro_benchmarks(profiles: List[Dict[str, object]], chart_renders: int, batch_size: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark individual functions on the synthetic profiles."""
+    from sip_advisor_agent import (SIPAdvisorAgent, _expected_return_rate, _investment_timeframe,
+                                   _resolve_risk_profile, _to_monthly_amount)
+    from sip_utils import _render_sip_chart, calculate_sip_returns
+
+    projections = [
+        (_to_monthly_amount(p["savings_capacity"], p["frequency"]), _investment_timeframe(p["age"]),
+         _expected_return_rate(_resolve_risk_profile(p["age"], p["risk_tolerance"])))
+        for p in profiles
+    ]
+    agent = SIPAdvisorAgent(use_fallback=True)
+    profile_args = [
+        (p["savings_capacity"], p["frequency"], p["currency"], p["age"], p["goals"], p["risk_tolerance"])
+        for p in profiles
+    ]
+
+    def process_cold(*args):
+        # Measure the uncached path; the cache would otherwise absorb repeated profiles
+        agent.recommendation_cache.clear()
+        agent.process_user_input(*args, include_visualization=False)
+
+    results = {}
+    results["calculate_sip_returns"] = time_calls(calculate_sip_returns, projections)
+    results["_generate_rule_based_recommendation"] = time_calls(agent._generate_rule_based_recommendation, profile_args)
+    results["process_user_input"] = time_calls(process_cold, profile_args)
+    # Render through the undecorated function so the chart cache doesn't hide the cost
+    results["generate_sip_visualization"] = time_calls(
+        _render_sip_chart.__wrapped__,
+        [(*projection, (10.0, 6.0)) for projection in projections[:chart_renders]],
+        warmup=2
+    )
+    batches = [(profiles[i:i + batch_size],) for i in range(0, len(profiles) - batch_size + 1, batch_size)]
+    results["process_batch"] = time_calls(agent.process_batch, batches, warmup=1, items_per_call=batch_size)
+    return results
+
+async def _load_test(profiles: List[Dict[str, object]], concurrency: int, visualization_format: str) -> Dict[str, float]:
+    """Drive /api/sip_advisor through an in-process ASGI client."""
+    import httpx
+    from app import app
+
+    payloads = [dict(p, include_visualization=visualization_format != "none",
+                     visualization_format="png" if visualization_format == "none" else visualization_format)
+                for p in profiles]
+    latencies = []
+    failures = 0
+    queue = iter(payloads)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/sip_advisor", json=payloads[0])
+
+        async def worker():
+            nonlocal failures
+            for payload in queue:
+                started = time.perf_counter()
+                response = await client.post("/api/sip_advisor", json=payload)
+                latencies.append(time.perf_counter() - started)
+                failures += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    summary = summarize(latencies, wall, len(latencies))
+    summary["failures"] = failures
+    return summary
+
+def run(args) -> Dict[str, object]:
+    """Run every benchmark and return the result document."""
+    profiles = generate_profiles(args.profiles, seed=args.seed)
+    benchmarks = micro_benchmarks(profiles, args.chart_renders, args.batch_size)
+    benchmarks["api_sip_advisor"] = asyncio.run(
+        _load_test(generate_profiles(args.requests, seed=args.seed + 1), args.concurrency, args.visualization_format)
+    )
+    return {
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "benchmarks": benchmarks,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def compare(result: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """Return a description of every benchmark that regressed past threshold."""
+    regressions = []
+    for name, base in baseline["benchmarks"].items():
+        current = result["benchmarks"].get(name)
+        if current is None:
+            continue
+        for key in LATENCY_KEYS:
+            # Ignore sub-10µs noise on the tiniest functions
+            if current[key] > base[key] * (1 + threshold) and current[key] - base[key] > 0.01:
+                regressions.append(f"{name} {key}: {base[key]:.3f} -> {current[key]:.3f}")
+        if current[THROUGHPUT_KEY] < base[THROUGHPUT_KEY] / (1 + threshold):
+            regressions.append(f"{name} {THROUGHPUT_KEY}: {base[THROUGHPUT_KEY]:.1f} -> {current[THROUGHPUT_KEY]:.1f}")
+    if result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + threshold):
+        regressions.append(f"peak_rss_mb: {baseline['peak_rss_mb']:.1f} -> {result['peak_rss_mb']:.1f}")
+    return regressions
+
+def report_regressions(result: Dict[str, object], baseline_path: str, threshold: float) -> bool:
+    """Print regressions against a baseline file and return whether any were found."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        regressions = compare(result, json.load(f), threshold)
+    for regression in regressions:
+        print(f"FAIL: regression {regression}")
+    return bool(regressions)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--profiles", type=int, default=2000, help="Synthetic profiles for micro-benchmarks")
+    run_parser.add_argument("--chart-renders", type=int, default=30, help="Uncached PNG renders to time")
+    run_parser.add_argument("--batch-size", type=int, default=500, help="Profiles per process_batch call")
+    run_parser.add_argument("--requests", type=int, default=500, help="Requests sent in the load test")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients in the load test")
+    run_parser.add_argument("--visualization-format", choices=["none", "png", "svg", "series"], default="none",
+                            help="Chart requested by the load test")
+    run_parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic profiles")
+    run_parser.add_argument("--save", help="Write the result to this JSON file as a new baseline")
+    run_parser.add_argument("--baseline", help="Compare against this JSON baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio")
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved results")
+    compare_parser.add_argument("result", help="JSON result to check")
+    compare_parser.add_argument("baseline", help="JSON baseline to check against")
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.result, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        return 1 if report_regressions(result, args.baseline, args.threshold) else 0
+
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    failed = False
+    if args.baseline:
+        failed = report_regressions(result, args.baseline, args.threshold)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
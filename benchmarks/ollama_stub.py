@@ -0,0 +1,158 @@
+"""Minimal stand-in for the Ollama generate API, for exercising the LLM paths offline.
+
+Answers /api/generate with a deterministic recommendation built from the
+prompt, honours the `format` schema's fund enum, and reports how many prompt
+tokens it had to evaluate so prefix reuse is visible. `--eval-ms` charges a
+delay per evaluated token to mimic prompt processing cost.
+
+Usage:
+    python benchmarks/ollama_stub.py --port 11500 --eval-ms 0.5
+    OLLAMA_HOST=http://127.0.0.1:11500 SIP_LLM_CACHE_PATH=/tmp/llm.sqlite3 python -c \
+        "from sip_advisor_agent import SIPAdvisorAgent; print(SIPAdvisorAgent(use_fallback=False).process_user_input(5000, 'monthly', 'INR', 30, 'retirement')['recommendation'])"
+    python benchmarks/ollama_stub.py --free-text      # unconstrained replies, as a plain model gives
+    python benchmarks/ollama_stub.py --bad-symbols    # include a symbol missing from the catalog
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+SAVINGS_LINE = re.compile(r"Savings capacity: ([\d.]+) (\w+)")
+AGE_LINE = re.compile(r"Age: (\d+)")
+SYMBOLS_LINE = re.compile(r"fund symbols: ([^\n]+)")
+
+def tokenize(text: str) -> List[int]:
+    """Stable fake token ids, one per whitespace separated word."""
+    return [zlib.crc32(word.encode("utf-8")) % 32000 for word in text.split()]
+
+class StubState:
+    """Prompt text behind every context handed out, and evaluation counters."""
+
+    def __init__(self, eval_ms: float, free_text: bool, bad_symbols: bool):
+        self.eval_ms = eval_ms
+        self.free_text = free_text
+        self.bad_symbols = bad_symbols
+        self.contexts = {}
+        self.requests = 0
+        self.evaluated_tokens = 0
+        self.lock = threading.Lock()
+
+    def generate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        context = request.get("context") or []
+        prompt = request.get("prompt", "")
+        with self.lock:
+            text = self.contexts.get(tuple(context), "") + prompt
+        tokens = tokenize(prompt)
+        time.sleep(self.eval_ms * len(tokens) / 1000)
+
+        answer = self.answer(text, request.get("format"))
+        # Like Ollama, generation stops at num_predict and the context ends with the generated tokens
+        num_predict = (request.get("options") or {}).get("num_predict", -1)
+        words = answer.split()
+        if num_predict >= 0:
+            words = words[:num_predict]
+            answer = " ".join(words)
+        prompt_context = list(context) + tokens
+        full_context = prompt_context + tokenize(answer)
+        with self.lock:
+            self.contexts[tuple(prompt_context)] = text
+            self.contexts[tuple(full_context)] = text + answer
+            self.requests += 1
+            self.evaluated_tokens += len(tokens)
+        return {
+            "model": request.get("model"),
+            "response": answer,
+            "done": True,
+            "context": full_context,
+            "prompt_eval_count": len(tokens),
+            "eval_count": len(words)
+        }
+
+    def answer(self, text: str, output_format: Any) -> str:
+        """Recommend from the prompt's own fund list, sized to the stated savings."""
+        symbols = []
+        if isinstance(output_format, dict):
+            symbols = output_format["properties"]["recommended_funds"]["items"].get("enum", [])
+        if not symbols:
+            match = SYMBOLS_LINE.search(text)
+            symbols = [symbol.strip(" .") for symbol in match.group(1).split(",")] if match else []
+        savings = SAVINGS_LINE.search(text)
+        age = AGE_LINE.search(text)
+        amount = float(savings.group(1)) if savings else 1000.0
+        if savings and savings.group(2).lower() == "daily":
+            amount *= 30
+        elif savings and savings.group(2).lower() == "weekly":
+            amount *= 4
+        years = max(5, 60 - int(age.group(1))) if age else 10
+
+        funds = symbols[:3]
+        if self.bad_symbols:
+            funds = ["NOT-A-FUND"] + funds[:2]
+        body = json.dumps({
+            "monthly_sip_amount": round(amount, 2),
+            "investment_timeframe_years": min(years, 30),
+            "risk_profile": "moderate",
+            "recommended_funds": funds,
+            "expected_return_rate": 12.0
+        })
+        if output_format or not self.free_text:
+            return body
+        return f"Here is a recommendation for you:\n{body}\nI hope this helps!"
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self._send({"models": [{"name": "llama2:latest"}]})
+            elif self.path == "/stats":
+                self._send({"requests": state.requests, "evaluated_tokens": state.evaluated_tokens})
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            if self.path != "/api/generate":
+                self.send_error(404)
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            self._send(state.generate(request))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--eval-ms", type=float, default=0.0, help="Delay per evaluated prompt token, in ms")
+    parser.add_argument("--free-text", action="store_true", help="Wrap replies in prose unless a format is requested")
+    parser.add_argument("--bad-symbols", action="store_true", help="Recommend a symbol that is not in the catalog")
+    args = parser.parse_args()
+
+    state = StubState(args.eval_ms, args.free_text, args.bad_symbols)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Ollama stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Reproducible synthetic user profiles for benchmarks and load tests."""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+FREQUENCIES = ["daily", "weekly", "monthly"]
+RISK_TOLERANCES = [None, "low", "medium", "high"]
+GOALS = [
+    "retirement",
+    "child education",
+    "buy a house",
+    "wealth creation",
+    "emergency fund",
+    "save tax",
+    "retirement and child education"
+]
+
+# Typical savings per frequency, drawn from a lognormal around these medians
+SAVINGS_MEDIANS = {"daily": 50.0, "weekly": 300.0, "monthly": 2000.0}
+
+def generate_profiles(n: int, seed: Optional[int] = 0) -> List[Dict[str, object]]:
+    """Return `n` profiles shaped like SIPAdvisorInput, identical for the same seed."""
+    rng = np.random.default_rng(seed)
+    frequencies = rng.choice(FREQUENCIES, size=n, p=[0.2, 0.3, 0.5])
+    medians = np.array([SAVINGS_MEDIANS[frequency] for frequency in frequencies])
+    savings = np.round(medians * rng.lognormal(0.0, 0.6, size=n), 0)
+    ages = rng.integers(18, 70, size=n)
+    goals = rng.choice(GOALS, size=n)
+    tolerances = rng.integers(0, len(RISK_TOLERANCES), size=n)
+    return [
+        {
+            "savings_capacity": float(savings[i]),
+            "frequency": str(frequencies[i]),
+            "currency": "INR",
+            "age": int(ages[i]),
+            "goals": str(goals[i]),
+            "risk_tolerance": RISK_TOLERANCES[tolerances[i]]
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,99 @@
+"""Measure import cost of the service modules to catch cold-start regressions.
+
+Usage:
+    python benchmarks/startup.py                       # report median import times
+    python benchmarks/startup.py --save baseline.json  # record a baseline
+    python benchmarks/startup.py --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose cumulative import cost is tracked individually
+TRACKED_MODULES = ["app", "sip_advisor_agent", "sip_utils", "fund_catalog", "fund_ranking",
+                   "sip_simulation", "sip_goal_seek", "sip_cashflows", "numpy", "fastapi", "pydantic"]
+
+# Heavy packages that must not load until they are actually used
+LAZY_MODULES = ["matplotlib", "langchain", "langchain_core", "langchain_community"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure_once(module: str) -> Dict[str, float]:
+    """Import `module` in a fresh interpreter and return cumulative import times in ms."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            # A module imported twice keeps its first (real) cost
+            timings.setdefault(match.group(4), int(match.group(2)) / 1000)
+    return timings
+
+def measure(module: str, runs: int) -> Dict[str, object]:
+    """Return median cumulative import times across several cold interpreters."""
+    samples: List[Dict[str, float]] = [measure_once(module) for _ in range(runs)]
+    modules = {
+        name: round(statistics.median(sample.get(name, 0.0) for sample in samples), 2)
+        for name in TRACKED_MODULES if any(name in sample for sample in samples)
+    }
+    loaded_lazy = sorted({name for sample in samples for name in LAZY_MODULES if name in sample})
+    return {
+        "module": module,
+        "runs": runs,
+        "total_ms": modules.get(module, 0.0),
+        "modules_ms": modules,
+        "eagerly_loaded": loaded_lazy
+    }
+
+def compare(result: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """Return a description of every tracked module slower than baseline by more than threshold."""
+    regressions = []
+    for name, baseline_ms in baseline["modules_ms"].items():
+        current_ms = result["modules_ms"].get(name)
+        # Ignore sub-millisecond noise on tiny modules
+        if current_ms is not None and current_ms > baseline_ms * (1 + threshold) and current_ms - baseline_ms > 1.0:
+            regressions.append(f"{name}: {baseline_ms:.1f}ms -> {current_ms:.1f}ms")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=5, help="Cold interpreters to sample")
+    parser.add_argument("--save", help="Write the result to this JSON file as a new baseline")
+    parser.add_argument("--baseline", help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio per module")
+    args = parser.parse_args()
+
+    result = measure(args.module, args.runs)
+    print(json.dumps(result, indent=2))
+
+    failed = False
+    if result["eagerly_loaded"]:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(result['eagerly_loaded'])}")
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"FAIL: import regression {regression}")
+        failed = failed or bool(regressions)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from nav_store import NAVStore, DEFAULT_NAV_STORE_PATH
+
+# Analytics table written next to the NAV store by default
+DEFAULT_ANALYTICS_PATH = os.path.join(DEFAULT_NAV_STORE_PATH, "analytics.npz")
+
+# Annual risk-free rate (%) used for Sharpe and Sortino ratios
+RISK_FREE_RATE = float(os.getenv("SIP_RISK_FREE_RATE", "6.5"))
+
+# Trading days per year for annualizing daily statistics
+TRADING_DAYS = 252
+
+# Rolling-return horizons in years
+ROLLING_YEARS = (1, 3, 5)
+
+# Extra calendar days read before the longest lookback so holidays still find a NAV
+LOOKBACK_PAD_DAYS = 31
+
+# Funds processed per pass, bounding how much NAV history is paged in at once
+ANALYTICS_FUND_CHUNK = 256
+
+# Running aggregates per fund; enough to extend the statistics with new days only
+STATE_FIELDS = (
+    "first_nav", "last_nav", "count", "sum_returns", "sum_squared_returns", "sum_squared_downside",
+    "peak_nav", "max_drawdown"
+) + tuple(f"rolling_{years}y_{stat}" for years in ROLLING_YEARS for stat in ("sum", "count", "min", "latest"))
+DATE_STATE_FIELDS = ("first_date", "last_date")
+
+def _empty_state(funds: int) -> Dict[str, np.ndarray]:
+    """Aggregates for funds with no history yet."""
+    state = {field: np.full(funds, np.nan) for field in STATE_FIELDS}
+    for field in ("count", "sum_returns", "sum_squared_returns", "sum_squared_downside") + tuple(
+            f"rolling_{years}y_{stat}" for years in ROLLING_YEARS for stat in ("sum", "count")):
+        state[field] = np.zeros(funds)
+    state["max_drawdown"] = np.zeros(funds)
+    for field in DATE_STATE_FIELDS:
+        state[field] = np.full(funds, np.datetime64("NaT"), dtype="datetime64[D]")
+    return state
+
+def _forward_fill(navs: np.ndarray) -> np.ndarray:
+    """Carry each fund's last reported NAV across the days it didn't report."""
+    days = navs.shape[1]
+    latest = np.where(np.isnan(navs), -1, np.arange(days))
+    np.maximum.accumulate(latest, axis=1, out=latest)
+    filled = np.take_along_axis(navs, np.maximum(latest, 0), axis=1)
+    return np.where(latest >= 0, filled, np.nan)
+
+def _lookback_days(years: int) -> int:
+    """Calendar days in a rolling window of `years`."""
+    return int(round(365.25 * years))
+
+def _accumulate(state: Dict[str, np.ndarray], dates: np.ndarray, navs: np.ndarray, start: int,
+                daily_risk_free: float) -> None:
+    """Fold the days `start:` of a NAV window into the running aggregates, in place.
+
+    Columns before `start` were folded in earlier and only serve as lookback
+    context for rolling returns.
+    """
+    navs = np.asarray(navs, dtype=float)
+    new_navs = navs[:, start:]
+    new_dates = dates[start:]
+    reported = ~np.isnan(new_navs)
+
+    # Continue from the last known NAV so the first new day gets a return
+    context = _forward_fill(navs[:, :start]) if start else np.empty((navs.shape[0], 0))
+    previous = context[:, -1] if start else np.full(navs.shape[0], np.nan)
+    previous = np.where(np.isnan(previous), state["last_nav"], previous)
+    filled_new = _forward_fill(np.concatenate([previous[:, None], new_navs], axis=1))
+    filled = np.concatenate([context, filled_new[:, 1:]], axis=1)
+
+    # Daily log returns between consecutive reports
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.log(filled_new[:, 1:] / filled_new[:, :-1])
+    valid = reported & np.isfinite(returns)
+    returns = np.where(valid, returns, 0.0)
+    downside = np.minimum(returns - daily_risk_free, 0.0) * valid
+    state["count"] += valid.sum(axis=1)
+    state["sum_returns"] += returns.sum(axis=1)
+    state["sum_squared_returns"] += (returns * returns).sum(axis=1)
+    state["sum_squared_downside"] += (downside * downside).sum(axis=1)
+
+    # Drawdown against the running peak, seeded with the previous peak
+    peaks = np.fmax.accumulate(np.concatenate([state["peak_nav"][:, None], np.where(reported, new_navs, np.nan)], axis=1), axis=1)[:, 1:]
+    with np.errstate(invalid="ignore"):
+        drawdowns = np.where(reported, new_navs / peaks - 1, np.nan)
+    any_reported = reported.any(axis=1)
+    deepest = np.where(any_reported, np.nanmin(np.where(reported, drawdowns, np.inf), axis=1), 0.0)
+    state["max_drawdown"] = np.minimum(state["max_drawdown"], deepest)
+    state["peak_nav"] = np.where(any_reported, peaks[:, -1], state["peak_nav"])
+
+    # First and last reports
+    first_new = np.argmax(reported, axis=1)
+    last_new = reported.shape[1] - 1 - np.argmax(reported[:, ::-1], axis=1)
+    fresh = any_reported & np.isnat(state["first_date"])
+    rows = np.arange(navs.shape[0])
+    state["first_nav"] = np.where(fresh, new_navs[rows, first_new], state["first_nav"])
+    state["first_date"] = np.where(fresh, new_dates[first_new], state["first_date"])
+    state["last_nav"] = np.where(any_reported, new_navs[rows, last_new], state["last_nav"])
+    state["last_date"] = np.where(any_reported, new_dates[last_new], state["last_date"])
+
+    # Rolling CAGR ending on each new report, against the NAV on or before the lookback date
+    for years in ROLLING_YEARS:
+        lag = np.searchsorted(dates, new_dates - np.timedelta64(_lookback_days(years), "D"), side="right") - 1
+        has_lag = lag >= 0
+        base = filled[:, np.maximum(lag, 0)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rolling = np.power(new_navs / base, 1.0 / years) - 1
+        rolling_valid = reported & has_lag[None, :] & np.isfinite(rolling)
+        state[f"rolling_{years}y_sum"] += np.where(rolling_valid, rolling, 0.0).sum(axis=1)
+        state[f"rolling_{years}y_count"] += rolling_valid.sum(axis=1)
+        lowest = np.min(np.where(rolling_valid, rolling, np.inf), axis=1)
+        state[f"rolling_{years}y_min"] = np.fmin(state[f"rolling_{years}y_min"], np.where(np.isinf(lowest), np.nan, lowest))
+        latest = np.where(rolling_valid[rows, last_new], rolling[rows, last_new], np.nan)
+        state[f"rolling_{years}y_latest"] = np.where(any_reported, latest, state[f"rolling_{years}y_latest"])
+
+class FundAnalytics:
+    """Per-fund return and risk statistics, indexed by symbol for O(1) lookups.
+
+    Holds the running aggregates the statistics derive from, so appending
+    NAV history only folds in the new days.
+    """
+
+    def __init__(self, symbols, as_of, state: Dict[str, np.ndarray], risk_free_rate: float = RISK_FREE_RATE):
+        self.symbols = tuple(str(symbol) for symbol in symbols)
+        self.as_of = None if as_of is None or np.isnat(as_of) else np.datetime64(as_of, "D")
+        self.state = state
+        self.risk_free_rate = risk_free_rate
+        self.position = {symbol: index for index, symbol in enumerate(self.symbols)}
+        self.columns = self._derive_columns()
+        self._records = [self._record(index) for index in range(len(self.symbols))]
+
+    @property
+    def version(self) -> str:
+        """Identifies the history the statistics cover."""
+        return f"{self.as_of}:{len(self.symbols)}"
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return the statistics for a fund, or None if it has no NAV history."""
+        index = self.position.get(symbol)
+        return None if index is None else self._records[index]
+
+    def _derive_columns(self) -> Dict[str, np.ndarray]:
+        """Turn the running aggregates into annualized statistics (percentages)."""
+        state = self.state
+        count = state["count"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = state["sum_returns"] / count
+            variance = (state["sum_squared_returns"] - count * mean * mean) / (count - 1)
+            volatility = np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS) * 100
+            downside = np.sqrt(state["sum_squared_downside"] / count * TRADING_DAYS) * 100
+            annual_return = np.expm1(mean * TRADING_DAYS) * 100
+            columns = {
+                "annual_return": annual_return,
+                "volatility": volatility,
+                "max_drawdown": state["max_drawdown"] * 100,
+                "sharpe_ratio": (annual_return - self.risk_free_rate) / volatility,
+                "sortino_ratio": (annual_return - self.risk_free_rate) / downside
+            }
+            for years in ROLLING_YEARS:
+                columns[f"{years}y_return"] = state[f"rolling_{years}y_latest"] * 100
+                columns[f"rolling_{years}y_average"] = state[f"rolling_{years}y_sum"] / state[f"rolling_{years}y_count"] * 100
+                columns[f"rolling_{years}y_worst"] = state[f"rolling_{years}y_min"] * 100
+        # Too little history gives NaN or infinite ratios; report those as unknown
+        return {field: np.where(np.isfinite(values), values, np.nan) for field, values in columns.items()}
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        """Build the rounded statistics dictionary for one fund."""
+        record = {field: None if np.isnan(values[index]) else round(float(values[index]), 4)
+                  for field, values in self.columns.items()}
+        first_date, last_date = self.state["first_date"][index], self.state["last_date"][index]
+        record["history_start"] = None if np.isnat(first_date) else str(first_date)
+        record["history_end"] = None if np.isnat(last_date) else str(last_date)
+        return record
+
+    def save(self, path: str) -> None:
+        """Write the table atomically as an .npz file."""
+        temporary = f"{path}.tmp.npz"
+        np.savez(temporary, symbol=np.array(self.symbols, dtype=str),
+                 as_of=np.array(self.as_of if self.as_of is not None else np.datetime64("NaT"), dtype="datetime64[D]"),
+                 risk_free_rate=np.array(self.risk_free_rate), **self.state)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FundAnalytics":
+        """Read a table written by `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            state = {field: data[field] for field in STATE_FIELDS + DATE_STATE_FIELDS}
+            return cls(data["symbol"].tolist(), data["as_of"][()], state, float(data["risk_free_rate"]))
+
+def compute_fund_analytics(store: NAVStore, previous: Optional[FundAnalytics] = None,
+                           risk_free_rate: Optional[float] = None) -> FundAnalytics:
+    """Compute statistics for every fund in the store.
+
+    With `previous` covering the same funds and risk-free rate, only the days
+    after its `as_of` date are read and folded in, plus the lookback window
+    the rolling returns need. Otherwise the full history is processed.
+    """
+    risk_free_rate = RISK_FREE_RATE if risk_free_rate is None else risk_free_rate
+    daily_risk_free = np.log1p(risk_free_rate / 100) / TRADING_DAYS
+    dates = np.asarray(store.dates)
+    funds = len(store.symbols)
+
+    incremental = (previous is not None and previous.as_of is not None
+                   and previous.symbols == store.symbols and previous.risk_free_rate == risk_free_rate)
+    if incremental:
+        state = {field: values.copy() for field, values in previous.state.items()}
+        start = int(np.searchsorted(dates, previous.as_of, side="right"))
+        if start >= len(dates):
+            return previous
+        lookback = dates[start] - np.timedelta64(_lookback_days(max(ROLLING_YEARS)) + LOOKBACK_PAD_DAYS, "D")
+        read_from = int(np.searchsorted(dates, lookback, side="left"))
+    else:
+        state = _empty_state(funds)
+        start = read_from = 0
+
+    window_dates = dates[read_from:]
+    for chunk_start in range(0, funds, ANALYTICS_FUND_CHUNK):
+        rows = slice(chunk_start, min(chunk_start + ANALYTICS_FUND_CHUNK, funds))
+        chunk_state = {field: values[rows] for field, values in state.items()}
+        _accumulate(chunk_state, window_dates, store.navs[rows, read_from:], start - read_from, daily_risk_free)
+        for field, values in chunk_state.items():
+            state[field][rows] = values
+
+    as_of = dates[-1] if len(dates) else np.datetime64("NaT")
+    return FundAnalytics(store.symbols, as_of, state, risk_free_rate)
+
+def update_analytics_file(store: NAVStore, path: str = DEFAULT_ANALYTICS_PATH, full: bool = False) -> FundAnalytics:
+    """Bring the analytics table at `path` up to date with the store and save it."""
+    previous = None
+    if not full and os.path.exists(path):
+        previous = FundAnalytics.load(path)
+    analytics = compute_fund_analytics(store, previous)
+    if analytics is not previous:
+        analytics.save(path)
+    return analytics
+
+class AnalyticsSource:
+    """Analytics table that reloads itself when the file on disk changes.
+
+    Returns None until an analytics job has written the file.
+    """
+
+    def __init__(self, path: str = DEFAULT_ANALYTICS_PATH, reload_interval: float = 5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._last_check = None
+        self._analytics = None
+
+    def current(self) -> Optional[FundAnalytics]:
+        """Return the latest table, checking the file at most every reload_interval seconds."""
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.reload_interval:
+            return self._analytics
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                return self._analytics
+            if mtime != self._mtime:
+                try:
+                    self._analytics = FundAnalytics.load(self.path)
+                    self._mtime = mtime
+                except Exception as e:
+                    print(f"Failed to load fund analytics from {self.path}: {str(e)}")
+        return self._analytics
+
+# Run with: python fund_analytics.py [--store nav_store] [--full]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute rolling-return and risk analytics from the NAV store")
+    parser.add_argument("--store", default=DEFAULT_NAV_STORE_PATH, help="NAV store directory")
+    parser.add_argument("--output", help="Analytics file (default: <store>/analytics.npz)")
+    parser.add_argument("--full", action="store_true", help="Recompute from the full history")
+    args = parser.parse_args()
+
+    store = NAVStore(args.store)
+    output = args.output or os.path.join(args.store, "analytics.npz")
+    started = time.perf_counter()
+    analytics = update_analytics_file(store, output, full=args.full)
+    print(f"Analytics for {len(analytics.symbols)} funds as of {analytics.as_of} "
+          f"written to {output} in {time.perf_counter() - started:.2f}s")
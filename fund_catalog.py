@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Default catalog shipped alongside the service
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fund_database.json")
+
+# Columns of a catalog record, split by storage type for the columnar format
+TEXT_FIELDS = ("name", "category", "risk_level", "fund_manager")
+NUMERIC_FIELDS = ("nav", "expense_ratio", "historical_return", "min_investment",
+                  "1y_return", "3y_return", "5y_return")
+
+# Defaults for fields a catalog source does not provide; None means unknown
+FIELD_DEFAULTS = {
+    "category": "Unknown",
+    "risk_level": "Unknown",
+    "fund_manager": None,
+    "nav": None,
+    "expense_ratio": 0.0,
+    "min_investment": None
+}
+
+# Retired symbols and the catalog symbol of the same scheme
+SYMBOL_ALIASES = {
+    "ICICI_PRUDENTIAL": "ICICI_BLUECHIP"
+}
+
+@lru_cache(maxsize=4096)
+def normalize_symbol(fund_symbol: str) -> str:
+    """Normalize a user- or LLM-supplied fund symbol to catalog form."""
+    symbol = fund_symbol.strip().upper().replace(" ", "_")
+    return SYMBOL_ALIASES.get(symbol, symbol)
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+def _normalize_record(symbol: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in missing fields so every record has the same shape."""
+    # Trailing returns are optional; unknown ones stay None
+    trailing = {field: record.get(field) for field in ("1y_return", "3y_return", "5y_return")}
+    historical_return = record.get("historical_return")
+    if historical_return is None:
+        # Prefer the longest available track record
+        historical_return = next(
+            (trailing[field] for field in ("5y_return", "3y_return", "1y_return") if trailing[field] is not None),
+            0.0
+        )
+
+    normalized = {
+        "name": record.get("name") or symbol.replace("_", " "),
+        "category": record.get("category") or FIELD_DEFAULTS["category"],
+        "nav": _optional_float(record.get("nav", FIELD_DEFAULTS["nav"])),
+        "expense_ratio": float(record.get("expense_ratio", FIELD_DEFAULTS["expense_ratio"])),
+        "risk_level": record.get("risk_level") or FIELD_DEFAULTS["risk_level"],
+        "historical_return": float(historical_return),
+        "min_investment": record.get("min_investment", FIELD_DEFAULTS["min_investment"]),
+        "fund_manager": record.get("fund_manager") or FIELD_DEFAULTS["fund_manager"]
+    }
+    normalized.update(trailing)
+    return normalized
+
+# Fields of a normalized record, in the order they are serialized
+RECORD_FIELDS = ("name", "category", "nav", "expense_ratio", "risk_level", "historical_return",
+                 "min_investment", "fund_manager", "1y_return", "3y_return", "5y_return")
+_FIELD_POSITIONS = {field: index for index, field in enumerate(RECORD_FIELDS)}
+
+class FundRecord(Mapping):
+    """Immutable, slotted catalog record that reads like the record dict it replaces.
+
+    Values sit in one tuple in RECORD_FIELDS order, built once per catalog
+    snapshot and shared by every response. The record's JSON encoding is
+    computed on first use and spliced into responses as is.
+    """
+
+    __slots__ = ("symbol", "_values", "_json")
+
+    def __init__(self, symbol: str, record: Mapping):
+        object.__setattr__(self, "symbol", symbol)
+        object.__setattr__(self, "_values", tuple(record[field] for field in RECORD_FIELDS))
+        object.__setattr__(self, "_json", None)
+
+    def __getitem__(self, field: str) -> Any:
+        return self._values[_FIELD_POSITIONS[field]]
+
+    def __iter__(self):
+        return iter(RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RECORD_FIELDS)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("FundRecord is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("FundRecord is immutable")
+
+    def __reduce__(self):
+        return FundRecord, (self.symbol, dict(self))
+
+    def __repr__(self) -> str:
+        return f"FundRecord({self.symbol!r}, {dict(self)!r})"
+
+    @property
+    def json(self) -> bytes:
+        """Return the record serialized as a JSON object."""
+        if self._json is None:
+            from sip_json import dumps
+            object.__setattr__(self, "_json", dumps(dict(self)))
+        return self._json
+
+class CatalogSnapshot:
+    """Immutable view of the catalog with prebuilt lookup indexes."""
+
+    def __init__(self, records: Dict[str, Mapping], version: int):
+        self.version = version
+        self._fingerprint = None
+        self.symbols = tuple(records)
+        # Records are frozen so lookups can hand them out without copying
+        self.records = {
+            symbol: record if isinstance(record, FundRecord) else FundRecord(symbol, record)
+            for symbol, record in records.items()
+        }
+        records = self.records
+        self.position = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+        # Secondary indexes map a value to the symbols that carry it
+        self.by_category = {}
+        self.by_risk_level = {}
+        for symbol, record in records.items():
+            self.by_category.setdefault(record["category"], []).append(symbol)
+            self.by_risk_level.setdefault(record["risk_level"], []).append(symbol)
+
+        # Column arrays aligned with `symbols` for vectorized consumers
+        self.columns = {"symbol": np.array(self.symbols, dtype=str)}
+        for field in TEXT_FIELDS:
+            # An empty string marks an unknown value in the columnar format
+            self.columns[field] = np.array([records[s][field] or "" for s in self.symbols], dtype=str)
+        for field in NUMERIC_FIELDS:
+            self.columns[field] = np.array(
+                [np.nan if records[s][field] is None else records[s][field] for s in self.symbols],
+                dtype=float
+            )
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the records, equal in every process that holds the same catalog."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for symbol in self.symbols:
+                digest.update(symbol.encode("utf-8"))
+                digest.update(self.records[symbol].json)
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+def load_catalog_records(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read catalog records from a JSON file or a columnar .npz file."""
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as data:
+            symbols = data["symbol"].tolist()
+            text_columns = {field: data[field].tolist() for field in TEXT_FIELDS}
+            numeric_columns = {field: data[field].tolist() for field in NUMERIC_FIELDS}
+        records = {}
+        for index, symbol in enumerate(symbols):
+            record = {field: text_columns[field][index] or None for field in TEXT_FIELDS}
+            for field in NUMERIC_FIELDS:
+                value = numeric_columns[field][index]
+                # NaN marks an unknown value in the columnar format
+                record[field] = None if value != value else value
+            records[symbol] = _normalize_record(symbol, record)
+        return records
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return {normalize_symbol(symbol): _normalize_record(normalize_symbol(symbol), record)
+            for symbol, record in raw.items()}
+
+def save_columnar_catalog(records: Dict[str, Dict[str, Any]], path: str) -> None:
+    """Write catalog records to the compact columnar .npz format."""
+    snapshot = CatalogSnapshot(records, version=0)
+    np.savez_compressed(path, **snapshot.columns)
+
+class FundCatalog:
+    """File-backed fund catalog with symbol, category and risk-level indexes.
+
+    Readers always see a complete immutable snapshot. When the backing file's
+    mtime changes, a background thread builds a new snapshot and swaps it in,
+    so lookups never wait on a reload.
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH, reload_interval: float = 1.0,
+                 records: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._reload_lock = threading.Lock()
+        self._overrides = {}
+        self._mtime = os.stat(path).st_mtime
+        self._last_check = time.monotonic()
+        # Records already parsed elsewhere, e.g. by a multi-worker launcher, skip the file read
+        if records is None:
+            records = load_catalog_records(path)
+        self._snapshot = CatalogSnapshot(records, version=0)
+
+    @property
+    def version(self) -> int:
+        """Version counter, bumped on every reload or update."""
+        return self.snapshot().version
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the current snapshot, comparable across processes."""
+        return self.snapshot().fingerprint
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current snapshot, scheduling a reload if the file changed."""
+        self._maybe_reload()
+        return self._snapshot
+
+    def get(self, fund_symbol: str) -> Optional[FundRecord]:
+        """Return the record for a symbol, or None if it is not in the catalog."""
+        records = self.snapshot().records
+        record = records.get(fund_symbol)
+        if record is None:
+            record = records.get(normalize_symbol(fund_symbol))
+        return record
+
+    def symbols(self) -> Tuple[str, ...]:
+        """Return every symbol in catalog order."""
+        return self.snapshot().symbols
+
+    def by_category(self, category: str) -> List[str]:
+        """Return the symbols in a category."""
+        return list(self.snapshot().by_category.get(category, ()))
+
+    def by_risk_level(self, risk_level: str) -> List[str]:
+        """Return the symbols with a risk level."""
+        return list(self.snapshot().by_risk_level.get(risk_level, ()))
+
+    def update(self, funds: Dict[str, Dict[str, Any]]) -> None:
+        """Add or replace funds in memory; they survive reloads of the file."""
+        with self._reload_lock:
+            for symbol, record in funds.items():
+                self._overrides[normalize_symbol(symbol)] = _normalize_record(normalize_symbol(symbol), record)
+            records = dict(self._snapshot.records)
+            records.update(self._overrides)
+            self._snapshot = CatalogSnapshot(records, self._snapshot.version + 1)
+
+    def save_columnar(self, path: str) -> None:
+        """Write the current catalog to the compact columnar .npz format."""
+        save_columnar_catalog(self.snapshot().records, path)
+
+    def _maybe_reload(self) -> None:
+        """Kick off a background reload when the backing file has changed."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime and self._reload_lock.acquire(blocking=False):
+            self._mtime = mtime
+            threading.Thread(target=self._reload, daemon=True).start()
+
+    def _reload(self) -> None:
+        """Build a fresh snapshot from disk and swap it in."""
+        try:
+            records = load_catalog_records(self.path)
+            records.update(self._overrides)
+            self._snapshot = CatalogSnapshot(records, self._snapshot.version + 1)
+        except Exception as e:
+            print(f"Failed to reload fund catalog from {self.path}: {str(e)}")
+        finally:
+            self._reload_lock.release()
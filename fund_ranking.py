@@ -0,0 +1,210 @@
+import re
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from fund_catalog import FundCatalog
+
+# Ordinal position of each catalog risk label, from safest to riskiest
+RISK_LEVEL_ORDINALS = {
+    "Low": 0.0,
+    "Low to Moderate": 1.0,
+    "Moderate": 2.0,
+    "Moderate to High": 3.0,
+    "High": 4.0,
+    "Very High": 5.0
+}
+
+# Upper annualized volatility (%) of each risk level when it is measured from NAV history
+VOLATILITY_RISK_BOUNDS = (2.75, 6.5, 11.5, 16.0, 20.0)
+
+# Where on the risk ladder each advisor risk profile is centred
+RISK_PROFILE_TARGETS = {
+    "conservative": 0.5,
+    "moderate": 2.0,
+    "aggressive": 4.0
+}
+
+# Weights for the 1y/3y/5y trailing returns; longer histories count more
+TRAILING_RETURN_WEIGHTS = {"1y_return": 0.2, "3y_return": 0.3, "5y_return": 0.5}
+
+# Score points lost per squared step of distance from the target risk level
+RISK_MISMATCH_PENALTY = 4.0
+
+# Score points lost per percentage point of expense ratio
+EXPENSE_RATIO_PENALTY = 1.0
+
+# Funds whose minimum investment exceeds the monthly amount sink to the bottom
+INFEASIBLE_PENALTY = 1000.0
+
+# Funds with no recorded minimum rank below every fund known to be affordable
+UNKNOWN_MINIMUM_PENALTY = INFEASIBLE_PENALTY / 2
+
+# Furthest a recommended fund may sit from the profile's target risk level; unknown levels count as 2
+MAX_RISK_DISTANCE = 1.5
+
+# Goal keywords and the category fragments they favour
+GOAL_CATEGORY_BOOSTS = {
+    "tax": ("ELSS", 4.0),
+    "emergency": ("Liquid", 4.0),
+    "liquid": ("Liquid", 4.0),
+    "income": ("Debt", 2.0),
+    "wealth": ("Equity", 2.0),
+    "growth": ("Equity", 2.0)
+}
+
+def goal_tags(investment_goals: Optional[str]) -> FrozenSet[str]:
+    """Extract the goal keywords the ranking engine reacts to."""
+    if not investment_goals:
+        return frozenset()
+    words = re.findall(r"[a-z]+", investment_goals.lower())
+    return frozenset(tag for tag in GOAL_CATEGORY_BOOSTS if any(word.startswith(tag) for word in words))
+
+class FundRanker:
+    """Scores the whole fund catalog at once and returns the top funds.
+
+    The parts of the score that depend only on the catalog and the risk
+    profile are precomputed per catalog version, so a request only adds the
+    goal boost and the min-investment check before a partial sort.
+    """
+
+    def __init__(self, catalog: FundCatalog, analytics=None):
+        self.catalog = catalog
+        # Optional AnalyticsSource; measured returns and volatility override catalog figures
+        self.analytics = analytics
+        self._lock = threading.Lock()
+        self._version = None
+        self._state = None
+
+    def rank(self, risk_profile: str, monthly_amount: Optional[float] = None,
+             investment_goals: Optional[str] = None, k: int = 3) -> List[Tuple[str, float]]:
+        """Return up to k (symbol, score) pairs, best first.
+
+        Funds too far from the profile's risk level are left out rather than
+        used to fill the list, unless no fund is close enough.
+        """
+        state = self._refresh()
+        columns = state["columns"]
+        risk_profile = risk_profile.lower()
+        scores = self._base_score(state, risk_profile) + self._goal_boost(state, goal_tags(investment_goals))
+
+        # Funds the user can't afford each month rank last, and unverified minimums just above them
+        if monthly_amount is not None:
+            scores = (scores
+                      - INFEASIBLE_PENALTY * (columns["min_investment"] > monthly_amount)
+                      - UNKNOWN_MINIMUM_PENALTY * np.isnan(columns["min_investment"]))
+
+        candidates = np.flatnonzero(self._risk_distance(state, risk_profile) <= MAX_RISK_DISTANCE)
+        if len(candidates) == 0:
+            candidates = np.arange(len(scores))
+            k = min(k, 1)
+        k = min(k, len(candidates))
+        if k <= 0:
+            return []
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        symbols = columns["symbol"]
+        return [(str(symbols[i]), round(float(scores[i]), 4)) for i in top]
+
+    def feasibility_bucket(self, monthly_amount: float) -> int:
+        """Return how many distinct min-investment thresholds the amount clears."""
+        columns = self._refresh()["columns"]
+        return int(np.searchsorted(columns["min_investment_levels"], monthly_amount, side="right"))
+
+    def _refresh(self) -> Dict[str, Dict]:
+        """Start from fresh precomputed vectors when the catalog or analytics version changes."""
+        snapshot = self.catalog.snapshot()
+        analytics = self.analytics.current() if self.analytics is not None else None
+        version = (snapshot.version, analytics.version if analytics is not None else None)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    columns = dict(snapshot.columns)
+                    # Unknown minimums stay NaN; they never count as infeasible or as a threshold
+                    known_minimum = columns["min_investment"][~np.isnan(columns["min_investment"])]
+                    columns["min_investment_levels"] = np.unique(known_minimum)
+                    columns["risk_ordinal"] = np.array(
+                        [RISK_LEVEL_ORDINALS.get(level, np.nan) for level in columns["risk_level"]]
+                    )
+                    if analytics is not None:
+                        self._apply_analytics(columns, analytics)
+                    # Swapped as one object so readers never mix catalog versions
+                    self._state = {"columns": columns, "base_scores": {}, "goal_boosts": {}, "risk_distances": {}}
+                    self._version = version
+        return self._state
+
+    def _apply_analytics(self, columns: Dict[str, np.ndarray], analytics) -> None:
+        """Prefer trailing returns and risk levels measured from NAV history where known."""
+        rows = np.array([analytics.position.get(str(symbol), -1) for symbol in columns["symbol"]])
+        matched = rows >= 0
+        if not matched.any():
+            return
+        safe_rows = np.where(matched, rows, 0)
+        for field in TRAILING_RETURN_WEIGHTS:
+            measured = np.where(matched, analytics.columns[field][safe_rows], np.nan)
+            columns[field] = np.where(np.isnan(measured), columns[field], measured)
+        volatility = np.where(matched, analytics.columns["volatility"][safe_rows], np.nan)
+        measured_level = np.searchsorted(VOLATILITY_RISK_BOUNDS, volatility).astype(float)
+        columns["risk_ordinal"] = np.where(np.isnan(volatility), columns["risk_ordinal"], measured_level)
+
+    def expected_returns(self) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Return the catalog columns and each fund's expected annual return (%)."""
+        state = self._refresh()
+        return state["columns"], self._expected_return(state)
+
+    def _expected_return(self, state: Dict[str, Dict]) -> np.ndarray:
+        """Return the cached weighted trailing return of every fund, skipping unknown horizons."""
+        expected_return = state.get("expected_return")
+        if expected_return is None:
+            columns = state["columns"]
+            weighted = np.zeros(len(columns["symbol"]))
+            total_weight = np.zeros(len(columns["symbol"]))
+            for field, weight in TRAILING_RETURN_WEIGHTS.items():
+                known = ~np.isnan(columns[field])
+                weighted += np.where(known, columns[field], 0.0) * weight
+                total_weight += known * weight
+            expected_return = np.where(
+                total_weight > 0,
+                weighted / np.where(total_weight > 0, total_weight, 1.0),
+                columns["historical_return"]
+            )
+            state["expected_return"] = expected_return
+        return expected_return
+
+    def _risk_distance(self, state: Dict[str, Dict], risk_profile: str) -> np.ndarray:
+        """Return how many risk-ladder steps each fund sits from the profile's target."""
+        distance = state["risk_distances"].get(risk_profile)
+        if distance is None:
+            # Unknown risk labels are treated as two steps off target
+            target = RISK_PROFILE_TARGETS.get(risk_profile, RISK_PROFILE_TARGETS["moderate"])
+            levels = state["columns"]["risk_ordinal"]
+            distance = np.where(np.isnan(levels), 2.0, np.abs(levels - target))
+            state["risk_distances"][risk_profile] = distance
+        return distance
+
+    def _base_score(self, state: Dict[str, Dict], risk_profile: str) -> np.ndarray:
+        """Return the cached return, cost and risk-fit score vector for a profile."""
+        scores = state["base_scores"].get(risk_profile)
+        if scores is None:
+            columns = state["columns"]
+            expected_return = self._expected_return(state)
+
+            risk_distance = self._risk_distance(state, risk_profile)
+            scores = (expected_return
+                      - EXPENSE_RATIO_PENALTY * columns["expense_ratio"]
+                      - RISK_MISMATCH_PENALTY * risk_distance ** 2)
+            state["base_scores"][risk_profile] = scores
+        return scores
+
+    def _goal_boost(self, state: Dict[str, Dict], tags: FrozenSet[str]) -> np.ndarray:
+        """Return the cached category boost vector for a set of goal tags."""
+        boost = state["goal_boosts"].get(tags)
+        if boost is None:
+            categories = state["columns"]["category"]
+            boost = np.zeros(len(categories))
+            for tag in tags:
+                fragment, points = GOAL_CATEGORY_BOOSTS[tag]
+                boost += points * (np.char.find(categories, fragment) >= 0)
+            state["goal_boosts"][tags] = boost
+        return boost
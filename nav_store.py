@@ -0,0 +1,268 @@
+import csv
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sip_cashflows import build_contribution_schedule, xirr
+
+# Store location used by the service unless overridden
+DEFAULT_NAV_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nav_store")
+
+# Files making up a store directory
+DATES_FILE = "dates.npy"
+NAV_FILE = "nav.npy"
+FUNDS_FILE = "funds.json"
+
+# AMFI NAV history columns, matched case-insensitively against the CSV header
+AMFI_CODE_COLUMN = "scheme code"
+AMFI_NAME_COLUMN = "scheme name"
+AMFI_NAV_COLUMN = "net asset value"
+AMFI_DATE_COLUMN = "date"
+AMFI_DATE_FORMATS = ("%d-%b-%Y", "%d-%m-%Y", "%Y-%m-%d")
+
+# Rows buffered before they are scattered into the memory-mapped NAV matrix
+INGEST_BATCH_ROWS = 500_000
+
+# Funds backtested per pass, bounding how much of the matrix is paged in at once
+BACKTEST_FUND_CHUNK = 256
+
+@lru_cache(maxsize=65536)
+def _parse_date(value: str) -> np.datetime64:
+    """Parse an AMFI date string to datetime64[D]."""
+    for date_format in AMFI_DATE_FORMATS:
+        try:
+            return np.datetime64(datetime.strptime(value.strip(), date_format).date(), "D")
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value}")
+
+def _iter_amfi_rows(paths: Sequence[str]) -> Iterable[Tuple[str, str, str, str]]:
+    """Yield (scheme code, scheme name, nav, date) from AMFI-style CSV dumps.
+
+    AMFI files are semicolon-separated and interleave fund-house headings and
+    blank lines with the data rows; anything that isn't a data row is skipped.
+    Comma-separated files with the same column names also work.
+    """
+    for path in paths:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            header_line = f.readline()
+            delimiter = ";" if header_line.count(";") >= header_line.count(",") else ","
+            header = [column.strip().lower() for column in header_line.split(delimiter)]
+            try:
+                columns = [header.index(name) for name in
+                           (AMFI_CODE_COLUMN, AMFI_NAME_COLUMN, AMFI_NAV_COLUMN, AMFI_DATE_COLUMN)]
+            except ValueError:
+                raise ValueError(f"{path} is missing AMFI columns; header was: {header_line.strip()}")
+            width = max(columns) + 1
+            for row in csv.reader(f, delimiter=delimiter):
+                if len(row) < width:
+                    continue
+                yield tuple(row[column].strip() for column in columns)
+
+def ingest_amfi_csv(paths: Sequence[str], output_dir: str = DEFAULT_NAV_STORE_PATH,
+                    symbol_map: Optional[Dict[str, str]] = None) -> "NAVStore":
+    """Build a NAV store from AMFI-style CSV dumps and return it opened.
+
+    Two streaming passes keep memory flat: the first collects the fund and
+    date axes, the second scatters NAVs straight into a memory-mapped
+    funds x dates matrix. Days a fund didn't report stay NaN. `symbol_map`
+    maps scheme codes to catalog symbols; unmapped funds keep their code.
+    """
+    symbol_map = symbol_map or {}
+    paths = list(paths)
+
+    # Pass 1: the fund and date axes
+    names: Dict[str, str] = {}
+    date_strings = set()
+    for code, name, nav, date in _iter_amfi_rows(paths):
+        names.setdefault(code, name)
+        date_strings.add(date)
+    codes = sorted(names)
+    dates = np.unique(np.array([_parse_date(value) for value in date_strings], dtype="datetime64[D]"))
+    fund_position = {code: index for index, code in enumerate(codes)}
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, DATES_FILE), dates)
+    navs = np.lib.format.open_memmap(os.path.join(output_dir, NAV_FILE), mode="w+",
+                                     dtype=np.float64, shape=(len(codes), len(dates)))
+    navs[:] = np.nan
+
+    # Pass 2: scatter NAVs into the matrix in large vectorized batches
+    def flush(fund_rows, date_values, nav_values):
+        if fund_rows:
+            columns = np.searchsorted(dates, np.array(date_values, dtype="datetime64[D]"))
+            navs[np.array(fund_rows), columns] = np.array(nav_values)
+
+    fund_rows, date_values, nav_values = [], [], []
+    for code, name, nav, date in _iter_amfi_rows(paths):
+        try:
+            value = float(nav)
+        except ValueError:
+            # AMFI reports suspended NAVs as "N.A."
+            continue
+        fund_rows.append(fund_position[code])
+        date_values.append(_parse_date(date))
+        nav_values.append(value)
+        if len(fund_rows) >= INGEST_BATCH_ROWS:
+            flush(fund_rows, date_values, nav_values)
+            fund_rows, date_values, nav_values = [], [], []
+    flush(fund_rows, date_values, nav_values)
+    navs.flush()
+    del navs
+
+    funds = [{"symbol": symbol_map.get(code, code), "scheme_code": code, "name": names[code]} for code in codes]
+    with open(os.path.join(output_dir, FUNDS_FILE), "w", encoding="utf-8") as f:
+        json.dump(funds, f, indent=2)
+    return NAVStore(output_dir)
+
+class NAVStore:
+    """Read-only NAV history backed by memory-mapped .npy files.
+
+    `dates` is a sorted datetime64[D] axis and `navs` a funds x dates float
+    matrix with NaN for days a fund didn't report. Nothing is read from disk
+    until a slice of it is used.
+    """
+
+    def __init__(self, path: str = DEFAULT_NAV_STORE_PATH):
+        self.path = path
+        self.dates = np.load(os.path.join(path, DATES_FILE), mmap_mode="r")
+        self.navs = np.load(os.path.join(path, NAV_FILE), mmap_mode="r")
+        with open(os.path.join(path, FUNDS_FILE), "r", encoding="utf-8") as f:
+            self.funds = json.load(f)
+        self.symbols = tuple(fund["symbol"] for fund in self.funds)
+        self.position = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.position
+
+    def date_range(self, start: Optional[str] = None, end: Optional[str] = None) -> slice:
+        """Return the slice of the date axis within [start, end]."""
+        first = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        last = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        return slice(first, last)
+
+    def series(self, symbol: str, start: Optional[str] = None,
+               end: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (dates, navs) for one fund as zero-copy views of the store."""
+        window = self.date_range(start, end)
+        return self.dates[window], self.navs[self.position[symbol], window]
+
+    def window(self, symbols: Optional[Sequence[str]] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (dates, funds x dates navs) for many funds.
+
+        All funds come back as a zero-copy view; a subset is gathered into a
+        new array holding only the requested rows and dates.
+        """
+        window = self.date_range(start, end)
+        if symbols is None:
+            return self.dates[window], self.navs[:, window]
+        rows = [self.position[symbol] for symbol in symbols]
+        return self.dates[window], self.navs[rows, window]
+
+    def latest_nav(self, symbol: str) -> Optional[Tuple[np.datetime64, float]]:
+        """Return the most recent (date, nav) reported for a fund."""
+        row = self.navs[self.position[symbol]]
+        reported = np.flatnonzero(~np.isnan(row))
+        if reported.size == 0:
+            return None
+        return self.dates[reported[-1]], float(row[reported[-1]])
+
+@lru_cache(maxsize=1)
+def open_nav_store(path: Optional[str] = None) -> NAVStore:
+    """Open the service's NAV store once (SIP_NAV_STORE_PATH or the default directory)."""
+    return NAVStore(path or os.getenv("SIP_NAV_STORE_PATH", DEFAULT_NAV_STORE_PATH))
+
+def _next_reported(navs: np.ndarray) -> np.ndarray:
+    """For every day, the index of the same or next day with a NAV (len if none), per fund."""
+    days = navs.shape[-1]
+    index = np.where(np.isnan(navs), days, np.arange(days))
+    return np.minimum.accumulate(index[..., ::-1], axis=-1)[..., ::-1]
+
+def backtest_sip(store: NAVStore, symbols: Sequence[str], amount: float, start_date: str,
+                 end_date: Optional[str] = None, frequency: str = "monthly") -> Dict[str, Dict[str, float]]:
+    """Replay a SIP in each fund against its actual NAV history.
+
+    Each instalment buys units at the first NAV on or after its date.
+    Instalments before a fund's first NAV are skipped. Holdings are valued at
+    the last NAV on or before `end_date` (default: the end of the store). All
+    funds in a chunk are processed together, including one batched XIRR.
+    """
+    end = store.dates[-1] if end_date is None else np.datetime64(end_date, "D")
+    start = np.datetime64(start_date, "D")
+    years = int(np.ceil((end - start).astype(int) / 365.25)) + 1
+    schedule_dates, schedule_amounts = build_contribution_schedule(amount, frequency, str(start), years)
+    # Instalments before the store's first date have no NAV to buy at
+    in_range = (schedule_dates >= store.dates[0]) & (schedule_dates <= end)
+    schedule_dates, schedule_amounts = schedule_dates[in_range], schedule_amounts[in_range]
+
+    dates, _ = store.window(None, str(start), str(end))
+    if len(dates) == 0:
+        raise ValueError(f"No NAV history between {start} and {end}")
+    days = len(dates)
+    contribution_days = np.searchsorted(dates, schedule_dates, side="left")
+
+    results = {}
+    for chunk_start in range(0, len(symbols), BACKTEST_FUND_CHUNK):
+        chunk = list(symbols[chunk_start:chunk_start + BACKTEST_FUND_CHUNK])
+        _, navs = store.window(chunk, str(start), str(end))
+        funds = np.arange(len(chunk))
+
+        # Buy on the first reported day at or after each instalment; `days` means never
+        next_reported = np.concatenate([_next_reported(navs), np.full((len(chunk), 1), days)], axis=1)
+        buy_day = next_reported[:, contribution_days]
+        bought = (buy_day < days) & (contribution_days[None, :] >= next_reported[:, :1])
+        buy_nav = navs[funds[:, None], np.minimum(buy_day, days - 1)]
+        invested = np.where(bought, schedule_amounts[None, :], 0.0)
+        units = np.where(bought, invested / np.where(bought, buy_nav, 1.0), 0.0)
+
+        # Value holdings at each fund's last reported NAV in the window
+        reported = ~np.isnan(navs)
+        has_nav = reported.any(axis=1)
+        last_day = days - 1 - np.argmax(reported[:, ::-1], axis=1)
+        final_nav = np.where(has_nav, navs[funds, last_day], np.nan)
+        total_units = units.sum(axis=1)
+        total_invested = invested.sum(axis=1)
+        current_value = np.where(has_nav, total_units * final_nav, 0.0)
+
+        # Outflows on purchase days and one inflow at valuation; skipped slots are zero flows
+        valuation_dates = dates[last_day]
+        flow_dates = np.where(bought, dates[np.minimum(buy_day, days - 1)], valuation_dates[:, None])
+        flow_dates = np.concatenate([flow_dates, valuation_dates[:, None]], axis=1)
+        flows = np.concatenate([-invested, current_value[:, None]], axis=1)
+        rates = xirr(flow_dates, flows)
+
+        for index, symbol in enumerate(chunk):
+            results[symbol] = {
+                "instalments": int(bought[index].sum()),
+                "invested_amount": round(float(total_invested[index]), 2),
+                "units": round(float(total_units[index]), 4),
+                "current_nav": None if not has_nav[index] else round(float(final_nav[index]), 4),
+                "current_value": round(float(current_value[index]), 2),
+                "xirr": None if np.isnan(rates[index]) else round(float(rates[index]) * 100, 2),
+                "valuation_date": str(valuation_dates[index])
+            }
+    return results
+
+# Run with: python nav_store.py ingest NAVAll_2005.csv NAVAll_2006.csv ... --output nav_store
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a memory-mapped NAV store from AMFI CSV dumps")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Ingest AMFI-style CSV files")
+    ingest.add_argument("csv", nargs="+", help="CSV files to ingest")
+    ingest.add_argument("--output", default=DEFAULT_NAV_STORE_PATH, help="Store directory")
+    ingest.add_argument("--symbol-map", help="JSON file mapping scheme codes to catalog symbols")
+    args = parser.parse_args()
+
+    symbol_map = None
+    if args.symbol_map:
+        with open(args.symbol_map, "r", encoding="utf-8") as f:
+            symbol_map = json.load(f)
+    store = ingest_amfi_csv(args.csv, args.output, symbol_map)
+    print(f"Stored {len(store.symbols)} funds x {len(store.dates)} days in {args.output}")
@@ -0,0 +1,208 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from sip_metrics import count_shed, set_queue_depth
+
+# Sustained requests per second allowed per client; 0 disables rate limiting
+RATE_LIMIT = float(os.getenv("SIP_RATE_LIMIT", "20"))
+
+# Requests a client may send in a burst above the sustained rate
+RATE_BURST = float(os.getenv("SIP_RATE_BURST", "40"))
+
+# Header naming the client behind a trusted proxy (e.g. x-forwarded-for); the peer address otherwise
+CLIENT_HEADER = os.getenv("SIP_CLIENT_HEADER", "").lower().encode("latin-1")
+
+# Token buckets kept at once; the least recently seen clients are forgotten first
+MAX_TRACKED_CLIENTS = 10000
+
+# API requests admitted at once before new ones get a 503
+MAX_INFLIGHT = int(os.getenv("SIP_MAX_INFLIGHT", "256"))
+
+# Running plus waiting work per stage beyond which new work is shed
+RENDER_QUEUE_LIMIT = int(os.getenv("SIP_RENDER_QUEUE_LIMIT", "16"))
+LLM_QUEUE_LIMIT = int(os.getenv("SIP_LLM_QUEUE_LIMIT", "8"))
+
+# Only API routes are admission controlled; docs and /metrics always answer
+ADMISSION_PREFIX = "/api/"
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second, up to `burst`."""
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Take a token, returning 0 on success or the seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class RateLimiter:
+    """Per-client token buckets, bounded to the most recently seen clients."""
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: float = RATE_BURST, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client: str) -> float:
+        """Return 0 if the client may proceed, otherwise the seconds it should wait."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket.take(now)
+
+class Overloaded(Exception):
+    """Raised when a stage is full, with a Retry-After hint in seconds."""
+
+    def __init__(self, stage: str, retry_after: int):
+        super().__init__(f"The {stage} queue is full, retry in {retry_after}s")
+        self.stage = stage
+        self.retry_after = retry_after
+
+class StageGate:
+    """Bounded count of work running or waiting in one stage.
+
+    Work that finds the stage full is shed rather than queued, so a burst
+    can't build up a backlog that slows every later request. The gate keeps
+    a running average of how long work holds a slot to estimate Retry-After.
+    """
+
+    # Weight of the newest hold time in the running average
+    SMOOTHING = 0.2
+
+    def __init__(self, name: str, limit: int, concurrency: int = 1):
+        self.name = name
+        self.limit = limit
+        self.concurrency = max(concurrency, 1)
+        self.depth = 0
+        self.average_seconds = 0.0
+        self._lock = threading.Lock()
+        set_queue_depth(name, 0)
+
+    def try_acquire(self) -> bool:
+        """Take a place in the stage, or return False if it is full."""
+        with self._lock:
+            if self.depth >= self.limit:
+                return False
+            self.depth += 1
+            depth = self.depth
+        set_queue_depth(self.name, depth)
+        return True
+
+    def release(self, held_seconds: float) -> None:
+        """Give back a place held for `held_seconds`."""
+        with self._lock:
+            self.depth -= 1
+            depth = self.depth
+            self.average_seconds += self.SMOOTHING * (held_seconds - self.average_seconds)
+        set_queue_depth(self.name, depth)
+
+    def retry_after(self) -> int:
+        """Whole seconds until the current queue has likely drained, at least one."""
+        return max(1, math.ceil(self.average_seconds * self.depth / self.concurrency))
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a place for the `with` block, raising Overloaded if the stage is full."""
+        if not self.try_acquire():
+            count_shed(f"{self.name}_full")
+            raise Overloaded(self.name, self.retry_after())
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    @contextmanager
+    def optional_slot(self, shed_reason: str) -> Iterator[bool]:
+        """Hold a place for the `with` block if one is free, yielding whether it was.
+
+        For work the response can do without; a full stage is counted under
+        `shed_reason` and the caller degrades instead of failing.
+        """
+        if not self.try_acquire():
+            count_shed(shed_reason)
+            yield False
+            return
+        started = time.perf_counter()
+        try:
+            yield True
+        finally:
+            self.release(time.perf_counter() - started)
+
+def client_id(scope) -> str:
+    """Identify the client of an ASGI request for rate limiting."""
+    if CLIENT_HEADER:
+        for name, value in scope.get("headers", ()):
+            if name == CLIENT_HEADER:
+                # Proxies append hops, so the first address is the original client
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+async def _reject(send, status: int, detail: str, retry_after: int) -> None:
+    """Answer an ASGI request with a JSON error and a Retry-After header."""
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(retry_after).encode("latin-1"))
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+class AdmissionMiddleware:
+    """ASGI middleware applying per-client rate limits and an in-flight cap to API routes."""
+
+    def __init__(self, app, limiter: RateLimiter = None, inflight: StageGate = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter()
+        self.inflight = inflight or StageGate("request", MAX_INFLIGHT, concurrency=MAX_INFLIGHT)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(ADMISSION_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        wait = self.limiter.check(client_id(scope))
+        if wait > 0:
+            count_shed("rate_limited")
+            await _reject(send, 429, "Rate limit exceeded", math.ceil(wait))
+            return
+        if not self.inflight.try_acquire():
+            count_shed("overloaded")
+            await _reject(send, 503, "Server is overloaded", self.inflight.retry_after())
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.inflight.release(time.perf_counter() - started)
@@ -1,16 +1,21 @@
-from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from langchain.schema.runnable import RunnableSequence
-from langchain_community.llms import Ollama  # Changed to use Ollama
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+import asyncio
+import hashlib
 import os
 import json
+import numpy as np
 from sip_utils import (
     calculate_sip_returns, get_fund_data, recommend_funds, 
     generate_sip_visualization, calculate_daily_to_monthly,
-    calculate_weekly_to_monthly
+    calculate_weekly_to_monthly, project_sip, get_catalog_version,
+    fund_catalog, fund_ranker
 )
+from fund_ranking import goal_tags
+from sip_cashflows import PERIOD_DAYS, project_regular_contributions
+from sip_cache import LRUCache, DiskCache, SharedCache
+from sip_metrics import count, stage
+from sip_workers import SHARED_CACHE_ENV
 
 # Define the output structure
 class SIPRecommendation(BaseModel):
@@ -25,105 +30,405 @@ class MockLLMResponse:
     def __init__(self, content):
         self.content = content
 
+def _to_monthly_amount(savings_capacity, frequency):
+    """Convert a savings capacity at the given frequency to a monthly amount."""
+    if frequency.lower() == "daily":
+        return calculate_daily_to_monthly(savings_capacity)
+    elif frequency.lower() == "weekly":
+        return calculate_weekly_to_monthly(savings_capacity)
+    else:  # Monthly
+        return savings_capacity
+
+def _contribution_basis(savings_capacity, frequency, monthly_amount):
+    """Pick the frequency and per-contribution amount the user actually saves at."""
+    frequency = frequency.lower()
+    if frequency in ("daily", "weekly"):
+        return frequency, savings_capacity
+    return "monthly", monthly_amount
+
+def _rounded_returns(projection, index=()):
+    """Round a projection's final figures for the response."""
+    return {
+        "invested_amount": round(float(projection["invested_amount"][index]), 2),
+        "expected_returns": round(float(projection["expected_returns"][index]), 2),
+        "maturity_value": round(float(projection["maturity_value"][index]), 2)
+    }
+
+def _resolve_risk_profile(age, risk_tolerance=None):
+    """Determine the normalized risk profile from age and stated risk tolerance."""
+    if risk_tolerance:
+        risk_profile = risk_tolerance.lower()
+    else:
+        if age < 30:
+            risk_profile = "aggressive"
+        elif age < 50:
+            risk_profile = "moderate"
+        else:
+            risk_profile = "conservative"
+    
+    # Normalize risk profile to one of the three categories
+    if "conserv" in risk_profile:
+        return "conservative"
+    elif "aggress" in risk_profile or "high" in risk_profile:
+        return "aggressive"
+    else:
+        return "moderate"
+
+def _age_bucket(age):
+    """Collapse age into the brackets the rule-based advisor distinguishes."""
+    if age < 30:
+        return 0
+    elif age < 40:
+        return 1
+    elif age < 50:
+        return 2
+    else:
+        return 3
+
+def _investment_timeframe(age):
+    """Determine the investment timeframe in years based on age."""
+    if age < 30:
+        return 30
+    elif age < 40:
+        return 20
+    elif age < 50:
+        return 15
+    else:
+        return 10
+
+def _expected_return_rate(risk_profile):
+    """Determine the expected annual return rate for a normalized risk profile."""
+    if risk_profile == "conservative":
+        return 8.0
+    elif risk_profile == "moderate":
+        return 12.0
+    else:  # aggressive
+        return 15.0
+
 class SIPAdvisorAgent:
-    def __init__(self, use_fallback=True):
+    def __init__(self, use_fallback=True, cache_size=None, cache_ttl=None,
+                 llm_concurrency=None, llm_timeout=None, llm_cache_path=None, llm_mode=None):
         """Initialize the SIP Advisor Agent."""
         self.use_fallback = use_fallback
         
+        # Rule-based results depend only on normalized inputs, so memoize them
+        if cache_size is None:
+            cache_size = int(os.getenv("SIP_RECOMMENDATION_CACHE_SIZE", "4096"))
+        if cache_ttl is None:
+            cache_ttl = float(os.getenv("SIP_RECOMMENDATION_CACHE_TTL", "3600"))
+        # Under the multi-worker launcher every worker reads and fills one shared cache
+        shared_cache_path = os.getenv(SHARED_CACHE_ENV)
+        if shared_cache_path:
+            self.recommendation_cache = SharedCache(shared_cache_path, "recommendations", maxsize=cache_size, ttl=cache_ttl)
+        else:
+            self.recommendation_cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self._cache_catalog_version = get_catalog_version()
+        
         if not self.use_fallback:
             try:
-                # Try to initialize Ollama with the Llama2 model
-                # You need to have Ollama running locally with the Llama2 model
-                self.llm = Ollama(model="llama2")
-                self.output_parser = PydanticOutputParser(pydantic_object=SIPRecommendation)
-                
-                # Create the prompt template
-                template = """
-                You are a financial advisor specializing in Systematic Investment Plans (SIPs).
-                
-                Based on the following user information, recommend an appropriate SIP strategy:
-                
-                - User's savings capacity: {savings_capacity} {frequency} in {currency}
-                - Age: {age}
-                - Investment goals: {goals}
-                - Risk tolerance (if specified): {risk_tolerance}
-                
-                {format_instructions}
-                
-                Provide a recommendation that includes:
-                1. A suitable monthly SIP amount based on their savings capacity
-                2. An appropriate investment timeframe
-                3. An assessment of their risk profile
-                4. Recommended mutual funds or ETFs
-                5. Expected annual return rate
+                # Bound concurrent generations and give up on slow ones
+                if llm_concurrency is None:
+                    llm_concurrency = int(os.getenv("SIP_LLM_CONCURRENCY", "2"))
+                if llm_timeout is None:
+                    llm_timeout = float(os.getenv("SIP_LLM_TIMEOUT", "30"))
+                self.llm_semaphore = asyncio.Semaphore(llm_concurrency)
+                self.llm_timeout = llm_timeout
                 
-                For recommended funds, please use only the following fund symbols: HDFC_EQUITY, ICICI_BLUECHIP, SBI_SMALLCAP, AXIS_MIDCAP, KOTAK_STANDARD, FRANKLIN_TAXSHIELD, ICICI_BALANCED, HDFC_HYBRID, SBI_DEBT, ADITYA_CORPORATE_BOND.
+                if llm_mode is None:
+                    llm_mode = os.getenv("SIP_LLM_MODE", "structured")
+                if llm_mode == "structured":
+                    self._init_structured_llm()
+                else:
+                    self._init_llm_chain()
                 
-                Your response should be in the exact JSON format specified above.
-                """
+                # Concurrent identical prompts share a single generation
+                self._inflight_generations = {}
                 
-                self.prompt = ChatPromptTemplate.from_template(
-                    template=template,
-                    partial_variables={"format_instructions": self.output_parser.get_format_instructions()}
-                )
-                
-                self.chain = RunnableSequence(
-                    self.prompt | self.llm | self.output_parser
-                )
+                # Persist LLM answers across restarts, keyed by the rendered prompt
+                if llm_cache_path is None:
+                    llm_cache_path = os.getenv("SIP_LLM_CACHE_PATH", ".sip_llm_cache.sqlite3")
+                self.llm_cache = DiskCache(llm_cache_path)
             except Exception as e:
                 print(f"Failed to initialize Ollama: {str(e)}. Falling back to rule-based mode.")
                 self.use_fallback = True
     
-    def process_user_input(self, savings_capacity, frequency, currency, age, goals, risk_tolerance=None):
-        """Process user input and generate SIP recommendations."""
+    def _init_structured_llm(self):
+        """Set up schema-constrained JSON generation that reuses the evaluated prompt prefix."""
+        from sip_llm import StructuredOllama, StructuredPrompt
         
-        # If using fallback or Ollama initialization failed, use rule-based approach
-        if self.use_fallback:
-            recommendation = self._generate_rule_based_recommendation(
+        self.prompt = StructuredPrompt(fund_catalog.symbols)
+        self.chain = StructuredOllama(SIPRecommendation, self.prompt, timeout=self.llm_timeout)
+    
+    def _init_llm_chain(self):
+        """Set up the LangChain prompt, Ollama LLM and free-text output parser."""
+        # The LLM stack is heavy to import, so only load it in LLM mode
+        from langchain.prompts import ChatPromptTemplate
+        from langchain.output_parsers import PydanticOutputParser
+        from langchain.schema.runnable import RunnableSequence
+        from langchain_community.llms import Ollama  # Changed to use Ollama
+        
+        # Try to initialize Ollama with the Llama2 model
+        # You need to have Ollama running locally with the Llama2 model
+        self.llm = Ollama(model="llama2")
+        self.output_parser = PydanticOutputParser(pydantic_object=SIPRecommendation)
+        
+        # Create the prompt template
+        template = """
+        You are a financial advisor specializing in Systematic Investment Plans (SIPs).
+        
+        Based on the following user information, recommend an appropriate SIP strategy:
+        
+        - User's savings capacity: {savings_capacity} {frequency} in {currency}
+        - Age: {age}
+        - Investment goals: {goals}
+        - Risk tolerance (if specified): {risk_tolerance}
+        
+        {format_instructions}
+        
+        Provide a recommendation that includes:
+        1. A suitable monthly SIP amount based on their savings capacity
+        2. An appropriate investment timeframe
+        3. An assessment of their risk profile
+        4. Recommended mutual funds or ETFs
+        5. Expected annual return rate
+        
+        For recommended funds, please use only the following fund symbols: {fund_symbols}.
+        
+        Your response should be in the exact JSON format specified above.
+        """
+        
+        self.prompt = ChatPromptTemplate.from_template(
+            template=template,
+            partial_variables={
+                "format_instructions": self.output_parser.get_format_instructions(),
+                "fund_symbols": ", ".join(fund_catalog.symbols())
+            }
+        )
+        
+        self.chain = RunnableSequence(
+            self.prompt | self.llm | self.output_parser
+        )
+    
+    def process_user_input(self, savings_capacity, frequency, currency, age, goals, risk_tolerance=None, include_visualization=True,
+                           rule_based=False):
+        """Process user input and generate SIP recommendations.
+        
+        `rule_based` skips the LLM for this request even in LLM mode.
+        """
+        
+        # Rule-based results are served from the cache when possible
+        if self.use_fallback or rule_based:
+            cache_key = self._cache_key(savings_capacity, frequency, age, goals, risk_tolerance, include_visualization)
+            cached = self.recommendation_cache.get(cache_key)
+            if cached is not None:
+                count("recommendation_cache_hit")
+                return dict(cached)
+            count("recommendation_cache_miss")
+            result = self._process_user_input(
+                savings_capacity, frequency, currency, age, goals, risk_tolerance, include_visualization, rule_based=True
+            )
+            self.recommendation_cache.set(cache_key, result)
+            return dict(result)
+        
+        return self._process_user_input(
+            savings_capacity, frequency, currency, age, goals, risk_tolerance, include_visualization
+        )
+    
+    def cache_stats(self):
+        """Return hit/miss/eviction counters for the recommendation cache."""
+        return self.recommendation_cache.stats()
+    
+    def _cache_key(self, savings_capacity, frequency, age, goals, risk_tolerance, include_visualization):
+        """Build the recommendation cache key from normalized inputs."""
+        # Results are keyed by a hash of the catalog, so workers agree on it after a reload
+        # and one that hasn't reloaded yet can't serve or overwrite entries of the new catalog
+        catalog_version = get_catalog_version()
+        if catalog_version != self._cache_catalog_version:
+            # Entries of the old catalog can no longer be hit, so free their space
+            self.recommendation_cache.clear()
+            self._cache_catalog_version = catalog_version
+        
+        # Frequency-adjusted returns follow the real contribution schedule, not just its monthly total
+        return (
+            catalog_version,
+            frequency.lower(),
+            round(savings_capacity, 2),
+            _age_bucket(age),
+            _resolve_risk_profile(age, risk_tolerance),
+            goal_tags(goals),
+            include_visualization
+        )
+    
+    async def aprocess_user_input(self, savings_capacity, frequency, currency, age, goals, risk_tolerance=None, include_visualization=True,
+                                  rule_based=False):
+        """Process user input without blocking the event loop on LLM inference."""
+        
+        # The rule-based path is cheap and cached, so answer it inline
+        if self.use_fallback or rule_based:
+            return self.process_user_input(
+                savings_capacity, frequency, currency, age, goals, risk_tolerance, include_visualization, rule_based=True
+            )
+        
+        llm_inputs = self._llm_inputs(savings_capacity, frequency, currency, age, goals, risk_tolerance)
+        prompt_key = self._prompt_key(llm_inputs)
+        
+        # Join an identical generation that is already running
+        generation = self._inflight_generations.get(prompt_key)
+        if generation is None:
+            generation = asyncio.ensure_future(self._agenerate_recommendation(
+                prompt_key, llm_inputs, savings_capacity, frequency, currency, age, goals, risk_tolerance
+            ))
+            self._inflight_generations[prompt_key] = generation
+            generation.add_done_callback(lambda _: self._inflight_generations.pop(prompt_key, None))
+        recommendation = await asyncio.shield(generation)
+        
+        # Projections and charts are CPU-bound, so keep them off the event loop
+        return await asyncio.to_thread(
+            self._build_result, recommendation, savings_capacity, frequency, include_visualization
+        )
+    
+    async def _agenerate_recommendation(self, prompt_key, llm_inputs, savings_capacity, frequency, currency, age, goals, risk_tolerance):
+        """Ask the LLM for a recommendation, falling back to rules on failure or timeout."""
+        cached = self.llm_cache.get(prompt_key)
+        if cached is not None:
+            count("llm_cache_hit")
+            return SIPRecommendation.parse_raw(cached)
+        count("llm_cache_miss")
+        
+        try:
+            async with self.llm_semaphore:
+                with stage("llm"):
+                    recommendation = await asyncio.wait_for(self.chain.ainvoke(llm_inputs), timeout=self.llm_timeout)
+            recommendation = self._validate_recommendation(
+                recommendation, savings_capacity, frequency, age, goals, risk_tolerance
+            )
+        except asyncio.TimeoutError:
+            print(f"LLM inference timed out after {self.llm_timeout}s. Using rule-based approach.")
+            count("llm_timeout")
+            count("llm_fallback")
+            return self._generate_rule_based_recommendation(
                 savings_capacity, frequency, currency, age, goals, risk_tolerance
             )
-        else:
-            try:
-                # Try using the LLM
-                recommendation = self.chain.invoke({
-                    "savings_capacity": savings_capacity,
-                    "frequency": frequency,
-                    "currency": currency,
-                    "age": age,
-                    "goals": goals,
-                    "risk_tolerance": risk_tolerance or "Not specified"
-                })
-            except Exception as e:
-                print(f"LLM inference failed: {str(e)}. Using rule-based approach.")
+        except Exception as e:
+            print(f"LLM inference failed: {str(e)}. Using rule-based approach.")
+            count("llm_fallback")
+            return self._generate_rule_based_recommendation(
+                savings_capacity, frequency, currency, age, goals, risk_tolerance
+            )
+        
+        self.llm_cache.set(prompt_key, recommendation.json())
+        return recommendation
+    
+    def _validate_recommendation(self, recommendation, savings_capacity, frequency, age, goals, risk_tolerance):
+        """Check an LLM recommendation against the catalog without asking the model again.
+        
+        Unknown or repeated fund symbols are dropped, and if none are left the
+        rule-based picks for the same profile take their place.
+        """
+        records = fund_catalog.snapshot().records
+        risk_profile = _resolve_risk_profile(age, recommendation.risk_profile or risk_tolerance)
+        funds = list(dict.fromkeys(symbol for symbol in recommendation.recommended_funds if symbol in records))
+        if len(funds) < len(recommendation.recommended_funds):
+            count("llm_invalid_symbols")
+        if not funds:
+            funds = recommend_funds(risk_profile, goals, _to_monthly_amount(savings_capacity, frequency))
+        return SIPRecommendation(
+            monthly_sip_amount=recommendation.monthly_sip_amount,
+            investment_timeframe_years=recommendation.investment_timeframe_years,
+            risk_profile=risk_profile,
+            recommended_funds=funds,
+            expected_return_rate=recommendation.expected_return_rate
+        )
+    
+    def _llm_inputs(self, savings_capacity, frequency, currency, age, goals, risk_tolerance):
+        """Build the prompt variables for the LLM chain."""
+        return {
+            "savings_capacity": savings_capacity,
+            "frequency": frequency,
+            "currency": currency,
+            "age": age,
+            "goals": goals,
+            "risk_tolerance": risk_tolerance or "Not specified"
+        }
+    
+    def _prompt_key(self, llm_inputs):
+        """Hash the fully rendered prompt for caching and request coalescing."""
+        return hashlib.sha256(self.prompt.format(**llm_inputs).encode("utf-8")).hexdigest()
+    
+    def _process_user_input(self, savings_capacity, frequency, currency, age, goals, risk_tolerance, include_visualization,
+                            rule_based=False):
+        """Generate SIP recommendations without consulting the cache."""
+        
+        # If using fallback or Ollama initialization failed, use rule-based approach
+        if self.use_fallback or rule_based:
+            with stage("recommendation"):
                 recommendation = self._generate_rule_based_recommendation(
                     savings_capacity, frequency, currency, age, goals, risk_tolerance
                 )
+        else:
+            llm_inputs = self._llm_inputs(savings_capacity, frequency, currency, age, goals, risk_tolerance)
+            prompt_key = self._prompt_key(llm_inputs)
+            cached = self.llm_cache.get(prompt_key)
+            if cached is not None:
+                count("llm_cache_hit")
+                recommendation = SIPRecommendation.parse_raw(cached)
+            else:
+                count("llm_cache_miss")
+                try:
+                    # Try using the LLM
+                    with stage("llm"):
+                        recommendation = self.chain.invoke(llm_inputs)
+                    recommendation = self._validate_recommendation(
+                        recommendation, savings_capacity, frequency, age, goals, risk_tolerance
+                    )
+                    self.llm_cache.set(prompt_key, recommendation.json())
+                except Exception as e:
+                    print(f"LLM inference failed: {str(e)}. Using rule-based approach.")
+                    count("llm_fallback")
+                    recommendation = self._generate_rule_based_recommendation(
+                        savings_capacity, frequency, currency, age, goals, risk_tolerance
+                    )
+        
+        return self._build_result(recommendation, savings_capacity, frequency, include_visualization)
+    
+    def _build_result(self, recommendation, savings_capacity, frequency, include_visualization):
+        """Attach fund data, projections and the chart to a recommendation."""
         
         # Convert to appropriate monthly amount if needed
         monthly_amount = recommendation.monthly_sip_amount
-        if frequency.lower() == "daily":
-            monthly_amount = calculate_daily_to_monthly(savings_capacity)
-        elif frequency.lower() == "weekly":
-            monthly_amount = calculate_weekly_to_monthly(savings_capacity)
+        if frequency.lower() in ("daily", "weekly"):
+            monthly_amount = _to_monthly_amount(savings_capacity, frequency)
         
         # Get fund data for recommended funds
-        fund_data = []
-        for fund_symbol in recommendation.recommended_funds:
-            fund_data.append(get_fund_data(fund_symbol))
-        
-        # Calculate SIP returns
-        returns = calculate_sip_returns(
-            monthly_investment=monthly_amount,
-            years=recommendation.investment_timeframe_years,
-            expected_return_rate=recommendation.expected_return_rate
-        )
+        with stage("fund_lookup"):
+            fund_data = []
+            for fund_symbol in recommendation.recommended_funds:
+                fund_data.append(get_fund_data(fund_symbol))
+        
+        with stage("returns"):
+            # Calculate SIP returns
+            returns = calculate_sip_returns(
+                monthly_investment=monthly_amount,
+                years=recommendation.investment_timeframe_years,
+                expected_return_rate=recommendation.expected_return_rate
+            )
+            
+            # Value contributions at the frequency the user actually saves at
+            contribution_frequency, contribution_amount = _contribution_basis(savings_capacity, frequency, monthly_amount)
+            frequency_adjusted_returns = _rounded_returns(project_regular_contributions(
+                contribution_amount, contribution_frequency,
+                recommendation.investment_timeframe_years, recommendation.expected_return_rate
+            ))
         
         # Generate visualization
-        visualization = generate_sip_visualization(
-            monthly_investment=monthly_amount,
-            years=recommendation.investment_timeframe_years,
-            expected_return=recommendation.expected_return_rate
-        )
+        visualization = ""
+        if include_visualization:
+            with stage("visualization"):
+                visualization = generate_sip_visualization(
+                    monthly_investment=monthly_amount,
+                    years=recommendation.investment_timeframe_years,
+                    expected_return=recommendation.expected_return_rate
+                )
         
         # Convert Pydantic model to dictionary
         recommendation_dict = recommendation.dict()
@@ -133,59 +438,121 @@ class SIPAdvisorAgent:
             "adjusted_monthly_amount": round(monthly_amount, 2),
             "fund_data": fund_data,
             "projected_returns": returns,
+            "frequency_adjusted_returns": frequency_adjusted_returns,
             "visualization": visualization
         }
     
+    def process_batch(self, profiles, include_visualization=False):
+        """Process many user profiles at once, returning results in input order."""
+        # The LLM path has no shared structure to exploit, so answer one by one
+        if not self.use_fallback:
+            return [
+                self.process_user_input(**profile, include_visualization=include_visualization)
+                for profile in profiles
+            ]
+        
+        # Profiles with the same rule-based outcome share funds and assumptions
+        groups = {}
+        monthly_amounts = []
+        for index, profile in enumerate(profiles):
+            monthly_amount = _to_monthly_amount(profile["savings_capacity"], profile["frequency"])
+            risk_profile = _resolve_risk_profile(profile["age"], profile.get("risk_tolerance"))
+            group_key = (
+                risk_profile,
+                _investment_timeframe(profile["age"]),
+                goal_tags(profile["goals"]),
+                fund_ranker.feasibility_bucket(monthly_amount)
+            )
+            groups.setdefault(group_key, []).append(index)
+            monthly_amounts.append(monthly_amount)
+        
+        years = np.empty(len(profiles), dtype=int)
+        rates = np.empty(len(profiles), dtype=float)
+        group_details = {}
+        for group_key, indices in groups.items():
+            risk_profile, investment_timeframe = group_key[:2]
+            # Every profile in the group clears the same min-investment thresholds
+            first_profile = profiles[indices[0]]
+            recommended_funds = recommend_funds(risk_profile, first_profile["goals"], monthly_amounts[indices[0]])
+            fund_data = [get_fund_data(fund_symbol) for fund_symbol in recommended_funds]
+            years[indices] = investment_timeframe
+            rates[indices] = _expected_return_rate(risk_profile)
+            group_details[group_key] = (recommended_funds, fund_data)
+        
+        # Project every profile in one vectorized pass
+        projection = project_sip(np.asarray(monthly_amounts, dtype=float), years, rates)
+        
+        # Value each saving frequency at its true period, one pass per frequency
+        contribution_bases = [
+            _contribution_basis(profile["savings_capacity"], profile["frequency"], monthly_amount)
+            for profile, monthly_amount in zip(profiles, monthly_amounts)
+        ]
+        contribution_frequencies = np.array([basis[0] for basis in contribution_bases])
+        contribution_amounts = np.array([basis[1] for basis in contribution_bases], dtype=float)
+        frequency_projection = {
+            key: np.empty(len(profiles)) for key in ("invested_amount", "expected_returns", "maturity_value")
+        }
+        for contribution_frequency in PERIOD_DAYS:
+            mask = contribution_frequencies == contribution_frequency
+            if mask.any():
+                partial = project_regular_contributions(
+                    contribution_amounts[mask], contribution_frequency, years[mask], rates[mask]
+                )
+                for key, values in partial.items():
+                    frequency_projection[key][mask] = values
+        
+        results = [None] * len(profiles)
+        for group_key, indices in groups.items():
+            risk_profile, investment_timeframe = group_key[:2]
+            recommended_funds, fund_data = group_details[group_key]
+            for index in indices:
+                monthly_amount = monthly_amounts[index]
+                expected_return_rate = float(rates[index])
+                # Already-typed rule outputs, laid out as SIPRecommendation.dict() would be
+                recommendation = {
+                    "monthly_sip_amount": float(monthly_amount),
+                    "investment_timeframe_years": int(investment_timeframe),
+                    "risk_profile": risk_profile,
+                    "recommended_funds": list(recommended_funds),
+                    "expected_return_rate": expected_return_rate
+                }
+                
+                visualization = ""
+                if include_visualization:
+                    visualization = generate_sip_visualization(
+                        monthly_investment=monthly_amount,
+                        years=investment_timeframe,
+                        expected_return=expected_return_rate
+                    )
+                
+                results[index] = {
+                    "recommendation": recommendation,
+                    "adjusted_monthly_amount": round(monthly_amount, 2),
+                    "fund_data": list(fund_data),
+                    "projected_returns": _rounded_returns(projection, index),
+                    "frequency_adjusted_returns": _rounded_returns(frequency_projection, index),
+                    "visualization": visualization
+                }
+        
+        return results
+    
     def _generate_rule_based_recommendation(self, savings_capacity, frequency, currency, age, goals, risk_tolerance=None):
         """Generate a rule-based recommendation without using an LLM."""
         
         # Convert to monthly amount
-        if frequency.lower() == "daily":
-            monthly_amount = calculate_daily_to_monthly(savings_capacity)
-        elif frequency.lower() == "weekly":
-            monthly_amount = calculate_weekly_to_monthly(savings_capacity)
-        else:  # Monthly
-            monthly_amount = savings_capacity
+        monthly_amount = _to_monthly_amount(savings_capacity, frequency)
         
         # Determine risk profile based on age and risk_tolerance
-        if risk_tolerance:
-            risk_profile = risk_tolerance.lower()
-        else:
-            if age < 30:
-                risk_profile = "aggressive"
-            elif age < 50:
-                risk_profile = "moderate"
-            else:
-                risk_profile = "conservative"
-        
-        # Normalize risk profile to one of the three categories
-        if "conserv" in risk_profile:
-            risk_profile = "conservative"
-        elif "aggress" in risk_profile or "high" in risk_profile:
-            risk_profile = "aggressive"
-        else:
-            risk_profile = "moderate"
+        risk_profile = _resolve_risk_profile(age, risk_tolerance)
         
         # Determine investment timeframe based on age
-        if age < 30:
-            investment_timeframe = 30
-        elif age < 40:
-            investment_timeframe = 20
-        elif age < 50:
-            investment_timeframe = 15
-        else:
-            investment_timeframe = 10
+        investment_timeframe = _investment_timeframe(age)
         
         # Determine expected return rate based on risk profile
-        if risk_profile == "conservative":
-            expected_return_rate = 8.0
-        elif risk_profile == "moderate":
-            expected_return_rate = 12.0
-        else:  # aggressive
-            expected_return_rate = 15.0
+        expected_return_rate = _expected_return_rate(risk_profile)
         
-        # Get recommended funds based on risk profile
-        recommended_funds = recommend_funds(risk_profile, goals)
+        # Get recommended funds based on risk profile, goals and affordability
+        recommended_funds = recommend_funds(risk_profile, goals, monthly_amount)
         
         # Create a SIPRecommendation object
         recommendation = SIPRecommendation(
@@ -196,4 +563,29 @@ class SIPAdvisorAgent:
             expected_return_rate=expected_return_rate
         )
         
-        return recommendation
\ No newline at end of file
+        return recommendation
+
+# Run with: python -m sip_advisor_agent bulk profiles.jsonl results.jsonl
+if __name__ == "__main__":
+    import argparse
+    from sip_bulk import DEFAULT_CHUNK_SIZE, run_bulk
+    
+    parser = argparse.ArgumentParser(description="Micro-SIP advisor command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bulk = commands.add_parser("bulk", help="Advise every profile in an NDJSON file")
+    bulk.add_argument("input", help="NDJSON file with one profile per line")
+    bulk.add_argument("output", help="NDJSON file that receives one result per profile")
+    bulk.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Profiles per vectorized batch")
+    bulk.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (1 runs inline)")
+    bulk.add_argument("--checkpoint", help="Checkpoint path (default: <output>.checkpoint)")
+    bulk.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start from the beginning")
+    args = parser.parse_args()
+    
+    processed = run_bulk(
+        args.input, args.output,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        resume=not args.restart
+    )
+    print(f"Processed {processed} profiles into {args.output}")
@@ -0,0 +1,273 @@
+import itertools
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from fund_catalog import normalize_symbol
+from sip_simulation import RISK_LEVEL_VOLATILITY
+from sip_utils import fund_analytics, fund_ranker, get_catalog_version, project_sip
+
+# Supported values for the `allocation_method` request option
+ALLOCATION_METHODS = ("mean_variance", "risk_parity")
+
+# Mean-variance risk aversion per risk profile, for returns and volatility in percent
+RISK_AVERSION = {
+    "conservative": 0.2,
+    "moderate": 0.08,
+    "aggressive": 0.03
+}
+
+# Correlation assumed between funds of two asset classes
+ASSET_CLASS_CORRELATIONS = {
+    ("Equity", "Equity"): 0.85,
+    ("Equity", "Hybrid"): 0.8,
+    ("Equity", "Debt"): 0.1,
+    ("Equity", "Liquid"): 0.0,
+    ("Hybrid", "Hybrid"): 0.85,
+    ("Hybrid", "Debt"): 0.35,
+    ("Hybrid", "Liquid"): 0.05,
+    ("Debt", "Debt"): 0.7,
+    ("Debt", "Liquid"): 0.3,
+    ("Liquid", "Liquid"): 0.9
+}
+
+# Correlation for funds in the same category, and for unknown asset classes
+SAME_CATEGORY_CORRELATION = 0.95
+DEFAULT_CORRELATION = 0.3
+
+# Volatility (%) assumed for a fund with neither history nor a known risk label
+DEFAULT_VOLATILITY = 15.0
+
+# Largest candidate set solved exactly; active sets grow as 3^k
+MAX_CANDIDATES = 6
+
+def asset_class(category: str) -> str:
+    """Map a catalog category like "Debt - Liquid" to its asset class."""
+    if "Liquid" in category or "Money Market" in category or "Overnight" in category:
+        return "Liquid"
+    return category.split(" - ")[0].strip()
+
+def _class_correlation(first: str, second: str) -> float:
+    """Correlation assumed between two asset classes."""
+    return ASSET_CLASS_CORRELATIONS.get((first, second),
+                                        ASSET_CLASS_CORRELATIONS.get((second, first), DEFAULT_CORRELATION))
+
+def _nearest_psd(matrix: np.ndarray) -> np.ndarray:
+    """Clip negative eigenvalues so a modelled covariance matrix is positive definite."""
+    values, vectors = np.linalg.eigh(matrix)
+    return (vectors * np.maximum(values, 1e-6)) @ vectors.T
+
+class AllocationEngine:
+    """Splits a monthly SIP across candidate funds.
+
+    The catalog-wide covariance matrix, expected returns and minimum
+    investments are built once per catalog version; a request only slices
+    out its candidates and solves a tiny problem.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._state = None
+
+    def _refresh(self) -> Dict[str, Any]:
+        """Rebuild the covariance model when the catalog or its analytics change."""
+        version = get_catalog_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._state = self._build_state()
+                    self._version = version
+        return self._state
+
+    def _build_state(self) -> Dict[str, Any]:
+        """Model the covariance of every catalog fund from volatility and asset-class correlations."""
+        columns, expected_return = fund_ranker.expected_returns()
+        symbols = [str(symbol) for symbol in columns["symbol"]]
+
+        # Measured volatility where NAV history exists, else the risk label's typical volatility
+        volatility = np.array([RISK_LEVEL_VOLATILITY.get(level, DEFAULT_VOLATILITY) for level in columns["risk_level"]])
+        analytics = fund_analytics.current()
+        if analytics is not None:
+            measured = np.array([(analytics.get(symbol) or {}).get("volatility") or np.nan for symbol in symbols])
+            volatility = np.where(np.isnan(measured), volatility, measured)
+
+        categories = columns["category"]
+        classes = np.array([asset_class(str(category)) for category in categories])
+        unique_classes = sorted(set(classes))
+        class_correlation = np.array([[_class_correlation(a, b) for b in unique_classes] for a in unique_classes])
+        class_index = np.searchsorted(unique_classes, classes)
+        correlation = class_correlation[class_index[:, None], class_index[None, :]]
+        correlation = np.where(categories[:, None] == categories[None, :], SAME_CATEGORY_CORRELATION, correlation)
+        np.fill_diagonal(correlation, 1.0)
+
+        return {
+            "position": {symbol: index for index, symbol in enumerate(symbols)},
+            "expected_return": expected_return,
+            "volatility": volatility,
+            "covariance": _nearest_psd(correlation * np.outer(volatility, volatility)),
+            # An unknown minimum is not enforced, as for funds outside the catalog
+            "min_investment": np.nan_to_num(columns["min_investment"])
+        }
+
+    def allocate(self, symbols: Sequence[str], monthly_amount: float, years: int, risk_profile: str = "moderate",
+                 method: str = "mean_variance", expected_return_rates: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        """Return per-fund weights, monthly amounts and projections for a SIP.
+
+        Each fund that gets money must receive at least its catalog
+        `min_investment`. Funds not in the catalog get the default volatility
+        and no minimum. `expected_return_rates` overrides the catalog's
+        expected returns, e.g. with the LLM's figures.
+        """
+        if method not in ALLOCATION_METHODS:
+            raise ValueError(f"Unknown allocation method: {method}")
+        state = self._refresh()
+        # The same fund listed twice would make the covariance singular, so keep its first entry
+        first_index = {}
+        for index, symbol in enumerate(symbols):
+            first_index.setdefault(normalize_symbol(symbol), index)
+        symbols = list(first_index)[:MAX_CANDIDATES]
+        if not symbols:
+            raise ValueError("At least one fund is required")
+        if expected_return_rates is not None:
+            expected_return_rates = [expected_return_rates[first_index[symbol]] for symbol in symbols]
+
+        # Candidate slices of the catalog-wide model
+        rows = np.array([state["position"].get(symbol, -1) for symbol in symbols])
+        known = rows >= 0
+        safe_rows = np.where(known, rows, 0)
+        covariance = np.where(known[:, None] & known[None, :],
+                              state["covariance"][safe_rows[:, None], safe_rows[None, :]],
+                              DEFAULT_CORRELATION * DEFAULT_VOLATILITY ** 2)
+        np.fill_diagonal(covariance, np.where(known, np.diag(covariance), DEFAULT_VOLATILITY ** 2))
+        mean = np.where(known, state["expected_return"][safe_rows], 0.0)
+        if expected_return_rates is not None:
+            mean = np.asarray(expected_return_rates, dtype=float)[:len(symbols)]
+        minimum = np.where(known, state["min_investment"][safe_rows], 0.0)
+        lower = minimum / monthly_amount if monthly_amount > 0 else np.full(len(symbols), np.inf)
+
+        if method == "risk_parity":
+            weights = _risk_parity_with_minimums(covariance, lower)
+        else:
+            weights = _mean_variance_with_minimums(mean, covariance, lower,
+                                                   RISK_AVERSION.get(risk_profile.lower(), RISK_AVERSION["moderate"]))
+        feasible = weights is not None
+        if not feasible:
+            # The amount clears no fund's minimum; put it all in the cheapest fund
+            weights = np.zeros(len(symbols))
+            weights[int(np.argmin(minimum))] = 1.0
+
+        return self._describe(symbols, weights, mean, covariance, monthly_amount, years, method, feasible)
+
+    def _describe(self, symbols: List[str], weights: np.ndarray, mean: np.ndarray, covariance: np.ndarray,
+                  monthly_amount: float, years: int, method: str, feasible: bool) -> Dict[str, Any]:
+        """Turn weights into rounded amounts and aggregate the per-fund projections."""
+        amounts = np.round(weights * monthly_amount, 2)
+        # Keep the split summing to the exact monthly amount
+        amounts[int(np.argmax(amounts))] += round(monthly_amount - amounts.sum(), 2)
+        projection = project_sip(amounts, years, mean)
+
+        allocations = []
+        for index, symbol in enumerate(symbols):
+            allocations.append({
+                "symbol": symbol,
+                "weight": round(float(weights[index]), 4),
+                "monthly_amount": round(float(amounts[index]), 2),
+                "expected_return_rate": round(float(mean[index]), 2),
+                "projected_returns": {
+                    field: round(float(projection[field][index]), 2)
+                    for field in ("invested_amount", "expected_returns", "maturity_value")
+                }
+            })
+        return {
+            "method": method,
+            "feasible": feasible,
+            "expected_return_rate": round(float(weights @ mean), 2),
+            "volatility": round(float(np.sqrt(weights @ covariance @ weights)), 2),
+            "allocations": allocations,
+            "projected_returns": {
+                field: round(float(projection[field].sum()), 2)
+                for field in ("invested_amount", "expected_returns", "maturity_value")
+            }
+        }
+
+def _mean_variance_with_minimums(mean: np.ndarray, covariance: np.ndarray, lower: np.ndarray,
+                                 risk_aversion: float) -> Optional[np.ndarray]:
+    """Maximize mean'w - a/2 w'Cw over fully invested weights where each fund is 0 or >= its minimum.
+
+    Every way of marking funds excluded, pinned at their minimum, or free is
+    solved at once as a batch of KKT systems; the best feasible point is the
+    optimum. Returns None when no fund's minimum can be met.
+    """
+    k = len(mean)
+    # 0 = excluded, 1 = pinned at the minimum, 2 = free
+    states = np.array(list(itertools.product((0, 1, 2), repeat=k)))
+    states = states[(states == 2).any(axis=1)]
+    free = states == 2
+    fixed_value = np.where(states == 1, lower, 0.0)
+
+    # Free rows: a*C w + nu = mean; fixed rows: w_i = value; last row: sum(w) = 1
+    systems = np.zeros((len(states), k + 1, k + 1))
+    rhs = np.zeros((len(states), k + 1))
+    systems[:, :k, :k] = np.where(free[:, :, None], risk_aversion * covariance[None, :, :], np.eye(k)[None, :, :])
+    systems[:, :k, k] = free
+    systems[:, k, :k] = 1.0
+    rhs[:, :k] = np.where(free, mean, fixed_value)
+    rhs[:, k] = 1.0
+    # Singular states, e.g. perfectly correlated free funds, have no unique solution; skip them
+    regular = np.linalg.matrix_rank(systems) == k + 1
+    weights = np.full((len(states), k), np.nan)
+    weights[regular] = np.linalg.solve(systems[regular], rhs[regular, :, None])[..., 0][:, :k]
+
+    invested = states > 0
+    feasible = (np.where(invested, weights >= lower - 1e-9, True).all(axis=1)
+                & np.isfinite(weights).all(axis=1) & (np.abs(weights.sum(axis=1) - 1) < 1e-9))
+    if not feasible.any():
+        return None
+    objective = weights @ mean - 0.5 * risk_aversion * np.einsum("si,ij,sj->s", weights, covariance, weights)
+    best = np.flatnonzero(feasible)[np.argmax(objective[feasible])]
+    return np.clip(weights[best], 0.0, None)
+
+def _risk_parity_with_minimums(covariance: np.ndarray, lower: np.ndarray,
+                               iterations: int = 30) -> Optional[np.ndarray]:
+    """Equal-risk-contribution weights on the largest fund subset whose minimums all hold.
+
+    Risk parity is solved for every subset at once with batched Newton steps
+    on y'Cy/2 - sum(log y); ties in subset size go to the lowest volatility.
+    """
+    k = len(lower)
+    masks = np.array(list(itertools.product((False, True), repeat=k)))[1:]
+    eye = np.eye(k)
+    y = np.where(masks, 1.0 / np.sqrt(np.diag(covariance)), 0.0)
+    for _ in range(iterations):
+        gradient = np.where(masks, np.einsum("ij,sj->si", covariance, y) - 1.0 / np.where(masks, y, 1.0), 0.0)
+        hessian = np.where(masks[:, :, None] & masks[:, None, :], covariance[None, :, :], 0.0)
+        hessian = hessian + eye * np.where(masks, 1.0 / np.where(masks, y, 1.0) ** 2, 1.0)[:, :, None]
+        step = np.linalg.solve(hessian, gradient[..., None])[..., 0]
+        # Halve steps that would leave the positive orthant
+        scale = np.ones(len(masks))
+        for _ in range(20):
+            bad = (np.where(masks, y - scale[:, None] * step, 1.0) <= 0).any(axis=1)
+            if not bad.any():
+                break
+            scale = np.where(bad, scale / 2, scale)
+        y = y - scale[:, None] * step
+    weights = y / y.sum(axis=1, keepdims=True)
+
+    feasible = np.where(masks, weights >= lower - 1e-9, True).all(axis=1)
+    if not feasible.any():
+        return None
+    volatility = np.sqrt(np.einsum("si,ij,sj->s", weights, covariance, weights))
+    # Prefer more funds, then lower volatility
+    order = np.lexsort((volatility, -masks.sum(axis=1)))
+    best = order[feasible[order]][0]
+    return weights[best]
+
+# Shared engine; its covariance model is rebuilt per catalog version
+allocation_engine = AllocationEngine()
+
+def allocate_sip(symbols: Sequence[str], monthly_amount: float, years: int, risk_profile: str = "moderate",
+                 method: str = "mean_variance", expected_return_rates: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+    """Split a monthly SIP across funds and aggregate the per-fund projections."""
+    return allocation_engine.allocate(symbols, monthly_amount, years, risk_profile, method, expected_return_rates)
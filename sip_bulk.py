@@ -0,0 +1,173 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+from sip_json import json_default
+
+# Profiles handled per vectorized batch
+DEFAULT_CHUNK_SIZE = 1000
+
+# Fields read from each input profile, with defaults for optional ones
+PROFILE_FIELDS = ("savings_capacity", "frequency", "currency", "age", "goals", "risk_tolerance")
+PROFILE_DEFAULTS = {"currency": "INR", "risk_tolerance": None}
+
+# Fields that must be strings; the nullable ones may also be null
+TEXT_FIELDS = ("frequency", "currency", "goals")
+NULLABLE_TEXT_FIELDS = ("risk_tolerance",)
+
+_worker_agent = None
+
+def _get_agent():
+    """Return this process's rule-based advisor, creating it on first use."""
+    global _worker_agent
+    if _worker_agent is None:
+        from sip_advisor_agent import SIPAdvisorAgent
+        _worker_agent = SIPAdvisorAgent(use_fallback=True)
+    return _worker_agent
+
+def _parse_profile(line: str) -> dict:
+    """Parse one NDJSON profile, raising ValueError if it is unusable."""
+    raw = json.loads(line)
+    if not isinstance(raw, dict):
+        raise ValueError("profile must be a JSON object")
+    profile = {}
+    for field in PROFILE_FIELDS:
+        if field in raw:
+            profile[field] = raw[field]
+        elif field in PROFILE_DEFAULTS:
+            profile[field] = PROFILE_DEFAULTS[field]
+        else:
+            raise ValueError(f"missing field: {field}")
+    for field in TEXT_FIELDS + NULLABLE_TEXT_FIELDS:
+        value = profile[field]
+        if not isinstance(value, str) and not (value is None and field in NULLABLE_TEXT_FIELDS):
+            raise ValueError(f"{field} must be a string")
+    profile["savings_capacity"] = float(profile["savings_capacity"])
+    profile["age"] = int(profile["age"])
+    return profile
+
+def process_chunk(lines: List[str], agent=None) -> List[str]:
+    """Advise one chunk of NDJSON profiles and return NDJSON result lines in order.
+
+    Lines that fail to parse produce an error record so output stays aligned
+    with input. Without `agent`, the process's own rule-based advisor is used.
+    """
+    profiles = []
+    positions = []
+    output: List[Optional[str]] = [None] * len(lines)
+    for position, line in enumerate(lines):
+        try:
+            profiles.append(_parse_profile(line))
+            positions.append(position)
+        except (ValueError, TypeError) as e:
+            output[position] = json.dumps({"error": str(e)})
+
+    if profiles:
+        results = (agent or _get_agent()).process_batch(profiles, include_visualization=False)
+        for position, result in zip(positions, results):
+            output[position] = json.dumps(result, default=json_default)
+    return output
+
+def iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    """Group non-blank lines into lists of at most chunk_size."""
+    chunk = []
+    for line in lines:
+        if line.strip():
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def iter_bulk_results(lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      workers: int = 0) -> Iterator[List[str]]:
+    """Yield result lines chunk by chunk, in input order.
+
+    With `workers`, chunks run in a process pool; at most two chunks per
+    worker are in flight, so memory stays constant however long the input is.
+    """
+    chunks = iter_chunks(lines, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(process_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _read_checkpoint(path: str) -> Optional[dict]:
+    """Load a checkpoint file if one exists."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_checkpoint(path: str, checkpoint: dict) -> None:
+    """Atomically replace the checkpoint file."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+def run_bulk(input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 0,
+             checkpoint_path: Optional[str] = None, resume: bool = True) -> int:
+    """Stream profiles from an NDJSON file into an NDJSON results file.
+
+    After every chunk, the byte offsets reached in the input and output are
+    checkpointed. A resumed run seeks past finished input and truncates any
+    partial output, so a crash costs at most the chunks in flight. Returns the
+    number of profiles processed by this run.
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    checkpoint = _read_checkpoint(checkpoint_path) if resume else None
+    input_offset = checkpoint["input_offset"] if checkpoint else 0
+    output_offset = checkpoint["output_offset"] if checkpoint else 0
+    processed_total = checkpoint["processed"] if checkpoint else 0
+
+    processed = 0
+    with open(input_path, "rb") as source, open(output_path, "ab") as sink:
+        # Drop output written after the last checkpoint
+        sink.truncate(output_offset)
+        sink.seek(output_offset)
+        source.seek(input_offset)
+
+        # Track where each chunk ends in the input so checkpoints know where to resume
+        chunk_ends = deque()
+        def read_lines():
+            position = input_offset
+            buffered = 0
+            for raw in iter(source.readline, b""):
+                position += len(raw)
+                line = raw.decode("utf-8")
+                if line.strip():
+                    buffered += 1
+                    if buffered == chunk_size:
+                        chunk_ends.append(position)
+                        buffered = 0
+                yield line
+            if buffered:
+                chunk_ends.append(position)
+
+        for results in iter_bulk_results(read_lines(), chunk_size=chunk_size, workers=workers):
+            sink.write("".join(f"{line}\n" for line in results).encode("utf-8"))
+            sink.flush()
+            os.fsync(sink.fileno())
+            processed += len(results)
+            _write_checkpoint(checkpoint_path, {
+                "input_offset": chunk_ends.popleft(),
+                "output_offset": sink.tell(),
+                "processed": processed_total + processed
+            })
+
+    return processed
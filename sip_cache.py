@@ -0,0 +1,213 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from sip_json import json_default
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with an optional time-to-live per entry."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # Expired entries count as evictions
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskCache:
+    """Persistent string key/value cache backed by a local SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value for key, or None if absent."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """Store or replace the value for key."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+def _canonical_key(key: Any) -> Any:
+    """Turn a cache key into a JSON-ready value that is identical in every process."""
+    # Set iteration order depends on the per-process hash seed, so sort them
+    if isinstance(key, (set, frozenset)):
+        return sorted(_canonical_key(item) for item in key)
+    if isinstance(key, (tuple, list)):
+        return [_canonical_key(item) for item in key]
+    return key
+
+class SharedCache:
+    """Bounded TTL cache shared by every worker process through a local SQLite file.
+
+    Values must be JSON-serializable. The database runs in WAL mode so readers
+    in one worker never block writers in another, and each process opens its
+    own connection, including processes forked after the cache was created.
+    Entries are evicted oldest-first once the table outgrows `maxsize`.
+    """
+
+    # Sets between sweeps of expired and surplus rows
+    PRUNE_INTERVAL = 256
+
+    def __init__(self, path: str, namespace: str = "default", maxsize: int = 4096, ttl: Optional[float] = None):
+        self.path = path
+        self.table = f"cache_{namespace}"
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._sets = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection, opening it on first use."""
+        if self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_created ON {self.table} (created_at)")
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        encoded_key = json.dumps(_canonical_key(key))
+        with self._lock:
+            row = self._connection().execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (encoded_key,)
+            ).fetchone()
+            # Wall-clock time, since monotonic clocks are not comparable across processes
+            if row is not None and (row[1] is None or row[1] > time.time()):
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, sweeping expired and surplus entries every few writes."""
+        if self.maxsize <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        row = (json.dumps(_canonical_key(key)), json.dumps(value, default=json_default), now, expires_at)
+        with self._lock:
+            conn = self._connection()
+            try:
+                conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)", row)
+                self._sets += 1
+                if self._sets % self.PRUNE_INTERVAL == 0:
+                    self._prune(conn, now)
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                # A write that loses a lock race is only a missed cache fill
+                conn.rollback()
+                print(f"Shared cache write failed: {str(e)}")
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired entries, then the oldest ones beyond maxsize."""
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        surplus = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0] - self.maxsize
+        if surplus > 0:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY created_at LIMIT ?)", (surplus,)
+            )
+
+    def clear(self) -> None:
+        """Drop every cached entry for all workers, keeping this process's counters."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return this process's hit/miss counters and the shared table size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "shared": True
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
@@ -0,0 +1,176 @@
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+# Average calendar days per month, so monthly compounding extends to any date
+AVERAGE_MONTH_DAYS = 365.25 / 12
+
+# Days between contributions at each supported saving frequency
+PERIOD_DAYS = {
+    "daily": 1.0,
+    "weekly": 7.0,
+    "monthly": AVERAGE_MONTH_DAYS
+}
+
+# Annual rate bracket searched when Newton's method fails for XIRR
+XIRR_BRACKET = (-0.9999, 100.0)
+
+def project_regular_contributions(amount: ArrayLike, frequency: str, years: ArrayLike,
+                                  expected_return_rate: ArrayLike) -> Dict[str, np.ndarray]:
+    """Project a SIP funded at its true frequency instead of a monthly equivalent.
+
+    Each contribution compounds from its own date at the monthly rate used by
+    `calculate_sip_returns`, scaled to the contribution period. A regular
+    schedule is a geometric series, so this stays closed form and broadcasts
+    over arrays of profiles. For `monthly` it reproduces the SIP formula.
+    """
+    period_days = PERIOD_DAYS[frequency.lower()]
+    amount, years, rate = np.broadcast_arrays(
+        np.asarray(amount, dtype=float),
+        np.asarray(years, dtype=float),
+        np.asarray(expected_return_rate, dtype=float)
+    )
+    contributions = np.rint(years * 365.25 / period_days)
+    monthly_rate = rate / 12 / 100
+
+    # Growth over one contribution period
+    period_growth = np.power(1 + monthly_rate, period_days / AVERAGE_MONTH_DAYS)
+    period_rate = period_growth - 1
+    zero_rate = period_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, period_rate)
+
+    maturity_value = amount * ((np.power(period_growth, contributions) - 1) / safe_rate) * period_growth
+    maturity_value = np.where(zero_rate, amount * contributions, maturity_value)
+    invested_amount = amount * contributions
+    return {
+        "invested_amount": invested_amount,
+        "expected_returns": maturity_value - invested_amount,
+        "maturity_value": maturity_value
+    }
+
+def build_contribution_schedule(amount: float, frequency: str, start_date: str, years: int,
+                                step_up_rate: float = 0.0,
+                                skipped_months: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Build dated contributions as (datetime64[D] dates, amounts) arrays.
+
+    `step_up_rate` raises the amount by that percentage on every anniversary
+    of `start_date`. `skipped_months` lists "YYYY-MM" months with no
+    contributions.
+    """
+    start = np.datetime64(start_date, "D")
+    end = (start.astype("datetime64[M]") + int(years) * 12).astype("datetime64[D]") + (start - start.astype("datetime64[M]").astype("datetime64[D]"))
+
+    frequency = frequency.lower()
+    if frequency == "monthly":
+        # Same day each month, clamped to shorter months
+        months = start.astype("datetime64[M]") + np.arange(int(years) * 12)
+        month_lengths = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+        day_offset = np.minimum((start - start.astype("datetime64[M]").astype("datetime64[D]")).astype(int), month_lengths - 1)
+        dates = months.astype("datetime64[D]") + day_offset
+    else:
+        step = int(PERIOD_DAYS[frequency])
+        dates = np.arange(start, end, np.timedelta64(step, "D"))
+
+    # Whole years elapsed since the start drive the step-up
+    months_elapsed = (dates.astype("datetime64[M]") - start.astype("datetime64[M]")).astype(int)
+    day_of_month = (dates - dates.astype("datetime64[M]").astype("datetime64[D]")).astype(int)
+    start_day = (start - start.astype("datetime64[M]").astype("datetime64[D]")).astype(int)
+    months_elapsed -= (day_of_month < start_day).astype(int)
+    amounts = amount * np.power(1 + step_up_rate / 100, months_elapsed // 12)
+
+    if skipped_months:
+        skipped = np.array(list(skipped_months), dtype="datetime64[M]")
+        keep = ~np.isin(dates.astype("datetime64[M]"), skipped)
+        dates, amounts = dates[keep], amounts[keep]
+
+    return dates, amounts
+
+def schedule_value(dates: np.ndarray, amounts: np.ndarray, expected_return_rate: float,
+                   valuation_date: Optional[str] = None) -> Dict[str, float]:
+    """Value dated contributions at `valuation_date` with vectorized compounding.
+
+    Contributions grow at the monthly rate of `calculate_sip_returns`
+    extended to fractional months. The valuation date defaults to one
+    contribution period after the last contribution.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    amounts = np.asarray(amounts, dtype=float)
+    if valuation_date is None:
+        gap = np.diff(dates).astype(int)
+        period = int(np.median(gap)) if gap.size else 1
+        valuation = dates.max() + np.timedelta64(period, "D")
+    else:
+        valuation = np.datetime64(valuation_date, "D")
+
+    months_held = (valuation - dates).astype(float) / AVERAGE_MONTH_DAYS
+    value = float(np.sum(amounts * np.power(1 + expected_return_rate / 12 / 100, months_held)))
+    invested = float(amounts.sum())
+    return {
+        "invested_amount": round(invested, 2),
+        "expected_returns": round(value - invested, 2),
+        "maturity_value": round(value, 2)
+    }
+
+def xirr(dates: np.ndarray, cashflows: np.ndarray, guess: float = 0.1,
+         tolerance: float = 1e-10, max_iterations: int = 50) -> np.ndarray:
+    """Annualized internal rate of return for dated cashflows.
+
+    Accepts one schedule (1-D arrays) or many (2-D arrays, one schedule per
+    row, padded with zero cashflows on the row's last date). Investments are
+    negative and redemptions positive. All rows iterate Newton's method
+    together; rows where it fails fall back to bisection on XIRR_BRACKET, so
+    results are capped at its bounds. Rows without a sign change return NaN.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    cashflows = np.asarray(cashflows, dtype=float)
+    single = cashflows.ndim == 1
+    if single:
+        dates, cashflows = dates[None, :], cashflows[None, :]
+
+    # Year fractions from each row's first cashflow
+    years = (dates - dates.min(axis=1, keepdims=True)).astype(float) / 365.0
+
+    def npv(rate):
+        return np.sum(cashflows * np.power(1 + rate[:, None], -years), axis=1)
+
+    def npv_slope(rate):
+        return np.sum(-years * cashflows * np.power(1 + rate[:, None], -years - 1), axis=1)
+
+    valid = (cashflows > 0).any(axis=1) & (cashflows < 0).any(axis=1)
+    rate = np.full(cashflows.shape[0], guess)
+    converged = ~valid
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(max_iterations):
+            value = npv(rate)
+            step = value / npv_slope(rate)
+            updated = np.where(converged, rate, rate - step)
+            # Keep rates above -100% so the discount factors stay defined
+            updated = np.where(updated <= -1, (rate - 1) / 2, updated)
+            converged |= np.abs(updated - rate) < tolerance
+            rate = updated
+            if converged.all():
+                break
+
+        # Bisection for rows Newton could not settle
+        failed = valid & (~converged | ~np.isfinite(rate))
+        if failed.any():
+            rows = np.flatnonzero(failed)
+            low = np.full(rows.size, XIRR_BRACKET[0])
+            high = np.full(rows.size, XIRR_BRACKET[1])
+            sub_years, sub_flows = years[rows], cashflows[rows]
+            low_value = np.sum(sub_flows * np.power(1 + low[:, None], -sub_years), axis=1)
+            for _ in range(200):
+                mid = (low + high) / 2
+                mid_value = np.sum(sub_flows * np.power(1 + mid[:, None], -sub_years), axis=1)
+                same_side = np.sign(mid_value) == np.sign(low_value)
+                low = np.where(same_side, mid, low)
+                low_value = np.where(same_side, mid_value, low_value)
+                high = np.where(same_side, high, mid)
+                if np.all(high - low < tolerance):
+                    break
+            rate[rows] = (low + high) / 2
+
+    rate = np.where(valid, rate, np.nan)
+    return rate[0] if single else rate
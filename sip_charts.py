@@ -0,0 +1,134 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from sip_utils import CHART_CACHE_SIZE, project_sip
+
+# Supported values for the `visualization_format` request option
+VISUALIZATION_FORMATS = ("png", "svg", "series")
+
+# Points kept per curve when downsampling for SVG and series output
+DEFAULT_SERIES_POINTS = 120
+
+SVG_TEMPLATE = """<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="12">
+<rect width="{width}" height="{height}" fill="white"/>
+<text x="{title_x}" y="20" text-anchor="middle" font-size="14">SIP Growth Projection</text>
+{grid}
+<polygon points="{band}" fill="lightgreen" fill-opacity="0.5"/>
+<polyline points="{invested}" fill="none" stroke="blue" stroke-width="1.5"/>
+<polyline points="{value}" fill="none" stroke="green" stroke-width="1.5"/>
+<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" stroke="black"/>
+<line x1="{left}" y1="{top}" x2="{left}" y2="{bottom}" stroke="black"/>
+{ticks}
+<text x="{title_x}" y="{xlabel_y}" text-anchor="middle">Years</text>
+<text x="14" y="{ylabel_y}" text-anchor="middle" transform="rotate(-90 14 {ylabel_y})">Amount</text>
+<rect x="{legend_x}" y="{legend_y}" width="130" height="40" fill="white" stroke="#ccc"/>
+<line x1="{legend_line_x1}" y1="{legend_row1}" x2="{legend_line_x2}" y2="{legend_row1}" stroke="blue" stroke-width="1.5"/>
+<text x="{legend_text_x}" y="{legend_text_row1}">Invested Amount</text>
+<line x1="{legend_line_x1}" y1="{legend_row2}" x2="{legend_line_x2}" y2="{legend_row2}" stroke="green" stroke-width="1.5"/>
+<text x="{legend_text_x}" y="{legend_text_row2}">SIP Value</text>
+</svg>"""
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Pick `threshold` indices that preserve the curve's shape (Largest-Triangle-Three-Buckets)."""
+    n = len(x)
+    # Empty and short curves are returned whole
+    if n == 0 or threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into equal buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        # Average of the next bucket stands in for the third triangle corner
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        candidates_x = x[start:end]
+        candidates_y = y[start:end]
+        areas = np.abs(
+            (x[previous] - next_x) * (candidates_y - y[previous])
+            - (x[previous] - candidates_x) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _downsampled_series(monthly_investment: float, years: int, expected_return: float,
+                        points: int) -> Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[float, ...]]:
+    """Return downsampled (years, invested, value) curves for a projection."""
+    projection = project_sip(monthly_investment, years, expected_return, include_series=True)
+    x = np.arange(years * 12) / 12
+    values = projection["value_series"]
+    keep = lttb_indices(x, values, points)
+    return (
+        tuple(np.round(x[keep], 4).tolist()),
+        tuple(np.round(projection["invested_series"][keep], 2).tolist()),
+        tuple(np.round(values[keep], 2).tolist())
+    )
+
+def generate_sip_series(monthly_investment: float, years: int, expected_return: float,
+                        points: int = DEFAULT_SERIES_POINTS) -> Dict[str, List[float]]:
+    """Return downsampled growth curves for client-side plotting."""
+    x, invested, value = _downsampled_series(round(float(monthly_investment), 2), int(years),
+                                             float(expected_return), int(points))
+    return {"years": list(x), "invested_amount": list(invested), "sip_value": list(value)}
+
+def _points(x: np.ndarray, y: np.ndarray) -> str:
+    """Format coordinates for an SVG points attribute."""
+    return " ".join(f"{px:.1f},{py:.1f}" for px, py in zip(x, y))
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_sip_svg(monthly_investment: float, years: int, expected_return: float, size: Tuple[int, int]) -> str:
+    """Render the SIP growth chart as SVG markup."""
+    width, height = size
+    x, invested, value = (np.array(series) for series in
+                          _downsampled_series(monthly_investment, years, expected_return, DEFAULT_SERIES_POINTS))
+    left, right, top, bottom = 80, width - 20, 35, height - 45
+
+    # Map data coordinates onto the plot area
+    x_max = max(years, 1)
+    # An empty projection still gets a valid, blank plot area
+    y_max = float(max(value.max(initial=0.0), invested.max(initial=0.0), 1.0))
+    def to_px(xs, ys):
+        return left + xs / x_max * (right - left), bottom - ys / y_max * (bottom - top)
+
+    invested_px = to_px(x, invested)
+    value_px = to_px(x, value)
+    band = _points(np.concatenate([value_px[0], invested_px[0][::-1]]),
+                   np.concatenate([value_px[1], invested_px[1][::-1]]))
+
+    grid_lines = []
+    tick_labels = []
+    for tick in np.linspace(0, y_max, 5):
+        py = bottom - tick / y_max * (bottom - top)
+        grid_lines.append(f'<line x1="{left}" y1="{py:.1f}" x2="{right}" y2="{py:.1f}" stroke="#ddd" stroke-dasharray="4 3"/>')
+        tick_labels.append(f'<text x="{left - 6}" y="{py + 4:.1f}" text-anchor="end">{tick:,.0f}</text>')
+    for tick in np.linspace(0, x_max, min(int(x_max), 10) + 1):
+        px = left + tick / x_max * (right - left)
+        grid_lines.append(f'<line x1="{px:.1f}" y1="{top}" x2="{px:.1f}" y2="{bottom}" stroke="#ddd" stroke-dasharray="4 3"/>')
+        tick_labels.append(f'<text x="{px:.1f}" y="{bottom + 16}" text-anchor="middle">{tick:g}</text>')
+
+    legend_x, legend_y = left + 10, top + 10
+    return SVG_TEMPLATE.format(
+        width=width, height=height, left=left, right=right, top=top, bottom=bottom,
+        title_x=(left + right) / 2, xlabel_y=height - 10, ylabel_y=(top + bottom) / 2,
+        grid="\n".join(grid_lines), ticks="\n".join(tick_labels),
+        band=band, invested=_points(*invested_px), value=_points(*value_px),
+        legend_x=legend_x, legend_y=legend_y,
+        legend_line_x1=legend_x + 8, legend_line_x2=legend_x + 28,
+        legend_text_x=legend_x + 34,
+        legend_row1=legend_y + 13, legend_text_row1=legend_y + 17,
+        legend_row2=legend_y + 29, legend_text_row2=legend_y + 33
+    )
+
+def generate_sip_svg(monthly_investment: float, years: int, expected_return: float,
+                     size: Tuple[int, int] = (1000, 600)) -> str:
+    """Generate an SVG chart of SIP growth without matplotlib."""
+    return _render_sip_svg(round(float(monthly_investment), 2), int(years), float(expected_return),
+                           (int(size[0]), int(size[1])))
@@ -0,0 +1,129 @@
+from typing import Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+# Annual return bracket (%) searched when solving for the required rate
+MIN_RETURN_RATE = -50.0
+MAX_RETURN_RATE = 200.0
+
+def sip_growth_factor(years: ArrayLike, expected_return_rate: ArrayLike, step_up_rate: ArrayLike = 0.0) -> np.ndarray:
+    """Maturity value of a SIP that starts at 1 per month.
+
+    Uses the same start-of-month SIP formula as `calculate_sip_returns`. With
+    `step_up_rate`, the monthly instalment rises by that percentage every
+    year, which stays a closed-form geometric series across years.
+    """
+    years, rate, step_up = np.broadcast_arrays(
+        np.asarray(years, dtype=float),
+        np.asarray(expected_return_rate, dtype=float),
+        np.asarray(step_up_rate, dtype=float)
+    )
+    monthly_rate = rate / 12 / 100
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+
+    # Value after one year of unit instalments, then compounded year by year
+    one_year = np.where(zero_rate, 12.0, ((np.power(1 + monthly_rate, 12) - 1) / safe_rate) * (1 + monthly_rate))
+    year_growth = np.power(1 + monthly_rate, 12)
+
+    # Sum over years y of (1 + s)^y * year_growth^(Y - 1 - y)
+    ratio = (1 + step_up / 100) / year_growth
+    # (r^Y - 1) / (r - 1) through expm1 keeps full precision for r close to 1; only r == 1 is linear
+    flat_ratio = ratio == 1
+    log_ratio = np.log(np.where(flat_ratio, 2.0, ratio))
+    series = np.where(flat_ratio, years, np.expm1(years * log_ratio) / np.expm1(log_ratio))
+    stepped = one_year * np.power(year_growth, years - 1) * series
+
+    # Without a step-up the monthly formula also covers fractional years
+    months = years * 12
+    level = np.where(zero_rate, months, ((np.power(1 + monthly_rate, months) - 1) / safe_rate) * (1 + monthly_rate))
+    return np.where(step_up == 0, level, stepped)
+
+def required_monthly_sip(target_amount: ArrayLike, years: ArrayLike, expected_return_rate: ArrayLike,
+                         step_up_rate: ArrayLike = 0.0, inflation_rate: ArrayLike = 0.0) -> np.ndarray:
+    """Monthly SIP needed to reach a target corpus, solved in closed form.
+
+    Maturity is linear in the starting instalment even with a step-up, so the
+    inverse is a single division. A non-zero `inflation_rate` treats the
+    target as today's money and grows it to the end of the horizon first.
+    """
+    target = np.asarray(target_amount, dtype=float)
+    future_target = target * np.power(1 + np.asarray(inflation_rate, dtype=float) / 100, years)
+    return future_target / sip_growth_factor(years, expected_return_rate, step_up_rate)
+
+def required_years(target_amount: ArrayLike, monthly_investment: ArrayLike, expected_return_rate: ArrayLike) -> np.ndarray:
+    """Years of a level SIP needed to reach a target corpus, in closed form."""
+    target, amount, rate = np.broadcast_arrays(
+        np.asarray(target_amount, dtype=float),
+        np.asarray(monthly_investment, dtype=float),
+        np.asarray(expected_return_rate, dtype=float)
+    )
+    monthly_rate = rate / 12 / 100
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+
+    # Invert V = P * ((1 + r)^n - 1) / r * (1 + r) for n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = np.log1p(target * safe_rate / (amount * (1 + safe_rate))) / np.log1p(safe_rate)
+        months = np.where(zero_rate, target / amount, months)
+    return months / 12
+
+def required_return_rate(target_amount: ArrayLike, monthly_investment: ArrayLike, years: ArrayLike,
+                         step_up_rate: ArrayLike = 0.0, tolerance: float = 1e-9, max_iterations: int = 60) -> np.ndarray:
+    """Annual return (%) needed to reach a target corpus.
+
+    No closed form exists, so this runs a vectorized Newton iteration kept
+    inside a shrinking bisection bracket. Targets that can't be reached
+    inside [MIN_RETURN_RATE, MAX_RETURN_RATE] come back as NaN.
+    """
+    target, amount, years, step_up = np.broadcast_arrays(
+        np.asarray(target_amount, dtype=float),
+        np.asarray(monthly_investment, dtype=float),
+        np.asarray(years, dtype=float),
+        np.asarray(step_up_rate, dtype=float)
+    )
+    shape = target.shape
+    target, amount, years, step_up = (array.ravel() for array in (target, amount, years, step_up))
+
+    def shortfall(rate, index):
+        return amount[index] * sip_growth_factor(years[index], rate, step_up[index]) - target[index]
+
+    everything = np.arange(target.size)
+    reachable = ((shortfall(np.full(target.shape, MIN_RETURN_RATE), everything) <= 0)
+                 & (shortfall(np.full(target.shape, MAX_RETURN_RATE), everything) >= 0))
+    result = np.full(target.shape, np.nan)
+
+    # Only unconverged goals are iterated, so the work shrinks every round
+    active = everything[reachable]
+    low = np.full(active.shape, MIN_RETURN_RATE)
+    high = np.full(active.shape, MAX_RETURN_RATE)
+    # Start from the middle of a typical equity range
+    rate = np.full(active.shape, 10.0)
+    step = 1e-6
+    for _ in range(max_iterations):
+        value = shortfall(rate, active)
+        converged = np.abs(value) <= tolerance * np.maximum(np.abs(target[active]), 1.0)
+        result[active[converged]] = rate[converged]
+        keep = ~converged
+        if not keep.any():
+            break
+        active, rate, value, low, high = active[keep], rate[keep], value[keep], low[keep], high[keep]
+
+        # Maturity rises with the rate, so the sign of the shortfall moves the bracket
+        low = np.where(value < 0, rate, low)
+        high = np.where(value > 0, rate, high)
+
+        slope = (shortfall(rate + step, active) - value) / step
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = rate - value / slope
+
+        # Fall back to bisection when Newton leaves the bracket
+        inside = (newton > low) & (newton < high) & np.isfinite(newton)
+        rate = np.where(inside, newton, (low + high) / 2)
+    else:
+        # Whatever is left after the iteration budget gets its best estimate
+        result[active] = rate
+
+    return result.reshape(shape)
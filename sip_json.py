@@ -0,0 +1,42 @@
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+
+from fund_catalog import FundRecord
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def json_default(obj: Any) -> Any:
+    """Convert the non-JSON types advisor results carry into plain values."""
+    if isinstance(obj, FundRecord):
+        return dict(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=json_default, separators=(",", ":")).encode("utf-8")
+
+def _dumps_funds(funds: List[Any]) -> bytes:
+    """Serialize a fund list, reusing each catalog record's cached encoding."""
+    return b"[" + b",".join(
+        fund.json if isinstance(fund, FundRecord) else dumps(fund) for fund in funds
+    ) + b"]"
+
+def dumps_result(result: Dict[str, Any]) -> bytes:
+    """Serialize an advisor result, splicing pre-serialized fund records into it."""
+    funds = result.get("fund_data")
+    if not funds:
+        return dumps(result)
+    rest = dumps({key: value for key, value in result.items() if key != "fund_data"})
+    separator = b"," if rest != b"{}" else b""
+    return rest[:-1] + separator + b'"fund_data":' + _dumps_funds(funds) + b"}"
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Type
+
+import httpx
+from pydantic import BaseModel
+
+# Ollama server and model used by the structured LLM path
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("SIP_LLM_MODEL", "llama2")
+
+# How long Ollama keeps the model, and the prompt prefix it has evaluated, loaded between calls
+KEEP_ALIVE = os.getenv("SIP_LLM_KEEP_ALIVE", "30m")
+
+# "schema" constrains decoding to the recommendation schema; "json" only to valid JSON (Ollama < 0.5)
+OUTPUT_FORMAT = os.getenv("SIP_LLM_FORMAT", "schema")
+
+# Risk profiles the model may answer with
+RISK_PROFILES = ["conservative", "moderate", "aggressive"]
+
+# Instructions shared by every request; user fields follow so the prefix is reused verbatim
+PREFIX_TEMPLATE = """You are a financial advisor specializing in Systematic Investment Plans (SIPs).
+
+Recommend an appropriate SIP strategy for the user described at the end. Reply with a single JSON object with these fields:
+- monthly_sip_amount: a suitable monthly SIP amount in the user's currency, based on their savings capacity
+- investment_timeframe_years: an appropriate investment timeframe in whole years
+- risk_profile: one of {risk_profiles}
+- recommended_funds: recommended mutual funds or ETFs, using only these fund symbols: {fund_symbols}
+- expected_return_rate: the expected annual return rate as a percentage
+
+"""
+
+SUFFIX_TEMPLATE = """User:
+- Savings capacity: {savings_capacity} {frequency} in {currency}
+- Age: {age}
+- Investment goals: {goals}
+- Risk tolerance (if specified): {risk_tolerance}
+"""
+
+def recommendation_schema(model: Type[BaseModel], fund_symbols: Sequence[str]) -> Dict[str, Any]:
+    """JSON schema of `model` with fund symbols and risk profiles limited to known values."""
+    schema = model.schema()
+    properties = schema["properties"]
+    properties["risk_profile"]["enum"] = list(RISK_PROFILES)
+    properties["recommended_funds"]["items"] = {"type": "string", "enum": list(fund_symbols)}
+    properties["recommended_funds"]["minItems"] = 1
+    return schema
+
+class StructuredPrompt:
+    """Prompt split into a static prefix, built from the fund list, and a per-user suffix."""
+
+    def __init__(self, fund_symbols: Callable[[], Sequence[str]]):
+        self.fund_symbols = fund_symbols
+
+    def prefix(self) -> str:
+        """Render the shared instructions for the current fund list."""
+        return PREFIX_TEMPLATE.format(
+            risk_profiles=", ".join(RISK_PROFILES), fund_symbols=", ".join(self.fund_symbols())
+        )
+
+    def suffix(self, **inputs) -> str:
+        """Render the user fields that follow the prefix."""
+        return SUFFIX_TEMPLATE.format(**inputs)
+
+    def format(self, **inputs) -> str:
+        """Render the full prompt."""
+        return self.prefix() + self.suffix(**inputs)
+
+class StructuredOllama:
+    """Ollama client returning schema-constrained recommendations.
+
+    Each call sends only the user fields as new prompt text. The static prefix
+    is evaluated once and its token context is passed back with every request,
+    and `keep_alive` keeps the model and that context loaded between calls.
+    Servers that don't return a context get the full prompt, which Ollama's own
+    prefix cache still matches because the prefix never varies. `invoke` and
+    `ainvoke` mirror a LangChain runnable so the agent can use either.
+    """
+
+    def __init__(self, model: Type[BaseModel], prompt: StructuredPrompt, host: str = OLLAMA_HOST,
+                 model_name: str = OLLAMA_MODEL, keep_alive: str = KEEP_ALIVE,
+                 output_format: str = OUTPUT_FORMAT, timeout: Optional[float] = None):
+        self.model = model
+        self.prompt = prompt
+        self.url = host.rstrip("/") + "/api/generate"
+        self.model_name = model_name
+        self.keep_alive = keep_alive
+        self.output_format = output_format
+        self.timeout = timeout
+        # (prefix, schema, context) of the current fund list, replaced as one tuple
+        self._prefix_state = (None, None, None)
+        self._lock = threading.Lock()
+        self._client = httpx.Client(timeout=timeout)
+        self._async_client = None
+
+    def _current_prefix(self) -> Optional[str]:
+        """Return the prefix the cached schema and context belong to."""
+        return self._prefix_state[0]
+
+    def _refresh_prefix(self) -> None:
+        """Evaluate the prefix once per fund list and keep its context."""
+        prefix = self.prompt.prefix()
+        if prefix == self._current_prefix():
+            return
+        with self._lock:
+            if prefix == self._current_prefix():
+                return
+            symbols = self.prompt.fund_symbols()
+            schema = recommendation_schema(self.model, symbols) if self.output_format == "schema" else "json"
+            context = None
+            try:
+                # Ollama only returns a context after generating, so ask for one token
+                response = self._client.post(self.url, json={
+                    "model": self.model_name,
+                    "prompt": prefix,
+                    "stream": False,
+                    "keep_alive": self.keep_alive,
+                    "options": {"num_predict": 1}
+                })
+                response.raise_for_status()
+                body = response.json()
+                context = body.get("context")
+                # The context ends with the generated tokens; keep only the prefix's own
+                generated = body.get("eval_count") or 0
+                if context and generated:
+                    context = context[:-generated]
+            except Exception as e:
+                print(f"Failed to cache the LLM prompt prefix: {str(e)}. Sending full prompts.")
+            self._prefix_state = (prefix, schema, context or None)
+
+    def _request(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the generate request for one user."""
+        # One read, so a concurrent refresh can't pair a new schema with an old context
+        prefix, schema, context = self._prefix_state
+        request = {
+            "model": self.model_name,
+            "format": schema,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": 0}
+        }
+        if context:
+            request["prompt"] = self.prompt.suffix(**inputs)
+            request["context"] = context
+        else:
+            request["prompt"] = prefix + self.prompt.suffix(**inputs)
+        return request
+
+    def _parse(self, response: httpx.Response) -> BaseModel:
+        response.raise_for_status()
+        return self.model.parse_raw(response.json()["response"])
+
+    def invoke(self, inputs: Dict[str, Any]) -> BaseModel:
+        """Generate a recommendation for the prompt variables `inputs`."""
+        self._refresh_prefix()
+        return self._parse(self._client.post(self.url, json=self._request(inputs)))
+
+    async def ainvoke(self, inputs: Dict[str, Any]) -> BaseModel:
+        """Generate a recommendation without blocking the event loop."""
+        if self.prompt.prefix() != self._current_prefix():
+            await asyncio.to_thread(self._refresh_prefix)
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+        return self._parse(await self._async_client.post(self.url, json=self._request(inputs)))
@@ -0,0 +1,222 @@
+import os
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+# Stage timing and counters; when disabled every hook is a no-op
+METRICS_ENABLED = os.getenv("SIP_METRICS_ENABLED", "1") == "1"
+
+# Attach a Server-Timing header with per-stage durations to every response
+SERVER_TIMING_ENABLED = METRICS_ENABLED and os.getenv("SIP_SERVER_TIMING", "0") == "1"
+
+# Histogram bucket upper bounds in seconds, from cached lookups up to LLM calls
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Counter:
+    """Prometheus counter with a single label."""
+
+    def __init__(self, name: str, help_text: str, label: str):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount: float = 1) -> None:
+        """Add `amount` to the series for `label_value`."""
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def values(self) -> Dict[str, float]:
+        """Return a copy of every series."""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        """Render the counter in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_value, value in sorted(self.values().items()):
+            lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value:g}')
+        return lines
+
+class Gauge:
+    """Prometheus gauge with a single label."""
+
+    def __init__(self, name: str, help_text: str, label: str):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, label_value: str, value: float) -> None:
+        """Set the series for `label_value`."""
+        with self._lock:
+            self._values[label_value] = value
+
+    def values(self) -> Dict[str, float]:
+        """Return a copy of every series."""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        """Render the gauge in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for label_value, value in sorted(self.values().items()):
+            lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value:g}')
+        return lines
+
+class Histogram:
+    """Prometheus histogram with a single label and fixed buckets."""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        # Per label value: [non-cumulative bucket counts..., +Inf count], sum
+        self._series: Dict[str, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def snapshot(self) -> Dict[str, Tuple[List[int], float]]:
+        """Return (non-cumulative bucket counts, sum) for every series."""
+        with self._lock:
+            return {label_value: (list(counts), total[0]) for label_value, (counts, total) in self._series.items()}
+
+    def render(self) -> List[str]:
+        """Render the histogram in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_value, (counts, total) in sorted(self.snapshot().items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.9g}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+STAGE_SECONDS = Histogram("sip_stage_duration_seconds", "Time spent in each advisor stage.", "stage")
+REQUEST_SECONDS = Histogram("sip_request_duration_seconds", "HTTP request latency by route.", "route")
+EVENTS = Counter("sip_advisor_events_total", "Cache hits and misses, LLM fallbacks and timeouts.", "event")
+QUEUE_DEPTH = Gauge("sip_admission_queue_depth", "Requests running or waiting in each admission stage.", "stage")
+SHED = Counter("sip_admission_shed_total", "Requests rejected or degraded by admission control.", "reason")
+
+# Stage durations of the current request, only set when Server-Timing is enabled
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("sip_request_timings", default=None)
+
+def record_stage(name: str, seconds: float) -> None:
+    """Record a stage duration in the histogram and the current request's timings."""
+    STAGE_SECONDS.observe(name, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+class _StageTimer:
+    """Context manager that records the duration of its block."""
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_stage(self.name, perf_counter() - self.started)
+        return False
+
+class _NullTimer:
+    """Shared do-nothing stand-in for _StageTimer when metrics are disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def stage(name: str):
+    """Time a `with` block as the named stage."""
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _StageTimer(name)
+
+def count(event: str, amount: float = 1) -> None:
+    """Increment the counter for a named event."""
+    if METRICS_ENABLED:
+        EVENTS.inc(event, amount)
+
+def set_queue_depth(stage_name: str, depth: int) -> None:
+    """Publish the current depth of an admission stage."""
+    if METRICS_ENABLED:
+        QUEUE_DEPTH.set(stage_name, depth)
+
+def count_shed(reason: str) -> None:
+    """Count a request rejected or degraded by admission control."""
+    if METRICS_ENABLED:
+        SHED.inc(reason)
+
+def render_metrics() -> str:
+    """Render every metric in Prometheus text exposition format."""
+    lines = (STAGE_SECONDS.render() + REQUEST_SECONDS.render() + EVENTS.render()
+             + QUEUE_DEPTH.render() + SHED.render())
+    return "\n".join(lines) + "\n"
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    """Format stage durations (seconds) as a Server-Timing header value in milliseconds."""
+    entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(entries)
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route and, optionally, Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        timings = None
+        token = None
+        if SERVER_TIMING_ENABLED:
+            timings = {}
+            token = _request_timings.set(timings)
+
+        async def send_with_timing(message):
+            # Stages that finished before the response started are reported
+            if message["type"] == "http.response.start":
+                header = server_timing_header(timings, perf_counter() - started).encode("latin-1")
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"server-timing", header)])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing if SERVER_TIMING_ENABLED else send)
+        finally:
+            if token is not None:
+                _request_timings.reset(token)
+            # Label by route template so unmatched paths don't create new series
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(getattr(route, "path", "unmatched"), perf_counter() - started)
@@ -0,0 +1,112 @@
+import base64
+import os
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from sip_utils import project_sip, _load_figure_class
+
+# Largest grid one request may sweep, to keep responses bounded
+MAX_SCENARIOS = int(os.getenv("SIP_MAX_SCENARIOS", "100000"))
+
+# Amounts and rates drawn in the combined chart; more would be unreadable
+MAX_CHART_AMOUNTS = 3
+MAX_CHART_RATES = 4
+
+def scenario_grid(monthly_amounts: Sequence[float], years: Sequence[int],
+                  expected_return_rates: Sequence[float]) -> Dict[str, np.ndarray]:
+    """Project every (amount, years, rate) combination in one broadcast pass.
+
+    Each axis becomes one dimension of the result, in argument order, and the
+    figures use the same SIP formula as `calculate_sip_returns`.
+    """
+    amounts = np.asarray(monthly_amounts, dtype=float)
+    horizons = np.asarray(years, dtype=int)
+    rates = np.asarray(expected_return_rates, dtype=float)
+    size = amounts.size * horizons.size * rates.size
+    if size == 0:
+        raise ValueError("Every sweep axis needs at least one value")
+    if size > MAX_SCENARIOS:
+        raise ValueError(f"Scenario grid of {size} cells exceeds the limit of {MAX_SCENARIOS}")
+    return project_sip(amounts[:, None, None], horizons[None, :, None], rates[None, None, :])
+
+def _spread(count: int, limit: int) -> np.ndarray:
+    """Pick up to `limit` evenly spaced indices from an axis, keeping both ends."""
+    return np.unique(np.linspace(0, count - 1, min(count, limit)).round().astype(int))
+
+def render_scenario_chart(monthly_amounts: Sequence[float], years: Sequence[int],
+                          expected_return_rates: Sequence[float], labels: Optional[List[str]] = None,
+                          figsize=(10, 6)) -> str:
+    """Render growth curves of a scenario grid on one chart as a base64 encoded PNG.
+
+    Each line is one (amount, rate) pair grown to the longest horizon, with
+    markers at every swept horizon. Large axes are thinned to a few evenly
+    spaced values so the chart stays readable.
+    """
+    amounts = np.asarray(monthly_amounts, dtype=float)
+    horizons = np.unique(np.asarray(years, dtype=int))
+    rates = np.asarray(expected_return_rates, dtype=float)
+    rate_labels = labels or [f"{rate:g}%" for rate in rates]
+    amount_index = _spread(len(amounts), MAX_CHART_AMOUNTS)
+    rate_index = _spread(len(rates), MAX_CHART_RATES)
+
+    # One series computation covers every swept horizon of a line
+    projection = project_sip(
+        amounts[amount_index][:, None], int(horizons.max()), rates[rate_index][None, :], include_series=True
+    )
+    value_series = projection["value_series"]
+    x = np.arange(1, value_series.shape[-1] + 1) / 12
+    marker_months = horizons * 12 - 1
+
+    Figure = _load_figure_class()
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
+    for i, a in enumerate(amount_index):
+        for j, r in enumerate(rate_index):
+            line, = ax.plot(x, value_series[i, j], label=f"{amounts[a]:,.0f}/month at {rate_labels[r]}")
+            ax.plot(horizons, value_series[i, j, marker_months], "o", color=line.get_color())
+
+    ax.set_title('SIP Scenario Comparison')
+    ax.set_xlabel('Years')
+    ax.set_ylabel('Amount')
+    ax.legend(fontsize="small")
+    ax.grid(True, linestyle='--', alpha=0.7)
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png')
+    buf.seek(0)
+    return base64.b64encode(buf.read()).decode('utf-8')
+
+def scenario_labels(expected_return_rates: Sequence[float], risk_profiles: Optional[List[str]] = None) -> Optional[List[str]]:
+    """Chart labels for the rate axis when it comes from a risk-profile sweep."""
+    if not risk_profiles:
+        return None
+    return [f"{profile} ({rate:g}%)" for profile, rate in zip(risk_profiles, expected_return_rates)]
+
+def compare_scenarios(monthly_amounts: Sequence[float], years: Sequence[int],
+                      expected_return_rates: Sequence[float], risk_profiles: Optional[List[str]] = None,
+                      include_visualization: bool = False) -> Dict[str, Any]:
+    """Evaluate a scenario grid and return it as compact nested lists.
+
+    Matrices are indexed [amount][years][rate]. When the rate axis comes from
+    a risk-profile sweep, `risk_profiles` labels it.
+    """
+    projection = scenario_grid(monthly_amounts, years, expected_return_rates)
+    result = {
+        "axes": {
+            "monthly_amount": [float(amount) for amount in monthly_amounts],
+            "years": [int(horizon) for horizon in years],
+            "expected_return_rate": [float(rate) for rate in expected_return_rates],
+            "risk_profile": risk_profiles
+        },
+        "shape": list(projection["maturity_value"].shape),
+        "invested_amount": np.round(projection["invested_amount"], 2).tolist(),
+        "expected_returns": np.round(projection["expected_returns"], 2).tolist(),
+        "maturity_value": np.round(projection["maturity_value"], 2).tolist()
+    }
+    if include_visualization:
+        result["visualization"] = render_scenario_chart(
+            monthly_amounts, years, expected_return_rates, scenario_labels(expected_return_rates, risk_profiles)
+        )
+    return result
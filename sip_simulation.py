@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fund_ranking import RISK_LEVEL_ORDINALS, RISK_PROFILE_TARGETS
+from sip_utils import fund_catalog
+
+# Assumed annualized volatility (%) for each catalog risk label
+RISK_LEVEL_VOLATILITY = {
+    "Low": 1.5,
+    "Low to Moderate": 4.0,
+    "Moderate": 9.0,
+    "Moderate to High": 14.0,
+    "High": 18.0,
+    "Very High": 22.0
+}
+
+# Path counts at or above this use the process pool when one is requested
+PROCESS_POOL_THRESHOLD = 200_000
+
+# Funds within this many risk steps of a profile's target inform its parameters
+PROFILE_RISK_BAND = 1.0
+
+def risk_profile_parameters(risk_profile: str, catalog=fund_catalog) -> Tuple[float, float]:
+    """Derive (annual return %, annual volatility %) for a risk profile from the catalog."""
+    columns = catalog.snapshot().columns
+    target = RISK_PROFILE_TARGETS.get(risk_profile.lower(), RISK_PROFILE_TARGETS["moderate"])
+    levels = np.array([RISK_LEVEL_ORDINALS.get(level, np.nan) for level in columns["risk_level"]])
+    in_band = np.abs(levels - target) <= PROFILE_RISK_BAND
+
+    # Average the longest known trailing return of the funds in the band
+    returns = columns["5y_return"].copy()
+    for field in ("3y_return", "1y_return", "historical_return"):
+        returns = np.where(np.isnan(returns), columns[field], returns)
+    volatility = np.array([RISK_LEVEL_VOLATILITY.get(level, np.nan) for level in columns["risk_level"]])
+
+    if not in_band.any():
+        return float(np.nanmean(returns)), float(np.nanmean(volatility))
+    return float(np.nanmean(returns[in_band])), float(np.nanmean(volatility[in_band]))
+
+def _simulate_chunk(args) -> np.ndarray:
+    """Simulate one chunk of SIP paths and return their maturity values."""
+    monthly_investment, months, annual_return, annual_volatility, n_paths, seed_sequence = args
+    rng = np.random.default_rng(seed_sequence)
+
+    # Lognormal monthly growth whose mean matches the deterministic monthly rate
+    sigma = annual_volatility / 100 / np.sqrt(12)
+    drift = np.log1p(annual_return / 12 / 100) - 0.5 * sigma * sigma
+
+    # Antithetic pairs: each normal draw drives one path up and its mirror down
+    half = (n_paths + 1) // 2
+    shocks = rng.standard_normal((months, half), dtype=np.float32)
+    shocks *= sigma
+    growth = np.empty_like(shocks)
+
+    values = np.empty((2, half))
+    for side, sign in enumerate((1.0, -1.0)):
+        np.multiply(shocks, sign, out=growth)
+        growth += drift
+        np.exp(growth, out=growth)
+
+        # Each instalment is invested at the start of the month and grows through it
+        value = np.zeros(half)
+        for month_growth in growth:
+            value += monthly_investment
+            value *= month_growth
+        values[side] = value
+
+    return values.reshape(-1)[:n_paths]
+
+def simulate_sip_paths(monthly_investment: float, years: int, annual_return: float, annual_volatility: float,
+                       n_paths: int = 10_000, seed: Optional[int] = None, chunk_size: int = 20_000,
+                       processes: Optional[int] = None) -> np.ndarray:
+    """Return simulated maturity values for `n_paths` SIP paths.
+
+    Paths are generated in chunks to bound memory. Every chunk draws from its
+    own child of one seed sequence, so a seed reproduces the same paths
+    whether or not the process pool is used.
+    """
+    months = int(years) * 12
+    chunk_sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        chunk_sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [
+        (monthly_investment, months, annual_return, annual_volatility, size, child_seed)
+        for size, child_seed in zip(chunk_sizes, seeds)
+    ]
+
+    if processes and n_paths >= PROCESS_POOL_THRESHOLD and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunks = list(executor.map(_simulate_chunk, tasks))
+    else:
+        chunks = [_simulate_chunk(task) for task in tasks]
+
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+def simulate_sip_outcomes(monthly_investment: float, years: int, risk_profile: str = "moderate",
+                          annual_return: Optional[float] = None, annual_volatility: Optional[float] = None,
+                          n_paths: int = 10_000, seed: Optional[int] = None,
+                          percentiles: Sequence[int] = (10, 50, 90), chunk_size: int = 20_000,
+                          processes: Optional[int] = None) -> Dict[str, float]:
+    """Simulate SIP maturity outcomes and summarize them as percentile bands.
+
+    Return and volatility default to the catalog-derived parameters for the
+    risk profile; pass either explicitly to override it.
+    """
+    if annual_return is None or annual_volatility is None:
+        profile_return, profile_volatility = risk_profile_parameters(risk_profile)
+        annual_return = profile_return if annual_return is None else annual_return
+        annual_volatility = profile_volatility if annual_volatility is None else annual_volatility
+
+    if processes is None:
+        processes = int(os.getenv("SIP_SIMULATION_PROCESSES", "0")) or None
+
+    maturity_values = simulate_sip_paths(
+        monthly_investment, years, annual_return, annual_volatility,
+        n_paths=n_paths, seed=seed, chunk_size=chunk_size, processes=processes
+    )
+    invested_amount = monthly_investment * int(years) * 12
+
+    outcomes = {
+        f"p{p}": round(float(value), 2)
+        for p, value in zip(percentiles, np.percentile(maturity_values, percentiles))
+    }
+    outcomes["mean"] = round(float(maturity_values.mean()), 2)
+    outcomes["invested_amount"] = round(float(invested_amount), 2)
+    outcomes["probability_of_loss"] = round(float((maturity_values < invested_amount).mean()), 4)
+    outcomes["annual_return"] = round(float(annual_return), 2)
+    outcomes["annual_volatility"] = round(float(annual_volatility), 2)
+    return outcomes
@@ -0,0 +1,149 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Annual inflation (%) used to deflate projections into today's money
+INFLATION_RATE = float(os.getenv("SIP_INFLATION_RATE", "6.0"))
+
+# Income-tax slab (%) applied to gains of debt-taxed funds
+DEBT_SLAB_RATE = float(os.getenv("SIP_DEBT_SLAB_RATE", "30.0"))
+
+# Equity long-term gains exempt from tax each financial year
+LTCG_EXEMPTION = float(os.getenv("SIP_LTCG_EXEMPTION", "125000"))
+
+# Capital gains treatment per tax class; rates in %, periods in months a lot must exceed
+TAX_RULES = {
+    "equity": {"short_term_rate": 20.0, "long_term_rate": 12.5, "long_term_months": 12,
+               "lock_in_months": 0, "ltcg_exempt": True},
+    "elss": {"short_term_rate": 20.0, "long_term_rate": 12.5, "long_term_months": 12,
+             "lock_in_months": 36, "ltcg_exempt": True},
+    # Debt fund gains are taxed at the slab rate however long they are held
+    "debt": {"short_term_rate": DEBT_SLAB_RATE, "long_term_rate": DEBT_SLAB_RATE, "long_term_months": 0,
+             "lock_in_months": 0, "ltcg_exempt": False}
+}
+
+# Category fragments and the tax class they select, first match wins; anything else is debt
+CATEGORY_TAX_CLASSES = (
+    ("ELSS", "elss"),
+    ("Equity", "equity"),
+    ("Hybrid - Conservative", "debt"),
+    ("Hybrid", "equity")
+)
+
+@lru_cache(maxsize=256)
+def tax_class(category: str) -> str:
+    """Return the tax class of a catalog category."""
+    return next((tax_class for fragment, tax_class in CATEGORY_TAX_CLASSES if fragment in category), "debt")
+
+@lru_cache(maxsize=1024)
+def _rule_columns(categories: Tuple[str, ...]) -> Tuple[np.ndarray, ...]:
+    """Return per-fund tax rule columns, shaped to broadcast over valuation dates."""
+    rules = [TAX_RULES[tax_class(category)] for category in categories]
+    lock_in = np.array([rule["lock_in_months"] for rule in rules])[:, None]
+    # A lot can only count as long-term once it is out of its lock-in
+    long_term = np.maximum(np.array([rule["long_term_months"] for rule in rules])[:, None], lock_in)
+    short_term_rate = np.array([rule["short_term_rate"] for rule in rules])[:, None] / 100
+    long_term_rate = np.array([rule["long_term_rate"] for rule in rules])[:, None] / 100
+    exempt = np.array([rule["ltcg_exempt"] for rule in rules])[:, None]
+    return lock_in, long_term, short_term_rate, long_term_rate, exempt
+
+def _lots_value(count: np.ndarray, monthly_rate: np.ndarray) -> np.ndarray:
+    """Value of the `count` youngest unit instalments, aged 1..count months."""
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
+    value = ((np.power(1 + monthly_rate, count) - 1) / safe_rate) * (1 + monthly_rate)
+    return np.where(zero_rate, count, value)
+
+def after_tax_projection(monthly_amounts: Sequence[float], categories: Sequence[str], years: int,
+                         expected_return_rates, inflation_rate: float = INFLATION_RATE) -> Dict[str, np.ndarray]:
+    """Project nominal, real and post-tax values of a SIP split across funds, year by year.
+
+    Every instalment is a separate lot, so redeeming the whole holding at a
+    valuation date is a FIFO redemption where each lot is taxed by its own
+    holding period. Lots of the same age are identical across a fund, so the
+    value of an age band is a closed-form geometric sum rather than a loop
+    over instalments. Lots still in an ELSS lock-in can't be redeemed; they are
+    reported as `locked_value` and left out of the post-tax value. The equity
+    LTCG exemption is shared pro rata across eligible funds.
+
+    Returns arrays over the valuation dates at the end of each year.
+    """
+    amounts = np.asarray(monthly_amounts, dtype=float)[:, None]
+    monthly_rate = np.broadcast_to(np.asarray(expected_return_rates, dtype=float), amounts.shape[:1])[:, None] / 12 / 100
+    lock_in, long_term, short_term_rate, long_term_rate, exempt = _rule_columns(tuple(categories))
+
+    # Valuation at the end of each year; a lot bought in month m is t - m + 1 months old at month t
+    months = np.arange(1, int(years) + 1) * 12
+    total_value = amounts * _lots_value(months, monthly_rate)
+
+    # Split the lots into locked (age <= lock-in), short-term and long-term age bands
+    locked_lots = np.minimum(months, lock_in)
+    short_lots = np.minimum(months, long_term)
+    locked_value = amounts * _lots_value(locked_lots, monthly_rate)
+    short_value = amounts * _lots_value(short_lots, monthly_rate) - locked_value
+    long_value = total_value - locked_value - short_value
+    short_gain = short_value - amounts * (short_lots - locked_lots)
+    long_gain = long_value - amounts * (months - short_lots)
+
+    # The yearly LTCG exemption covers all eligible funds together
+    eligible_gain = np.where(exempt, np.maximum(long_gain, 0.0), 0.0)
+    eligible_total = eligible_gain.sum(axis=0)
+    exemption_share = np.minimum(eligible_total, LTCG_EXEMPTION) / np.where(eligible_total > 0, eligible_total, 1.0)
+    taxable_long_gain = np.maximum(long_gain, 0.0) - eligible_gain * exemption_share
+    tax = short_term_rate * np.maximum(short_gain, 0.0) + long_term_rate * taxable_long_gain
+
+    deflator = np.power(1 + inflation_rate / 100, months / 12)
+    nominal_value = total_value.sum(axis=0)
+    post_tax_value = (total_value - locked_value - tax).sum(axis=0)
+    return {
+        "years": months // 12,
+        "invested_amount": amounts.sum() * months,
+        "nominal_value": nominal_value,
+        "real_value": nominal_value / deflator,
+        "locked_value": locked_value.sum(axis=0),
+        "tax": tax.sum(axis=0),
+        "post_tax_value": post_tax_value,
+        "real_post_tax_value": post_tax_value / deflator
+    }
+
+def real_returns(monthly_amounts: Sequence[float], categories: Sequence[str], years: int,
+                 expected_return_rates, inflation_rate: Optional[float] = None) -> Dict[str, Any]:
+    """Summarize `after_tax_projection` at the horizon with rounded yearly series."""
+    if inflation_rate is None:
+        inflation_rate = INFLATION_RATE
+    projection = after_tax_projection(monthly_amounts, categories, years, expected_return_rates, inflation_rate)
+    series_fields = ("nominal_value", "real_value", "post_tax_value", "real_post_tax_value")
+    summary = {"inflation_rate": inflation_rate}
+    for field in ("invested_amount", "nominal_value", "real_value", "locked_value", "tax",
+                  "post_tax_value", "real_post_tax_value"):
+        summary[field] = round(float(projection[field][-1]), 2)
+    summary["series"] = {field: np.round(projection[field], 2).tolist() for field in series_fields}
+    return summary
+
+def result_real_returns(result: Dict[str, Any], inflation_rate: Optional[float] = None) -> Dict[str, Any]:
+    """Real and post-tax projection of an advisor result across its recommended funds.
+
+    Every fund grows at the recommended rate, so the nominal series matches
+    the result's projected returns. The allocation's per-fund amounts decide
+    how much of the SIP each fund's tax class covers when the result has one,
+    otherwise the SIP is split equally.
+    """
+    recommendation = result["recommendation"]
+    rate = recommendation["expected_return_rate"]
+    category_by_symbol = {
+        symbol: fund["category"] for symbol, fund in zip(recommendation["recommended_funds"], result["fund_data"])
+    }
+    allocation = result.get("allocation")
+    if allocation:
+        entries = allocation["allocations"]
+        amounts = [entry["monthly_amount"] for entry in entries]
+        categories = [category_by_symbol.get(entry["symbol"], "Unknown") for entry in entries]
+    elif category_by_symbol:
+        categories = list(category_by_symbol.values())
+        amounts = [result["adjusted_monthly_amount"] / len(categories)] * len(categories)
+    else:
+        # Without fund data the whole SIP is taxed as one equity holding
+        categories, amounts = ["Equity"], [result["adjusted_monthly_amount"]]
+    return real_returns(amounts, categories, recommendation["investment_timeframe_years"], rate, inflation_rate)
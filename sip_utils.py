@@ -1,112 +1,48 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import base64
+import os
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, List, Any
-
-# Sample fund data - in a real application, you'd fetch this from an API
-FUND_DATABASE = {
-    "HDFC_EQUITY": {
-        "name": "HDFC Equity Fund",
-        "category": "Equity - Large Cap",
-        "nav": 845.67,
-        "expense_ratio": 1.65,
-        "risk_level": "Moderate to High",
-        "historical_return": 14.8,
-        "min_investment": 5000,
-        "fund_manager": "Prashant Jain"
-    },
-    "ICICI_BLUECHIP": {
-        "name": "ICICI Prudential Bluechip Fund",
-        "category": "Equity - Large Cap",
-        "nav": 58.23,
-        "expense_ratio": 1.78,
-        "risk_level": "Moderate to High",
-        "historical_return": 13.5,
-        "min_investment": 1000,
-        "fund_manager": "Anish Tawakley"
-    },
-    "SBI_SMALLCAP": {
-        "name": "SBI Small Cap Fund",
-        "category": "Equity - Small Cap",
-        "nav": 98.45,
-        "expense_ratio": 1.92,
-        "risk_level": "High",
-        "historical_return": 17.2,
-        "min_investment": 5000,
-        "fund_manager": "R. Srinivasan"
-    },
-    "AXIS_MIDCAP": {
-        "name": "Axis Midcap Fund",
-        "category": "Equity - Mid Cap",
-        "nav": 65.34,
-        "expense_ratio": 1.82,
-        "risk_level": "High",
-        "historical_return": 16.8,
-        "min_investment": 1000,
-        "fund_manager": "Shreyash Devalkar"
-    },
-    "KOTAK_STANDARD": {
-        "name": "Kotak Standard Multicap Fund",
-        "category": "Equity - Multi Cap",
-        "nav": 43.21,
-        "expense_ratio": 1.68,
-        "risk_level": "Moderate to High",
-        "historical_return": 15.4,
-        "min_investment": 5000,
-        "fund_manager": "Harsha Upadhyaya"
-    },
-    "FRANKLIN_TAXSHIELD": {
-        "name": "Franklin India Taxshield Fund",
-        "category": "Equity - ELSS",
-        "nav": 76.89,
-        "expense_ratio": 1.95,
-        "risk_level": "Moderate to High",
-        "historical_return": 13.9,
-        "min_investment": 500,
-        "fund_manager": "R. Janakiraman"
-    },
-    "ICICI_BALANCED": {
-        "name": "ICICI Prudential Balanced Advantage Fund",
-        "category": "Hybrid - Dynamic Asset Allocation",
-        "nav": 45.67,
-        "expense_ratio": 1.72,
-        "risk_level": "Moderate",
-        "historical_return": 11.8,
-        "min_investment": 1000,
-        "fund_manager": "Sankaran Naren"
-    },
-    "HDFC_HYBRID": {
-        "name": "HDFC Hybrid Equity Fund",
-        "category": "Hybrid - Aggressive",
-        "nav": 67.23,
-        "expense_ratio": 1.85,
-        "risk_level": "Moderate",
-        "historical_return": 12.5,
-        "min_investment": 5000,
-        "fund_manager": "Chirag Setalvad"
-    },
-    "SBI_DEBT": {
-        "name": "SBI Magnum Income Fund",
-        "category": "Debt - Medium to Long Duration",
-        "nav": 52.19,
-        "expense_ratio": 1.52,
-        "risk_level": "Low to Moderate",
-        "historical_return": 8.2,
-        "min_investment": 5000,
-        "fund_manager": "Dinesh Ahuja"
-    },
-    "ADITYA_CORPORATE_BOND": {
-        "name": "Aditya Birla Sun Life Corporate Bond Fund",
-        "category": "Debt - Corporate Bond",
-        "nav": 87.65,
-        "expense_ratio": 1.38,
-        "risk_level": "Low",
-        "historical_return": 7.8,
-        "min_investment": 1000,
-        "fund_manager": "Sunaina da Cunha"
-    }
-}
+from typing import Dict, List, Any, Optional, Tuple
+from fund_catalog import FundCatalog, DEFAULT_CATALOG_PATH, normalize_symbol
+from fund_ranking import FundRanker
+from fund_analytics import AnalyticsSource, DEFAULT_ANALYTICS_PATH
+from sip_cache import SharedCache
+from sip_workers import SHARED_CACHE_ENV, attach_shared_tables, shared_catalog_records
+
+# Number of rendered charts kept in memory, keyed on (amount, years, rate, size)
+CHART_CACHE_SIZE = int(os.getenv("SIP_CHART_CACHE_SIZE", "256"))
+
+# Number of rendered charts kept in the cache shared by all workers
+SHARED_CHART_CACHE_SIZE = int(os.getenv("SIP_SHARED_CHART_CACHE_SIZE", "4096"))
+
+# Catalog records and unit curves published by the multi-worker launcher, if this is a worker
+shared_tables = attach_shared_tables()
+
+# Fund catalog loaded from disk; reloads itself when the file changes
+fund_catalog = FundCatalog(
+    os.getenv("SIP_FUND_CATALOG_PATH", DEFAULT_CATALOG_PATH),
+    records=shared_catalog_records(shared_tables)
+)
+
+# Rolling-return and risk statistics from the NAV history, once an analytics job has run
+fund_analytics = AnalyticsSource(os.getenv("SIP_FUND_ANALYTICS_PATH", DEFAULT_ANALYTICS_PATH))
+
+# Ranking engine over the catalog, with per-version precomputed scores
+fund_ranker = FundRanker(fund_catalog, fund_analytics)
+
+def get_catalog_version() -> Tuple[str, Optional[str]]:
+    """Return a token that changes whenever the catalog or its analytics change.
+
+    Built from content rather than reload counters, so workers sharing a
+    cache agree on it for the same catalog.
+    """
+    analytics = fund_analytics.current()
+    return fund_catalog.fingerprint, analytics.version if analytics is not None else None
+
+def update_fund_database(funds: Dict[str, Dict[str, Any]]) -> None:
+    """Add or replace funds in the catalog and bump its version."""
+    fund_catalog.update(funds)
 
 def calculate_daily_to_monthly(daily_amount: float) -> float:
     """Convert daily savings capacity to monthly equivalent."""
@@ -118,101 +54,262 @@ def calculate_weekly_to_monthly(weekly_amount: float) -> float:
 
 def get_fund_data(fund_symbol: str) -> Dict[str, Any]:
     """Get fund data for a given fund symbol."""
-    # Normalize the fund symbol
-    fund_symbol = fund_symbol.upper().replace(" ", "_")
-    
     # Return fund data if available, otherwise return a default placeholder
-    if fund_symbol in FUND_DATABASE:
-        return FUND_DATABASE[fund_symbol]
+    fund = fund_catalog.get(fund_symbol)
+    if fund is not None:
+        # Attach measured statistics when the fund has NAV history
+        analytics = fund_analytics.current()
+        metrics = analytics.get(normalize_symbol(fund_symbol)) if analytics is not None else None
+        if metrics is not None:
+            return dict(fund, risk_metrics=metrics)
+        return fund
     else:
         # Return a placeholder for unknown funds
         return {
-            "name": fund_symbol.replace("_", " "),
+            "name": normalize_symbol(fund_symbol).replace("_", " "),
             "category": "Unknown",
-            "nav": 0.0,
+            "nav": None,
             "expense_ratio": 0.0,
             "risk_level": "Unknown",
             "historical_return": 0.0,
-            "min_investment": 0.0,
-            "fund_manager": "Unknown"
+            "min_investment": None,
+            "fund_manager": None
         }
 
-def recommend_funds(risk_profile: str, investment_goals: str) -> List[str]:
-    """Recommend funds based on risk profile and investment goals."""
-    # This is a simplified recommendation logic
-    # In a real application, this would be more sophisticated
-    
-    if risk_profile.lower() == "conservative":
-        return ["ADITYA_CORPORATE_BOND", "SBI_DEBT", "HDFC_HYBRID"]
-    elif risk_profile.lower() == "moderate":
-        return ["ICICI_BALANCED", "HDFC_HYBRID", "KOTAK_STANDARD"]
-    elif risk_profile.lower() == "aggressive":
-        return ["SBI_SMALLCAP", "AXIS_MIDCAP", "HDFC_EQUITY"]
-    else:
-        # Default to a balanced portfolio
-        return ["ICICI_BLUECHIP", "HDFC_HYBRID", "ADITYA_CORPORATE_BOND"]
+def recommend_funds(risk_profile: str, investment_goals: str, monthly_amount: Optional[float] = None, k: int = 3) -> List[str]:
+    """Recommend funds based on risk profile, investment goals and monthly amount."""
+    # Score the whole catalog and keep the top-k funds
+    return [symbol for symbol, _ in fund_ranker.rank(risk_profile, monthly_amount, investment_goals, k)]
 
-def calculate_sip_returns(monthly_investment: float, years: int, expected_return_rate: float) -> Dict[str, float]:
-    """Calculate SIP returns over a given time period."""
-    monthly_rate = expected_return_rate / 12 / 100
+def project_sip(monthly_investment, years, expected_return_rate, include_series: bool = False) -> Dict[str, np.ndarray]:
+    """Project SIP growth for one or many profiles in a single vectorized pass.
+
+    Inputs may be scalars or arrays and are broadcast against each other.
+    With `include_series`, month-by-month `invested_series` and `value_series`
+    are added along a trailing axis; months past a profile's horizon are NaN.
+    Projections on the rule-based grid are scaled from precomputed unit curves.
+    """
+    if np.ndim(monthly_investment) == 0 and np.ndim(years) == 0 and np.ndim(expected_return_rate) == 0:
+        curve = UNIT_CURVES.get((int(years), float(expected_return_rate)))
+        if curve is not None:
+            return _scale_unit_curve(curve, float(monthly_investment), include_series)
+    elif not include_series:
+        projection = _scale_unit_grid(monthly_investment, years, expected_return_rate)
+        if projection is not None:
+            return projection
+    return _project_sip(monthly_investment, years, expected_return_rate, include_series)
+
+def _project_sip(monthly_investment, years, expected_return_rate, include_series: bool = False) -> Dict[str, np.ndarray]:
+    """Project SIP growth from the closed-form formula, for any inputs."""
+    amount, years, rate = np.broadcast_arrays(
+        np.asarray(monthly_investment, dtype=float),
+        np.asarray(years, dtype=int),
+        np.asarray(expected_return_rate, dtype=float)
+    )
+    monthly_rate = rate / 12 / 100
     months = years * 12
     
-    # Calculate invested amount
-    invested_amount = monthly_investment * months
+    # A zero rate makes the geometric series degenerate to a plain sum
+    zero_rate = monthly_rate == 0
+    safe_rate = np.where(zero_rate, 1.0, monthly_rate)
     
-    # Calculate maturity value using SIP formula
-    maturity_value = monthly_investment * ((pow(1 + monthly_rate, months) - 1) / monthly_rate) * (1 + monthly_rate)
+    # Same operation order as the scalar SIP formula so results match to the cent
+    maturity_value = amount * ((np.power(1 + monthly_rate, months) - 1) / safe_rate) * (1 + monthly_rate)
+    maturity_value = np.where(zero_rate, amount * months, maturity_value)
+    invested_amount = amount * months
+    
+    projection = {
+        "invested_amount": invested_amount,
+        "expected_returns": maturity_value - invested_amount,
+        "maturity_value": maturity_value
+    }
+    
+    if include_series:
+        # Month index 1..N along a trailing axis, broadcast against every profile
+        month_index = np.arange(1, int(months.max(initial=0)) + 1)
+        amount_ = amount[..., None]
+        rate_ = monthly_rate[..., None]
+        growth = np.power(1 + rate_, month_index)
+        value_series = amount_ * ((growth - 1) / safe_rate[..., None]) * (1 + rate_)
+        value_series = np.where(zero_rate[..., None], amount_ * month_index, value_series)
+        invested_series = amount_ * month_index
+        
+        # Blank out months past each profile's own horizon
+        beyond_horizon = month_index > months[..., None]
+        projection["invested_series"] = np.where(beyond_horizon, np.nan, invested_series)
+        projection["value_series"] = np.where(beyond_horizon, np.nan, value_series)
+    
+    return projection
+
+# Timeframes (years) and annual rates (%) the rule-based advisor produces
+GRID_YEARS = (10, 15, 20, 30)
+GRID_RATES = (8.0, 12.0, 15.0)
+
+def _unit_curve(years: int, expected_return_rate: float,
+                value_series_factor: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """Precompute the projection of a 1-per-month SIP as factors of the SIP formula.
+
+    A projection is `amount * value_factor * growth`, the same operations in
+    the same order as `_project_sip`, so scaled results match it bit for bit.
+    """
+    monthly_rate = np.asarray(expected_return_rate, dtype=float) / 12 / 100
+    months = np.asarray(years, dtype=int) * 12
+    month_index = np.arange(1, int(months) + 1)
+    rate_ = monthly_rate[..., None]
+    # Workers reuse the per-month factors the launcher computed in shared memory
+    if value_series_factor is None:
+        value_series_factor = (np.power(1 + rate_, month_index) - 1) / monthly_rate[..., None]
+    for array in (month_index, value_series_factor):
+        array.flags.writeable = False
+    return {
+        "months": int(months),
+        "value_factor": float((np.power(1 + monthly_rate, months) - 1) / monthly_rate),
+        "growth": float(1 + monthly_rate),
+        "month_index": month_index,
+        "value_series_factor": value_series_factor,
+        "series_growth": rate_ + 1
+    }
+
+def _shared_unit_series() -> Dict[Tuple[int, float], np.ndarray]:
+    """Return the launcher's per-month unit curve factors keyed by (years, rate)."""
+    if not shared_tables:
+        return {}
+    series = shared_tables["unit_curves/value_series_factor"]
+    return {
+        (int(years), float(rate)): series[row, :int(years) * 12]
+        for row, (years, rate) in enumerate(zip(shared_tables["unit_curves/years"], shared_tables["unit_curves/rates"]))
+    }
+
+# Unit-investment curves for every rule-based (years, rate) pair, built once at import
+_unit_series = _shared_unit_series()
+UNIT_CURVES = {
+    (years, rate): _unit_curve(years, rate, _unit_series.get((years, rate)))
+    for years in GRID_YEARS for rate in GRID_RATES
+}
+
+# The same factors laid out as (year, rate) tables for vectorized lookups
+_GRID_YEARS = np.array(GRID_YEARS)
+_GRID_RATES = np.array(GRID_RATES)
+_GRID_MONTHS = np.array([[UNIT_CURVES[(y, r)]["months"] for r in GRID_RATES] for y in GRID_YEARS])
+_GRID_VALUE_FACTORS = np.array([[UNIT_CURVES[(y, r)]["value_factor"] for r in GRID_RATES] for y in GRID_YEARS])
+_GRID_GROWTH = np.array([[UNIT_CURVES[(y, r)]["growth"] for r in GRID_RATES] for y in GRID_YEARS])
+
+def _scale_unit_curve(curve: Dict[str, Any], amount: float, include_series: bool) -> Dict[str, Any]:
+    """Scale a precomputed unit curve to a monthly amount."""
+    invested_amount = amount * curve["months"]
+    maturity_value = amount * curve["value_factor"] * curve["growth"]
+    projection = {
+        "invested_amount": np.float64(invested_amount),
+        "expected_returns": np.float64(maturity_value - invested_amount),
+        "maturity_value": np.float64(maturity_value)
+    }
+    if include_series:
+        projection["invested_series"] = amount * curve["month_index"]
+        projection["value_series"] = amount * curve["value_series_factor"] * curve["series_growth"]
+    return projection
+
+def _scale_unit_grid(monthly_investment, years, expected_return_rate) -> Optional[Dict[str, np.ndarray]]:
+    """Project many profiles by table lookup, or return None if any falls off the grid."""
+    amount, years, rate = np.broadcast_arrays(
+        np.asarray(monthly_investment, dtype=float),
+        np.asarray(years, dtype=int),
+        np.asarray(expected_return_rate, dtype=float)
+    )
+    year_index = np.minimum(np.searchsorted(_GRID_YEARS, years), len(GRID_YEARS) - 1)
+    rate_index = np.minimum(np.searchsorted(_GRID_RATES, rate), len(GRID_RATES) - 1)
+    if not ((_GRID_YEARS[year_index] == years).all() and (_GRID_RATES[rate_index] == rate).all()):
+        return None
+    invested_amount = amount * _GRID_MONTHS[year_index, rate_index]
+    maturity_value = amount * _GRID_VALUE_FACTORS[year_index, rate_index] * _GRID_GROWTH[year_index, rate_index]
+    return {
+        "invested_amount": invested_amount,
+        "expected_returns": maturity_value - invested_amount,
+        "maturity_value": maturity_value
+    }
+
+def calculate_sip_returns(monthly_investment: float, years: int, expected_return_rate: float) -> Dict[str, float]:
+    """Calculate SIP returns over a given time period."""
+    # Rule-based grid hits are one multiply of a unit curve
+    curve = UNIT_CURVES.get((years, expected_return_rate))
+    if curve is not None:
+        invested_amount = monthly_investment * curve["months"]
+        maturity_value = monthly_investment * curve["value_factor"] * curve["growth"]
+        return {
+            "invested_amount": round(float(invested_amount), 2),
+            "expected_returns": round(float(maturity_value - invested_amount), 2),
+            "maturity_value": round(float(maturity_value), 2)
+        }
     
-    # Calculate wealth gained
-    wealth_gained = maturity_value - invested_amount
+    projection = project_sip(monthly_investment, years, expected_return_rate)
     
     return {
-        "invested_amount": round(invested_amount, 2),
-        "expected_returns": round(wealth_gained, 2),
-        "maturity_value": round(maturity_value, 2)
+        "invested_amount": round(float(projection["invested_amount"]), 2),
+        "expected_returns": round(float(projection["expected_returns"]), 2),
+        "maturity_value": round(float(projection["maturity_value"]), 2)
     }
 
-def generate_sip_visualization(monthly_investment: float, years: int, expected_return: float) -> str:
+def generate_sip_visualization(monthly_investment: float, years: int, expected_return: float, figsize: Tuple[float, float] = (10, 6)) -> str:
     """Generate a visualization of SIP growth and return a base64 encoded image."""
+    # Identical projections share one cached render
+    key = (round(float(monthly_investment), 2), int(years), float(expected_return), tuple(figsize))
+    if shared_chart_cache is None:
+        return _render_sip_chart(*key)
+    # Under the multi-worker launcher another worker may already have rendered it
+    chart = shared_chart_cache.get(key)
+    if chart is None:
+        chart = _render_sip_chart(*key)
+        shared_chart_cache.set(key, chart)
+    return chart
+
+# Rendered charts shared by every worker when a shared cache database is configured
+shared_chart_cache = (
+    SharedCache(os.environ[SHARED_CACHE_ENV], "charts", maxsize=SHARED_CHART_CACHE_SIZE)
+    if os.getenv(SHARED_CACHE_ENV) else None
+)
+
+@lru_cache(maxsize=1)
+def _load_figure_class():
+    """Import matplotlib on first chart render, pinned to the non-interactive Agg backend."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    return Figure
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_sip_chart(monthly_investment: float, years: int, expected_return: float, figsize: Tuple[float, float]) -> str:
+    """Render the SIP growth chart as a base64 encoded PNG."""
     # Create data for visualization
     months = years * 12
-    monthly_rate = expected_return / 12 / 100
-    
-    # Calculate invested amount over time
-    invested_amounts = [monthly_investment * (m + 1) for m in range(months)]
-    
-    # Calculate SIP value over time
-    sip_values = []
-    for m in range(months):
-        sip_value = monthly_investment * ((pow(1 + monthly_rate, m + 1) - 1) / monthly_rate) * (1 + monthly_rate)
-        sip_values.append(sip_value)
+    projection = project_sip(monthly_investment, years, expected_return, include_series=True)
+    invested_amounts = projection["invested_series"]
+    sip_values = projection["value_series"]
     
-    # Create the plot
-    plt.figure(figsize=(10, 6))
+    # Create the plot on a standalone figure so renders are safe across worker threads
+    Figure = _load_figure_class()
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
     
     # Create x-axis in years
-    x = np.array(range(months)) / 12
+    x = np.arange(months) / 12
     
     # Plot the data
-    plt.plot(x, invested_amounts, label='Invested Amount', color='blue')
-    plt.plot(x, sip_values, label='SIP Value', color='green')
-    plt.fill_between(x, invested_amounts, sip_values, color='lightgreen', alpha=0.5)
+    ax.plot(x, invested_amounts, label='Invested Amount', color='blue')
+    ax.plot(x, sip_values, label='SIP Value', color='green')
+    ax.fill_between(x, invested_amounts, sip_values, color='lightgreen', alpha=0.5)
     
     # Customize the plot
-    plt.title('SIP Growth Projection')
-    plt.xlabel('Years')
-    plt.ylabel('Amount')
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.7)
+    ax.set_title('SIP Growth Projection')
+    ax.set_xlabel('Years')
+    ax.set_ylabel('Amount')
+    ax.legend()
+    ax.grid(True, linestyle='--', alpha=0.7)
     
     # Format y-axis with tick marks in thousands or lakhs based on the scale
-    plt.ticklabel_format(axis='y', style='plain')
+    ax.ticklabel_format(axis='y', style='plain')
     
     # Convert plot to base64 string
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
+    fig.savefig(buffer, format='png')
     image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    plt.close()
     
-    return image_base64
\ No newline at end of file
+    return image_base64
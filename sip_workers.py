@@ -0,0 +1,142 @@
+import json
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Environment variables the launcher hands to its worker processes
+SHARED_TABLES_ENV = "SIP_SHARED_TABLES"
+SHARED_CACHE_ENV = "SIP_SHARED_CACHE_PATH"
+
+# Default location of the cache database shared by workers
+DEFAULT_SHARED_CACHE_PATH = ".sip_shared_cache.sqlite3"
+
+# Array offsets are aligned so every view is suitably aligned for its dtype
+ARRAY_ALIGNMENT = 64
+
+# Length prefix of the JSON layout header at the start of the block
+_HEADER_PREFIX = struct.Struct("<Q")
+
+# Blocks this worker has attached; their buffers back the shared views
+_attached_blocks = []
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+def publish_arrays(arrays: Dict[str, np.ndarray], name: Optional[str] = None) -> shared_memory.SharedMemory:
+    """Copy named arrays into one new shared memory block and return it.
+
+    The block starts with a JSON header giving each array's offset, dtype and
+    shape, so workers can map views over it without another copy. The caller
+    owns the block and must `close()` and `unlink()` it on shutdown.
+    """
+    arrays = {key: np.ascontiguousarray(value) for key, value in arrays.items()}
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        offset = _aligned(offset)
+        layout[key] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += array.nbytes
+    header = json.dumps(layout).encode("utf-8")
+    data_start = _aligned(_HEADER_PREFIX.size + len(header))
+
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(data_start + offset, 1))
+    _HEADER_PREFIX.pack_into(block.buf, 0, len(header))
+    block.buf[_HEADER_PREFIX.size:_HEADER_PREFIX.size + len(header)] = header
+    for key, array in arrays.items():
+        start = data_start + layout[key]["offset"]
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=start)
+        view[...] = array
+    return block
+
+def attach_arrays(name: str) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+    """Map read-only views over a block created by `publish_arrays`.
+
+    The block object is returned too; keep a reference to it for as long as
+    the views are in use.
+    """
+    try:
+        block = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with this process's
+        # resource tracker, which would unlink it when the worker exits
+        from multiprocessing import resource_tracker
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, "shared_memory")
+
+    header_length = _HEADER_PREFIX.unpack_from(block.buf, 0)[0]
+    layout = json.loads(bytes(block.buf[_HEADER_PREFIX.size:_HEADER_PREFIX.size + header_length]))
+    data_start = _aligned(_HEADER_PREFIX.size + header_length)
+    arrays = {}
+    for key, entry in layout.items():
+        view = np.ndarray(tuple(entry["shape"]), dtype=np.dtype(entry["dtype"]),
+                          buffer=block.buf, offset=data_start + entry["offset"])
+        view.flags.writeable = False
+        arrays[key] = view
+    return block, arrays
+
+def attach_shared_tables() -> Optional[Dict[str, np.ndarray]]:
+    """Return the tables published by the launcher, or None outside a worker."""
+    name = os.getenv(SHARED_TABLES_ENV)
+    if not name:
+        return None
+    try:
+        block, arrays = attach_arrays(name)
+    except Exception as e:
+        print(f"Failed to attach shared tables {name}: {str(e)}. Building them locally.")
+        return None
+    # The views borrow the block's buffer, so keep it open for the process lifetime
+    _attached_blocks.append(block)
+    return arrays
+
+def shared_catalog_records(tables: Optional[Dict[str, np.ndarray]]) -> Optional[Dict[str, Dict]]:
+    """Decode the catalog records published by the launcher, if any."""
+    if not tables or "catalog/records" not in tables:
+        return None
+    return json.loads(tables["catalog/records"].tobytes())
+
+def build_shared_tables() -> Dict[str, np.ndarray]:
+    """Collect the fund catalog records and unit SIP curves workers should share."""
+    from sip_utils import fund_catalog, UNIT_CURVES
+
+    # Normalized records travel as JSON bytes so workers rebuild them exactly, ints included
+    records = json.dumps({
+        symbol: dict(record) for symbol, record in fund_catalog.snapshot().records.items()
+    }).encode("utf-8")
+    tables = {"catalog/records": np.frombuffer(records, dtype=np.uint8)}
+    # Unit curves of different lengths are padded into one matrix
+    keys = sorted(UNIT_CURVES)
+    longest = max(UNIT_CURVES[key]["months"] for key in keys)
+    series = np.full((len(keys), longest), np.nan)
+    for row, key in enumerate(keys):
+        factors = UNIT_CURVES[key]["value_series_factor"]
+        series[row, :len(factors)] = factors
+    tables["unit_curves/years"] = np.array([years for years, _ in keys])
+    tables["unit_curves/rates"] = np.array([rate for _, rate in keys])
+    tables["unit_curves/value_series_factor"] = series
+    return tables
+
+def serve(app_path: str = "app:app", host: str = "0.0.0.0", port: int = 8000, workers: Optional[int] = None) -> None:
+    """Run the API under uvicorn with one process per core sharing tables and caches.
+
+    The launcher loads the catalog and builds the unit curves once, publishes them
+    in shared memory and points every worker at a fresh shared cache database.
+    """
+    import uvicorn
+
+    workers = workers or os.cpu_count() or 1
+    block = publish_arrays(build_shared_tables())
+    cache_path = os.getenv(SHARED_CACHE_ENV, DEFAULT_SHARED_CACHE_PATH)
+    # Cached results belong to this deployment's catalog, so start empty
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(cache_path + suffix):
+            os.remove(cache_path + suffix)
+    os.environ[SHARED_TABLES_ENV] = block.name
+    os.environ[SHARED_CACHE_ENV] = cache_path
+    try:
+        uvicorn.run(app_path, host=host, port=port, workers=workers)
+    finally:
+        block.close()
+        block.unlink()
@@ -1,11 +1,7 @@
 import streamlit as st
 import requests
 import json
-import base64
-from PIL import Image
-from io import BytesIO
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # Set page configuration
 st.set_page_config(
@@ -71,7 +67,9 @@ if submit_button:
                 "currency": currency,
                 "age": age,
                 "goals": goals,
-                "risk_tolerance": risk_profile
+                "risk_tolerance": risk_profile,
+                # Plot raw curves client-side instead of shipping a PNG
+                "visualization_format": "series"
             }
             
             # Make the API request
@@ -109,11 +107,14 @@ if submit_button:
                 
                 with col3:
                     st.subheader("Investment Growth")
-                    # Display the visualization image
-                    if result['visualization']:
-                        image_bytes = base64.b64decode(result['visualization'])
-                        image = Image.open(BytesIO(image_bytes))
-                        st.image(image, use_container_width=True)
+                    # Plot the downsampled growth curves
+                    series = result.get('visualization_series')
+                    if series:
+                        growth_df = pd.DataFrame({
+                            'Invested Amount': series['invested_amount'],
+                            'SIP Value': series['sip_value']
+                        }, index=pd.Index(series['years'], name='Years'))
+                        st.line_chart(growth_df, use_container_width=True)
                 
                 # Display recommended funds
                 st.header("Recommended Funds")
@@ -0,0 +1,19 @@
+from fastapi.testclient import TestClient
+
+from app import app
+
+client = TestClient(app)
+
+PROFILE = {"savings_capacity": 5000, "frequency": "monthly", "age": 30, "goals": "retirement",
+           "include_visualization": False}
+
+def test_allocation_is_opt_in():
+    assert client.post("/api/sip_advisor", json=PROFILE).json().get("allocation") is None
+    allocated = client.post("/api/sip_advisor", json={**PROFILE, "include_allocation": True}).json()
+    assert allocated["allocation"]["allocations"]
+
+def test_real_returns_are_opt_in_and_match_the_nominal_projection():
+    assert client.post("/api/sip_advisor", json=PROFILE).json().get("real_returns") is None
+    result = client.post("/api/sip_advisor",
+                         json={**PROFILE, "include_allocation": True, "include_real_returns": True}).json()
+    assert result["real_returns"]["nominal_value"] == result["projected_returns"]["maturity_value"]
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+from sip_allocation import _mean_variance_with_minimums, allocate_sip
+
+@pytest.mark.parametrize("symbols", [["HDFC_EQUITY", "hdfc equity"], ["HDFC_EQUITY", "HDFC_EQUITY", "SBI_DEBT"]])
+def test_allocation_merges_duplicate_symbols(symbols):
+    allocation = allocate_sip(symbols, 10000, 10)
+    allocated = [entry["symbol"] for entry in allocation["allocations"]]
+    assert len(allocated) == len(set(allocated))
+    assert sum(entry["monthly_amount"] for entry in allocation["allocations"]) == pytest.approx(10000)
+
+def test_mean_variance_skips_singular_states():
+    covariance = np.full((2, 2), 0.04)
+    weights = _mean_variance_with_minimums(np.array([10.0, 10.0]), covariance, np.zeros(2), 2.0)
+    assert weights is not None
+    assert weights.sum() == pytest.approx(1.0)
@@ -0,0 +1,16 @@
+import json
+
+import pytest
+
+from sip_bulk import process_chunk
+
+PROFILE = {"savings_capacity": 5000, "frequency": "monthly", "age": 30, "goals": "retirement"}
+
+@pytest.mark.parametrize("field, value", [("frequency", 5), ("goals", ["retirement"]), ("currency", None),
+                                          ("risk_tolerance", 3)])
+def test_wrongly_typed_field_gives_an_error_record(field, value):
+    lines = [json.dumps(PROFILE), json.dumps({**PROFILE, field: value}), json.dumps(PROFILE)]
+    output = [json.loads(line) for line in process_chunk(lines)]
+
+    assert "recommendation" in output[0] and "recommendation" in output[2]
+    assert output[1] == {"error": f"{field} must be a string"}
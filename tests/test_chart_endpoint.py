@@ -0,0 +1,24 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from sip_charts import generate_sip_svg
+
+client = TestClient(app)
+
+CHART = {"monthly_amount": 5000, "years": 10, "expected_return_rate": 12, "visualization_format": "svg"}
+
+@pytest.mark.parametrize("size", [{"width": 0}, {"height": -1}, {"width": 1e6}, {"height": 31}])
+def test_chart_rejects_out_of_range_sizes(size):
+    assert client.post("/api/sip_advisor/chart", json={**CHART, **size}).status_code == 422
+
+def test_chart_accepts_bounded_sizes():
+    response = client.post("/api/sip_advisor/chart", json={**CHART, "width": 30, "height": 1})
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("field", [{"years": 0}, {"years": -3}, {"years": 101}, {"monthly_amount": 0}])
+def test_chart_rejects_out_of_range_inputs(field):
+    assert client.post("/api/sip_advisor/chart", json={**CHART, **field}).status_code == 422
+
+def test_svg_render_handles_an_empty_series():
+    assert generate_sip_svg(5000, 0, 12).startswith("<svg")
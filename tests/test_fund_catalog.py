@@ -0,0 +1,25 @@
+from fund_catalog import FundCatalog
+from sip_utils import fund_catalog, get_fund_data
+
+def test_catalog_has_one_entry_per_scheme():
+    names = [record["name"] for record in fund_catalog.snapshot().records.values()]
+    assert len(names) == len(set(names))
+
+def test_retired_symbol_resolves_to_its_scheme():
+    assert get_fund_data("ICICI_PRUDENTIAL") is fund_catalog.get("ICICI_BLUECHIP")
+
+def test_missing_fields_are_unknown_not_placeholders():
+    fund = get_fund_data("AXIS_LIQUID")
+    assert fund["nav"] is None
+    assert fund["min_investment"] is None
+    assert fund["fund_manager"] is None
+
+def test_fingerprint_follows_content_not_reload_count():
+    # Two workers that reloaded a different number of times still agree on the same catalog
+    first, second = FundCatalog(fund_catalog.path), FundCatalog(fund_catalog.path)
+    second.update({})
+    assert second.version != first.version
+    assert second.fingerprint == first.fingerprint
+
+    second.update({"AXIS_LIQUID": {**get_fund_data("AXIS_LIQUID"), "expense_ratio": 0.5}})
+    assert second.fingerprint != first.fingerprint
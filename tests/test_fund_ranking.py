@@ -0,0 +1,13 @@
+import pytest
+
+from sip_utils import get_fund_data, recommend_funds
+
+@pytest.mark.parametrize("monthly_amount", [100, 500, 1000])
+def test_conservative_low_amount_gets_no_equity_funds(monthly_amount):
+    funds = recommend_funds("conservative", "retirement", monthly_amount)
+    assert funds
+    assert not any(get_fund_data(symbol)["category"].startswith("Equity") for symbol in funds)
+
+def test_unknown_minimum_ranks_below_affordable_funds():
+    funds = recommend_funds("conservative", "retirement", 1000)
+    assert funds.index("AXIS_LIQUID") > funds.index("ADITYA_CORPORATE_BOND")
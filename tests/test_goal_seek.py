@@ -0,0 +1,21 @@
+import pytest
+
+from sip_goal_seek import sip_growth_factor
+
+def simulate_step_up(years, expected_return_rate, step_up_rate):
+    """Month-by-month start-of-month SIP of 1, raised by the step-up every year."""
+    monthly_rate = expected_return_rate / 12 / 100
+    value, instalment = 0.0, 1.0
+    for month in range(years * 12):
+        if month and month % 12 == 0:
+            instalment *= 1 + step_up_rate / 100
+        value = (value + instalment) * (1 + monthly_rate)
+    return value
+
+@pytest.mark.parametrize("offset", [0.0, 1e-9, 5e-6, 1e-3])
+def test_step_up_near_the_return_rate_matches_simulation(offset):
+    # Step-ups that almost cancel the yearly growth used to snap to the linear limit
+    year_growth = (1 + 12 / 12 / 100) ** 12
+    step_up_rate = (year_growth * (1 + offset) - 1) * 100
+    expected = simulate_step_up(30, 12, step_up_rate)
+    assert float(sip_growth_factor(30, 12, step_up_rate)) == pytest.approx(expected, rel=1e-9)
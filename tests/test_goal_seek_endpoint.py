@@ -0,0 +1,28 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+
+client = TestClient(app)
+
+@pytest.mark.parametrize("payload", [
+    {"target_amount": 1000000, "years": 0, "expected_return_rate": 12},
+    {"target_amount": 1000000, "years": -3, "expected_return_rate": 12},
+    {"target_amount": 1000000, "years": [10, 0], "expected_return_rate": 12},
+    {"target_amount": 0, "years": 10, "expected_return_rate": 12},
+    {"target_amount": 1000000, "years": 10, "expected_return_rate": [12, -100]}
+])
+def test_goal_seek_rejects_invalid_inputs(payload):
+    assert client.post("/api/sip_advisor/goal_seek", json=payload).status_code == 422
+
+def test_goal_seek_solves_valid_inputs():
+    response = client.post("/api/sip_advisor/goal_seek",
+                           json={"target_amount": 1000000, "years": [10, 20], "expected_return_rate": 12})
+    assert response.status_code == 200
+    assert all(amount > 0 for amount in response.json()["required_monthly_amount"])
+
+def test_goal_seek_rejects_non_finite_results():
+    response = client.post("/api/sip_advisor/goal_seek",
+                           json={"target_amount": 1000000, "years": 100, "expected_return_rate": 12,
+                                 "inflation_rate": 1e6})
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+import json
+
+import httpx
+
+from sip_advisor_agent import SIPRecommendation
+from sip_llm import StructuredOllama, StructuredPrompt
+
+PREFIX_TOKENS = [1, 2, 3]
+GENERATED_TOKEN = 99
+INPUTS = {"savings_capacity": 5000, "frequency": "monthly", "currency": "INR", "age": 30,
+          "goals": "retirement", "risk_tolerance": "Not specified"}
+
+def _client(requests):
+    def handle(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        if "format" not in body:
+            # Prefix warm-up: the context ends with the sampled token
+            return httpx.Response(200, json={"response": "{", "context": PREFIX_TOKENS + [GENERATED_TOKEN],
+                                             "eval_count": 1})
+        answer = {"monthly_sip_amount": 5000, "investment_timeframe_years": 20, "risk_profile": "moderate",
+                  "recommended_funds": ["HDFC_EQUITY"], "expected_return_rate": 12}
+        return httpx.Response(200, json={"response": json.dumps(answer), "context": [], "eval_count": 10})
+    return httpx.Client(transport=httpx.MockTransport(handle))
+
+def test_prefix_context_excludes_generated_tokens():
+    requests = []
+    llm = StructuredOllama(SIPRecommendation, StructuredPrompt(lambda: ("HDFC_EQUITY", "SBI_DEBT")))
+    llm._client = _client(requests)
+
+    recommendation = llm.invoke(INPUTS)
+
+    assert recommendation.recommended_funds == ["HDFC_EQUITY"]
+    warm_up, generate = requests
+    assert generate["context"] == PREFIX_TOKENS
+    assert generate["prompt"] == llm.prompt.suffix(**INPUTS)
+    assert generate["format"]["properties"]["recommended_funds"]["items"]["enum"] == ["HDFC_EQUITY", "SBI_DEBT"]
@@ -0,0 +1,19 @@
+import numpy as np
+
+from nav_store import DATES_FILE, FUNDS_FILE, NAV_FILE, NAVStore, backtest_sip
+
+def _one_fund_store(path):
+    dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2021-01-01"))
+    np.save(path / DATES_FILE, dates)
+    np.save(path / NAV_FILE, np.linspace(10.0, 12.0, len(dates))[None, :])
+    (path / FUNDS_FILE).write_text('[{"symbol": "FUND", "scheme_code": "1", "name": "Fund"}]')
+    return NAVStore(str(path))
+
+def test_backtest_skips_instalments_before_history(tmp_path):
+    store = _one_fund_store(tmp_path)
+    inside = backtest_sip(store, ["FUND"], 1000, "2020-01-01", frequency="monthly")["FUND"]
+    before = backtest_sip(store, ["FUND"], 1000, "2019-01-01", frequency="monthly")["FUND"]
+
+    assert inside["instalments"] == 12
+    assert before["instalments"] == 12
+    assert before["invested_amount"] == inside["invested_amount"] == 12000
@@ -0,0 +1,10 @@
+from sip_advisor_agent import SIPAdvisorAgent
+
+def test_cache_keeps_frequencies_with_equal_monthly_totals_apart():
+    agent = SIPAdvisorAgent(use_fallback=True)
+    daily = agent.process_user_input(100, "daily", "INR", 30, "retirement", include_visualization=False)
+    monthly = agent.process_user_input(3000, "monthly", "INR", 30, "retirement", include_visualization=False)
+
+    assert daily["adjusted_monthly_amount"] == monthly["adjusted_monthly_amount"]
+    assert daily["frequency_adjusted_returns"] != monthly["frequency_adjusted_returns"]
+    assert monthly["frequency_adjusted_returns"]["invested_amount"] != 730500.0
@@ -0,0 +1,29 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+
+client = TestClient(app_module.app)
+
+BASE = {"monthly_amount": 5000, "years": 10}
+
+@pytest.mark.parametrize("sweep", [{"years": [0]}, {"years": [-5]}, {"monthly_amount": [1000, 0]},
+                                   {"expected_return_rate": [12, -100]}, {"years": [1000]}])
+def test_scenarios_reject_invalid_sweep_values(sweep):
+    response = client.post("/api/sip_advisor/scenarios",
+                           json={**BASE, "sweep": sweep, "include_visualization": True})
+    assert response.status_code == 422
+
+def test_scenario_chart_is_shed_when_render_gate_is_full(monkeypatch):
+    monkeypatch.setattr(app_module.render_gate, "depth", app_module.render_gate.limit)
+    response = client.post("/api/sip_advisor/scenarios",
+                           json={**BASE, "sweep": {"years": [5, 10]}, "include_visualization": True})
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+def test_scenarios_render_chart():
+    response = client.post("/api/sip_advisor/scenarios",
+                           json={**BASE, "sweep": {"risk_profile": ["conservative", "aggressive"]},
+                                 "include_visualization": True})
+    assert response.status_code == 200
+    assert response.json()["visualization"]